@@ -0,0 +1,20 @@
+class AnswerRecord:
+    """
+    세션에 보관하는 답안 한 건
+
+    문제 텍스트와 설명은 st.session_state.questions에 이미 있으므로
+    문제 번호, 고른 선택지, 정답 여부만 저장하고 화면에 그릴 때 문제 목록에서 찾아 씁니다.
+    """
+
+    __slots__ = ("index", "choice", "correct")
+
+    def __init__(self, index: int, choice: int, correct: bool):
+        self.index = index
+        self.choice = choice
+        self.correct = correct
+
+    def question(self, questions):
+        return questions[self.index]
+
+    def __repr__(self):
+        return f"AnswerRecord(index={self.index}, choice={self.choice}, correct={self.correct})"
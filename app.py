@@ -1,9 +1,10 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from firebase_service import FirebaseService
-from quiz_service import QuizService
-from config import QUIZ_DIFFICULTY_LEVELS, QUESTIONS_PER_QUIZ, FIREBASE_CONFIG
+from answer_record import AnswerRecord
+from user_stats import UserStats
+from config import (
+    get_settings, QUIZ_DIFFICULTY_LEVELS, QUESTIONS_PER_QUIZ,
+    QUESTION_STREAMING_ENABLED, QUESTION_STREAM_TIMEOUT, HISTORY_PAGE_SIZE
+)
 import time
 
 # 페이지 설정
@@ -103,27 +104,58 @@ def init_session_state():
         st.session_state.demo_username = ""
 
 # Firebase 및 Quiz 서비스 초기화
+# (run_app.py로 실행하면 첫 방문 전에 워밍업이 끝나 있고, streamlit run이면 첫 요청에서 워밍업 시작)
 @st.cache_resource
 def get_services():
-    firebase_service = FirebaseService()
-    quiz_service = QuizService()
-    return firebase_service, quiz_service
+    from warmup import get_warmup
+    
+    return get_warmup().services()
 
 def check_firebase_config():
     """Firebase 설정 확인"""
-    return (FIREBASE_CONFIG.get("apiKey") and 
-            FIREBASE_CONFIG["apiKey"] != "your_firebase_api_key" and
-            FIREBASE_CONFIG["apiKey"] != "")
+    firebase_config = get_settings().firebase_config
+    return (firebase_config.get("apiKey") and 
+            firebase_config["apiKey"] != "your_firebase_api_key" and
+            firebase_config["apiKey"] != "")
+
+def show_service_status(quiz_service):
+    """서비스 생성 결과 안내 (서비스는 워밍업 스레드에서 만들어지므로 세션마다 처음 한 번 여기서 표시)"""
+    if st.session_state.get('service_status_shown'):
+        return
+    st.session_state.service_status_shown = True
+    
+    if quiz_service.api_available:
+        st.success("🤖 OpenAI API 연결 성공! AI가 맞춤형 문제를 생성합니다.")
+    else:
+        if quiz_service.api_error:
+            st.error(f"❌ OpenAI API 연결 실패: {quiz_service.api_error}")
+            st.warning("⚠️ API 키를 확인해주세요.")
+        else:
+            st.error("💡 OpenAI API 키가 필요합니다!")
+        if quiz_service.offline_available:
+            st.info("📦 API를 사용할 수 없는 동안 오프라인 문제 은행의 문제로 출제합니다.")
+        else:
+            st.info("🔑 API 키를 설정하지 않으면 퀴즈를 플레이할 수 없습니다.")
+        st.info("📖 setup_guide.md 파일을 참고하여 OpenAI API 키를 설정해주세요.")
+    if quiz_service.bank_error:
+        st.warning(f"⚠️ 오프라인 문제 은행을 열 수 없습니다: {quiz_service.bank_error}")
 
 def main():
     init_session_state()
-    firebase_service, quiz_service = get_services()
+    try:
+        firebase_service, quiz_service = get_services()
+    except RuntimeError as e:
+        # 워밍업 스레드에서 서비스 생성이 실패한 경우 (Firebase 자격 증명 등)
+        st.error(f"❌ {str(e)}")
+        st.info("📖 setup_guide.md 파일을 참고하여 Firebase와 OpenAI 설정을 확인해주세요.")
+        st.stop()
     
     # Firebase 설정 확인
     firebase_available = check_firebase_config()
     
     # 헤더
     st.markdown('<h1 class="main-header">🧠 AI 퀴즈 게임</h1>', unsafe_allow_html=True)
+    show_service_status(quiz_service)
     
     # Firebase 미설정 시 데모 모드 안내
     if not firebase_available:
@@ -145,6 +177,9 @@ def main():
                 st.success(f"안녕하세요, {user_data.get('username', 'User')}님!")
                 st.info(f"총점: {user_data.get('total_score', 0)}점")
                 st.info(f"퀴즈 횟수: {user_data.get('quiz_count', 0)}회")
+                rank = firebase_service.get_user_rank(st.session_state.user['localId'])
+                if rank:
+                    st.info(f"순위: {format_rank(rank)}")
             
             if st.button("로그아웃", type="secondary"):
                 for key in list(st.session_state.keys()):
@@ -157,7 +192,7 @@ def main():
             if st.button("데모 종료", type="secondary"):
                 st.session_state.demo_mode = False
                 st.session_state.demo_username = ""
-                for key in ['quiz_started', 'questions', 'current_question', 'score', 'quiz_finished', 'user_answers', 'show_result']:
+                for key in ['quiz_started', 'questions', 'question_stream', 'current_question', 'score', 'quiz_finished', 'user_answers', 'show_result']:
                     if key in st.session_state:
                         del st.session_state[key]
                 st.rerun()
@@ -264,24 +299,24 @@ def show_demo_history_page():
     # 세션에 저장된 데모 기록 표시
     if 'demo_history' not in st.session_state:
         st.session_state.demo_history = []
+    if 'demo_stats' not in st.session_state:
+        st.session_state.demo_stats = UserStats()
     
     if st.session_state.demo_history:
         st.subheader("📈 이번 세션 기록")
         
-        total_quizzes = len(st.session_state.demo_history)
-        total_score = sum(record['score'] for record in st.session_state.demo_history)
-        avg_score = total_score / total_quizzes if total_quizzes > 0 else 0
+        stats = st.session_state.demo_stats
         
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("총 퀴즈 수", total_quizzes)
+            st.metric("총 퀴즈 수", stats.quiz_count)
         
         with col2:
-            st.metric("총점", total_score)
+            st.metric("총점", stats.total_score)
         
         with col3:
-            st.metric("평균 점수", f"{avg_score:.1f}")
+            st.metric("평균 점수", f"{stats.average_score:.1f}")
         
         # 최근 기록
         st.subheader("최근 퀴즈 기록")
@@ -295,6 +330,7 @@ def show_demo_history_page():
         
         if st.button("기록 초기화"):
             st.session_state.demo_history = []
+            st.session_state.demo_stats = UserStats()
             st.rerun()
             
     else:
@@ -314,9 +350,22 @@ def show_quiz_page(firebase_service, quiz_service):
         
         if st.button("퀴즈 시작!", type="primary", use_container_width=True):
             with st.spinner("AI가 문제를 생성중입니다..."):
-                questions = quiz_service.generate_quiz_questions(difficulty)
+                stream = None
+                if QUESTION_STREAMING_ENABLED:
+                    # 첫 문제가 도착하면 바로 시작하고 나머지는 백그라운드에서 수신
+                    questions = []
+                    stream = quiz_service.start_quiz_stream(difficulty, user_key=session_user_key())
+                    if stream and stream.wait_for(1, QUESTION_STREAM_TIMEOUT):
+                        questions = stream.questions
+                    elif stream and stream.error:
+                        quiz_service.report_generation_error(stream.error)
+                else:
+                    questions = quiz_service.get_quiz_questions(difficulty, user_key=session_user_key())
                 if questions:
-                    st.session_state.questions = questions
+                    # 세션에는 공유 문제 저장소의 ID 목록만 보관
+                    st.session_state.questions = quiz_service.question_registry.lease(questions)
+                    st.session_state.question_stream = stream
+                    sync_stream_questions()
                     st.session_state.quiz_started = True
                     st.session_state.current_question = 0
                     st.session_state.score = 0
@@ -337,7 +386,10 @@ def show_quiz_page(firebase_service, quiz_service):
         if not quiz_service.api_available:
             st.markdown("---")
             st.subheader("🔑 OpenAI API 설정이 필요합니다")
-            st.warning("현재 OpenAI API가 설정되지 않아 퀴즈를 플레이할 수 없습니다.")
+            if quiz_service.offline_available:
+                st.info("현재 OpenAI API가 설정되지 않아 오프라인 문제 은행의 문제로 출제합니다. AI가 만든 새 문제를 받으려면 API 키를 설정하세요.")
+            else:
+                st.warning("현재 OpenAI API가 설정되지 않았고 오프라인 문제 은행도 없어 퀴즈를 플레이할 수 없습니다.")
             
             with st.expander("📖 API 키 설정 방법"):
                 st.write("**1단계:** [OpenAI 플랫폼](https://platform.openai.com/)에 가입")
@@ -353,14 +405,49 @@ def show_quiz_page(firebase_service, quiz_service):
     elif st.session_state.quiz_finished:
         show_quiz_result(firebase_service, quiz_service)
 
+def session_user_key():
+    """오프라인 문제 은행에서 같은 문제를 다시 내지 않도록 구분하는 사용자 키"""
+    if st.session_state.get('user'):
+        return st.session_state.user['localId']
+    if st.session_state.get('demo_mode'):
+        return f"demo:{st.session_state.demo_username}"
+    return None
+
+def sync_stream_questions():
+    """스트리밍으로 도착한 문제를 세션 문제 목록에 추가 (모두 받은 스트림은 세션에서 놓아 줌)"""
+    stream = st.session_state.get('question_stream')
+    if not stream:
+        return None
+    st.session_state.questions.sync(stream.questions)
+    if stream.done and stream.error is None and len(st.session_state.questions) >= len(stream.questions):
+        st.session_state.question_stream = None
+        return None
+    return stream
+
 def show_quiz_question(firebase_service, quiz_service):
     current_q = st.session_state.current_question
+    stream = st.session_state.get('question_stream')
+    
+    # 스트리밍 중이면 현재 문제가 도착할 때까지 대기
+    if stream and current_q >= len(stream.questions):
+        with st.spinner("다음 문제를 불러오는 중입니다..."):
+            stream.wait_for(current_q + 1, QUESTION_STREAM_TIMEOUT)
+    stream = sync_stream_questions()
+    
+    if current_q >= len(st.session_state.questions):
+        # 스트림이 예상보다 일찍 끝난 경우 받은 문제까지만 채점
+        if stream and stream.error:
+            quiz_service.report_generation_error(stream.error)
+        finish_quiz(firebase_service, quiz_service)
+        st.rerun()
+    
     question = st.session_state.questions[current_q]
+    total_questions = stream.total if stream else len(st.session_state.questions)
     
     # 진행률 표시
-    progress = (current_q + 1) / len(st.session_state.questions)
+    progress = (current_q + 1) / total_questions
     st.progress(progress)
-    st.write(f"문제 {current_q + 1} / {len(st.session_state.questions)}")
+    st.write(f"문제 {current_q + 1} / {total_questions}")
     
     # 현재 점수 표시
     st.markdown(f'''
@@ -387,64 +474,84 @@ def show_quiz_question(firebase_service, quiz_service):
     if st.button("답안 제출", type="primary"):
         # 답안 기록
         is_correct = quiz_service.check_answer(user_answer, question["correct_answer"])
-        st.session_state.user_answers.append({
-            "question": question["question"],
-            "user_answer": user_answer,
-            "correct_answer": question["correct_answer"],
-            "is_correct": is_correct,
-            "explanation": question["explanation"]
-        })
+        st.session_state.user_answers.append(AnswerRecord(current_q, user_answer, is_correct))
         
         # 점수 업데이트
         if is_correct:
             st.session_state.score += 10
         
         # 다음 문제로 이동 또는 퀴즈 종료
-        if current_q + 1 < len(st.session_state.questions):
+        if current_q + 1 < total_questions:
             st.session_state.current_question += 1
             st.session_state.show_result = True
         else:
-            st.session_state.quiz_finished = True
-            
-            # 결과 저장
-            if st.session_state.demo_mode:
-                # 데모 모드: 세션에 저장
-                if 'demo_history' not in st.session_state:
-                    st.session_state.demo_history = []
-                st.session_state.demo_history.append({
-                    'score': st.session_state.score,
-                    'total_questions': len(st.session_state.questions),
-                    'difficulty': st.session_state.difficulty
-                })
-            elif st.session_state.user:
-                # Firebase 사용자: 데이터베이스에 저장
-                firebase_service.save_quiz_result(
-                    st.session_state.user['localId'],
-                    st.session_state.score,
-                    len(st.session_state.questions),
-                    st.session_state.difficulty
-                )
+            finish_quiz(firebase_service, quiz_service)
         
         st.rerun()
     
     # 이전 문제 결과 표시
     if st.session_state.show_result and st.session_state.user_answers:
         last_answer = st.session_state.user_answers[-1]
-        if last_answer["is_correct"]:
+        last_question = last_answer.question(st.session_state.questions)
+        if last_answer.correct:
             st.success(f"정답입니다! 🎉")
         else:
             st.error(f"틀렸습니다. 😢")
-            correct_option = chr(65 + last_answer["correct_answer"])
-            st.info(f"정답: {correct_option}. {st.session_state.questions[current_q-1]['options'][last_answer['correct_answer']]}")
+            correct_option = chr(65 + last_question["correct_answer"])
+            st.info(f"정답: {correct_option}. {last_question['options'][last_question['correct_answer']]}")
         
-        st.info(f"설명: {last_answer['explanation']}")
+        st.info(f"설명: {last_question['explanation']}")
         st.session_state.show_result = False
 
+def get_session_stats(firebase_service):
+    """세션의 누적 통계 (로그인 사용자는 처음 한 번만 저장소에서 불러옴)"""
+    if 'user_stats' not in st.session_state:
+        user_data = firebase_service.get_user_data(st.session_state.user['localId'])
+        st.session_state.user_stats = UserStats.from_dict(user_data)
+    return st.session_state.user_stats
+
+def finish_quiz(firebase_service, quiz_service):
+    st.session_state.quiz_finished = True
+    
+    # 문항별 정답 여부 기록 (문항 난이도/변별도 통계용)
+    quiz_service.record_answers(
+        st.session_state.questions,
+        [answer.correct for answer in st.session_state.user_answers]
+    )
+    
+    # 결과 저장
+    if st.session_state.demo_mode:
+        # 데모 모드: 세션에 저장
+        if 'demo_history' not in st.session_state:
+            st.session_state.demo_history = []
+        if 'demo_stats' not in st.session_state:
+            st.session_state.demo_stats = UserStats()
+        st.session_state.demo_history.append({
+            'score': st.session_state.score,
+            'total_questions': len(st.session_state.questions),
+            'difficulty': st.session_state.difficulty
+        })
+        st.session_state.demo_stats.record(st.session_state.score, st.session_state.difficulty)
+    elif st.session_state.user:
+        # Firebase 사용자: 데이터베이스에 저장 (기록 페이지는 다음 방문 때 다시 조회)
+        st.session_state.pop('history_records', None)
+        stats = get_session_stats(firebase_service)
+        stats.record(st.session_state.score, st.session_state.difficulty)
+        user = st.session_state.user
+        firebase_service.save_quiz_result(
+            user['localId'],
+            st.session_state.score,
+            len(st.session_state.questions),
+            st.session_state.difficulty,
+            username=user.get('displayName') or user.get('email'),
+            recent_scores=list(stats.recent_scores)
+        )
+
 def show_quiz_result(firebase_service, quiz_service):
     st.title("🎉 퀴즈 완료!")
     
     total_questions = len(st.session_state.questions)
-    correct_answers = sum(1 for answer in st.session_state.user_answers if answer["is_correct"])
+    correct_answers = sum(1 for answer in st.session_state.user_answers if answer.correct)
     accuracy = (correct_answers / total_questions) * 100
     
     # 결과 요약
@@ -470,16 +577,18 @@ def show_quiz_result(firebase_service, quiz_service):
     # 상세 결과
     st.subheader("📋 상세 결과")
     
-    for i, (question, answer) in enumerate(zip(st.session_state.questions, st.session_state.user_answers)):
+    for answer in st.session_state.user_answers:
+        i = answer.index
+        question = answer.question(st.session_state.questions)
         with st.expander(f"문제 {i+1}: {question['question'][:30]}..."):
             st.write(f"**문제:** {question['question']}")
             
             options_text = ""
             for j, option in enumerate(question['options']):
-                if j == answer['correct_answer']:
+                if j == question['correct_answer']:
                     options_text += f"**{chr(65+j)}. {option}** ✅\n"
-                elif j == answer['user_answer']:
-                    if answer['is_correct']:
+                elif j == answer.choice:
+                    if answer.correct:
                         options_text += f"**{chr(65+j)}. {option}** ✅\n"
                     else:
                         options_text += f"**{chr(65+j)}. {option}** ❌\n"
@@ -487,124 +596,154 @@ def show_quiz_result(firebase_service, quiz_service):
                     options_text += f"{chr(65+j)}. {option}\n"
             
             st.markdown(options_text)
-            st.write(f"**설명:** {answer['explanation']}")
+            st.write(f"**설명:** {question['explanation']}")
     
     # 새 퀴즈 시작
     if st.button("새 퀴즈 시작", type="primary"):
         st.session_state.quiz_started = False
         st.session_state.quiz_finished = False
         st.session_state.questions = []
+        st.session_state.question_stream = None
         st.session_state.current_question = 0
         st.session_state.score = 0
         st.session_state.user_answers = []
         st.session_state.show_result = False
         st.rerun()
 
+RANK_LABELS = {1: "🥇", 2: "🥈", 3: "🥉"}
+
+# 리더보드 기간 선택 (None은 전체 누적)
+LEADERBOARD_WINDOWS = {"전체": None, "오늘": "daily", "이번 주": "weekly", "이번 달": "monthly"}
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def build_leaderboard_view(version, _entries, score_label="총점"):
+    """리더보드 차트와 표 (스냅샷 버전이 같으면 모든 세션이 재사용)"""
+    # 차트를 그릴 때만 pandas/plotly를 불러옴
+    import pandas as pd
+    import plotly.express as px
+    
+    # 상위 10명 바 차트
+    top_10 = pd.DataFrame(list(_entries[:10]))
+    fig = px.bar(
+        top_10, 
+        x='username', 
+        y='total_score',
+        title="상위 10명 점수",
+        labels={'username': '사용자명', 'total_score': score_label},
+        color='total_score',
+        color_continuous_scale='viridis'
+    )
+    fig.update_layout(showlegend=False)
+    
+    table = pd.DataFrame({
+        "순위": [RANK_LABELS.get(rank, f"{rank}위") for rank in range(1, len(_entries) + 1)],
+        "사용자명": [user['username'] for user in _entries],
+        score_label: [f"{user['total_score']}점" for user in _entries],
+        "퀴즈 수": [f"{user['quiz_count']}회" for user in _entries]
+    })
+    return fig, table
+
+def format_rank(rank):
+    """순위 색인 결과를 "#4,213 / 10,000명 (상위 42.2%)" 형태로"""
+    return f"#{rank['rank']:,} / {rank['total']:,}명 (상위 {rank['top_percent']:.1f}%)"
+
 def show_leaderboard_page(firebase_service):
     st.title("🏆 리더보드")
     
-    leaderboard = firebase_service.get_leaderboard(20)
+    period = st.radio("기간", list(LEADERBOARD_WINDOWS), horizontal=True, label_visibility="collapsed")
+    window = LEADERBOARD_WINDOWS[period]
     
-    if leaderboard:
-        # 차트 생성
-        df = pd.DataFrame(leaderboard)
-        
-        # 상위 10명 바 차트
-        top_10 = df.head(10)
-        fig = px.bar(
-            top_10, 
-            x='username', 
-            y='total_score',
-            title="상위 10명 점수",
-            labels={'username': '사용자명', 'total_score': '총점'},
-            color='total_score',
-            color_continuous_scale='viridis'
-        )
-        fig.update_layout(showlegend=False)
+    # 로그인 사용자의 전체 순위 (메모리 순위 색인 조회, 저장소 조회 없음)
+    if window is None and st.session_state.get('user'):
+        rank = firebase_service.get_user_rank(st.session_state.user['localId'])
+        if rank:
+            st.metric("내 순위", f"#{rank['rank']:,}", f"상위 {rank['top_percent']:.1f}% · 전체 {rank['total']:,}명",
+                      delta_color="off")
+    
+    if window is None:
+        snapshot = firebase_service.get_leaderboard_snapshot(20)
+    else:
+        snapshot = firebase_service.get_window_leaderboard_snapshot(window, 20)
+    
+    if snapshot and snapshot.entries:
+        fig, table = build_leaderboard_view(snapshot.version, snapshot.entries,
+                                            "총점" if window is None else f"{period} 점수")
         st.plotly_chart(fig, use_container_width=True)
         
-        # 리더보드 테이블
-        st.subheader("📊 전체 순위")
-        
-        for i, user in enumerate(leaderboard):
-            rank = i + 1
-            
-            if rank == 1:
-                emoji = "🥇"
-            elif rank == 2:
-                emoji = "🥈"
-            elif rank == 3:
-                emoji = "🥉"
-            else:
-                emoji = f"{rank}위"
-            
-            col1, col2, col3, col4 = st.columns([1, 3, 2, 2])
-            
-            with col1:
-                st.markdown(f"**{emoji}**")
-            
-            with col2:
-                st.write(user['username'])
-            
-            with col3:
-                st.write(f"{user['total_score']}점")
-            
-            with col4:
-                st.write(f"{user['quiz_count']}회")
+        # 리더보드 테이블 (행마다 위젯을 만들지 않고 표 하나로 표시)
+        st.subheader(f"📊 {period} 순위")
+        st.dataframe(table, hide_index=True, use_container_width=True)
         
+    elif window is not None:
+        st.info(f"{period} 기록이 아직 없습니다. 첫 번째 퀴즈를 도전해보세요!")
     else:
         st.info("아직 리더보드에 데이터가 없습니다. 첫 번째 퀴즈를 도전해보세요!")
 
 def show_user_history_page(firebase_service):
+    import plotly.express as px
+    
     st.title("📊 내 퀴즈 기록")
     
-    user_history = firebase_service.get_user_quiz_history(st.session_state.user['localId'], 20)
+    # 첫 페이지만 불러오고, 나머지는 '더 보기'로 필요할 때 조회
+    if 'history_records' not in st.session_state:
+        records, cursor = firebase_service.get_user_quiz_history(
+            st.session_state.user['localId'], HISTORY_PAGE_SIZE
+        )
+        st.session_state.history_records = records
+        st.session_state.history_cursor = cursor
+    
+    user_history = st.session_state.history_records
+    
+    stats = get_session_stats(firebase_service)
     
     if user_history:
-        # 통계 요약
-        df = pd.DataFrame(user_history)
-        
-        total_quizzes = len(df)
-        total_score = df['score'].sum()
-        avg_score = df['score'].mean()
-        
+        # 통계 요약 (누적 통계에서 바로 표시)
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("총 퀴즈 수", total_quizzes)
+            st.metric("총 퀴즈 수", stats.quiz_count)
         
         with col2:
-            st.metric("총점", total_score)
+            st.metric("총점", stats.total_score)
         
         with col3:
-            st.metric("평균 점수", f"{avg_score:.1f}")
-        
-        # 점수 변화 그래프
-        fig = px.line(
-            df.reset_index(), 
-            x='index', 
-            y='score',
-            title="퀴즈별 점수 변화",
-            labels={'index': '퀴즈 번호', 'score': '점수'}
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            st.metric("평균 점수", f"{stats.average_score:.1f}")
+        
+        # 점수 변화 그래프 (최근 점수)
+        if stats.recent_scores:
+            fig = px.line(
+                x=list(range(len(stats.recent_scores))),
+                y=list(stats.recent_scores),
+                title="퀴즈별 점수 변화",
+                labels={'x': '퀴즈 번호', 'y': '점수'}
+            )
+            st.plotly_chart(fig, use_container_width=True)
         
         # 난이도별 통계
-        if 'difficulty' in df.columns:
-            difficulty_stats = df.groupby('difficulty')['score'].agg(['count', 'mean']).round(1)
+        if stats.difficulty_stats:
             st.subheader("난이도별 통계")
-            st.dataframe(difficulty_stats, use_container_width=True)
+            st.dataframe(stats.difficulty_table(), use_container_width=True, hide_index=True)
         
         # 최근 기록
         st.subheader("최근 퀴즈 기록")
-        for record in user_history[:10]:
+        for record in user_history:
             score = record.get('score', 0)
-            total_questions = record.get('total_questions', 5)
+            total_questions = record.get('total_questions') or QUESTIONS_PER_QUIZ
             difficulty = record.get('difficulty', '보통')
             
             accuracy = (score / (total_questions * 10)) * 100
             
             st.write(f"**점수:** {score}점 | **정답률:** {accuracy:.1f}% | **난이도:** {difficulty}")
+        
+        if st.session_state.history_cursor is not None and st.button("더 보기"):
+            records, cursor = firebase_service.get_user_quiz_history(
+                st.session_state.user['localId'],
+                HISTORY_PAGE_SIZE,
+                start_after=st.session_state.history_cursor
+            )
+            st.session_state.history_records = user_history + records
+            st.session_state.history_cursor = cursor
+            st.rerun()
     
     else:
         st.info("아직 퀴즈 기록이 없습니다. 첫 번째 퀴즈를 시작해보세요!")
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Optional
+
+import openai
+
+
+class AsyncGenerationEngine:
+    """
+    비동기 OpenAI 클라이언트 기반 문제 생성 엔진
+
+    캐시된 서비스가 소유하는 전용 이벤트 루프 스레드에서 모든 API 호출을 실행합니다.
+    동시 요청 수는 세마포어로 제한되며, 호출 측(Streamlit 스크립트 스레드)에는
+    concurrent.futures.Future를 반환합니다.
+    """
+
+    def __init__(self, api_key: str, max_concurrency: int = 8, max_retries: int = 2):
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self._loop = asyncio.new_event_loop()
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+
+    def start(self):
+        """
+        이벤트 루프 스레드 시작 (클라이언트와 세마포어는 루프 안에서 생성)
+        """
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run_loop, name="async-generation-engine", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        진행 중인 요청을 정리하고 이벤트 루프 종료
+        """
+        if not self._thread:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.close(), self._loop).result(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, request: Callable[[openai.AsyncOpenAI], Awaitable[Any]]) -> Future:
+        """
+        request(client) 코루틴을 동시 실행 한도 안에서 실행하고 Future 반환
+        """
+        if not self._thread:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(self._run(request), self._loop)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def _run(self, request: Callable[[openai.AsyncOpenAI], Awaitable[Any]]) -> Any:
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                return await request(self._client)
+            finally:
+                self._in_flight -= 1
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._client = openai.AsyncOpenAI(api_key=self.api_key, max_retries=self.max_retries)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._loop.call_soon(self._ready.set)
+        self._loop.run_forever()
@@ -0,0 +1,208 @@
+"""
+부하 테스트용 가짜 OpenAI 서버
+
+/v1/chat/completions 요청에 무작위 4지선다 문제를 돌려줍니다. 응답 지연,
+스트리밍 조각 간격, 형식이 잘못된 문제 비율, 429 응답 비율을 설정할 수 있으며
+stream=true 요청은 SSE로 응답합니다.
+
+    python benchmarks/fake_openai.py --port 8765 --latency 1.5
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CATEGORIES = ["역사", "과학", "지리", "문화", "스포츠"]
+
+
+def _random_text(length):
+    return "".join(chr(0xAC00 + random.randrange(11172)) for _ in range(length))
+
+
+def make_question(invalid_rate=0.0):
+    question = {
+        "question": _random_text(16) + "?",
+        "options": [_random_text(4) for _ in range(4)],
+        "correct_answer": random.randrange(4),
+        "explanation": _random_text(20),
+        "category": random.choice(CATEGORIES)
+    }
+    if random.random() < invalid_rate:
+        # 모델이 흔히 내는 형식 오류 중 하나
+        defect = random.choice(["options", "correct_answer", "explanation"])
+        if defect == "options":
+            question["options"] = question["options"][:3]
+        elif defect == "correct_answer":
+            question["correct_answer"] = 4
+        else:
+            question["explanation"] = ""
+    return question
+
+
+def make_questions(count, invalid_rate=0.0):
+    return {"questions": [make_question(invalid_rate) for _ in range(count)]}
+
+
+class FakeOpenAIServer:
+    def __init__(self, host="127.0.0.1", port=0, latency=1.0, chunk_size=40, chunk_delay=0.01,
+                 invalid_rate=0.0, rate_limit_rate=0.0):
+        self.latency = latency
+        self.invalid_rate = invalid_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rate_limited = 0
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server._lock:
+                    server.requests += 1
+                    limited = random.random() < server.rate_limit_rate
+                    if limited:
+                        server.rate_limited += 1
+                if limited:
+                    self._rate_limit()
+                    return
+
+                prompt = body["messages"][-1]["content"]
+                match = re.search(r"문제 (\d+)개", prompt)
+                count = int(match.group(1)) if match else 5
+                content = json.dumps(make_questions(count, server.invalid_rate), ensure_ascii=False)
+                time.sleep(server.latency)
+
+                if body.get("stream"):
+                    self._stream(content)
+                else:
+                    self._complete(content, body)
+
+            def do_GET(self):
+                # 워밍업의 연결 준비용 모델 목록 조회 (요청 수에는 포함하지 않음)
+                data = json.dumps({
+                    "object": "list",
+                    "data": [{"id": "fake", "object": "model", "created": 0, "owned_by": "fake"}]
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _rate_limit(self):
+                data = json.dumps({
+                    "error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}
+                }).encode("utf-8")
+                self.send_response(429)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("retry-after", "0.2")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _complete(self, content, body):
+                data = json.dumps({
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": {
+                        "prompt_tokens": len(body["messages"][-1]["content"]) // 2,
+                        "completion_tokens": len(content) // 2,
+                        "total_tokens": (len(body["messages"][-1]["content"]) + len(content)) // 2
+                    }
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, content):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                try:
+                    for start in range(0, len(content), server.chunk_size):
+                        chunk = {
+                            "id": "chatcmpl-fake",
+                            "object": "chat.completion.chunk",
+                            "created": int(time.time()),
+                            "model": "fake",
+                            "choices": [{
+                                "index": 0,
+                                "delta": {"content": content[start:start + server.chunk_size]},
+                                "finish_reason": None
+                            }]
+                        }
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                        time.sleep(server.chunk_delay)
+                    self.wfile.write(b"data: [DONE]\n\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # 클라이언트가 필요한 문제를 모두 받고 연결을 닫은 경우
+                    pass
+                self.close_connection = True
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부하 테스트용 가짜 OpenAI 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0, help="첫 바이트까지 지연(초)")
+    parser.add_argument("--chunk-delay", type=float, default=0.01, help="스트리밍 조각 간격(초)")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="형식이 잘못된 문제 비율")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429로 응답할 요청 비율")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(
+        args.host, args.port, args.latency, chunk_delay=args.chunk_delay,
+        invalid_rate=args.invalid_rate, rate_limit_rate=args.rate_limit_rate
+    ).start()
+    print(f"가짜 OpenAI 서버 실행 중: {server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+엔트리 포인트별 콜드 스타트(import) 시간 측정
+
+각 모듈을 새 인터프리터에서 여러 번 import하여 중앙값을 구하고,
+-X importtime 결과에서 누적 시간이 큰 모듈을 함께 기록합니다.
+
+    python benchmarks/import_time.py --repeat 5 --output import_time.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = ["config", "app", "quiz_service", "firebase_service"]
+
+TIMER = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+
+
+def measure(module, repeat):
+    """
+    새 프로세스에서 module을 import하는 데 걸린 시간(초) 목록
+    """
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(module=module)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return samples
+
+
+def top_imports(module, limit):
+    """
+    -X importtime 출력에서 누적 시간이 큰 모듈 (마이크로초)
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stderr
+
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append({"module": name.strip(), "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+    rows.sort(key=lambda row: row["cumulative_us"], reverse=True)
+    return rows[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔트리 포인트별 import 시간 측정")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (생략하면 표준 출력)")
+    args = parser.parse_args()
+
+    results = {}
+    for module in args.modules:
+        try:
+            samples = measure(module, args.repeat)
+        except subprocess.CalledProcessError as e:
+            results[module] = {"error": e.stderr.strip().splitlines()[-1] if e.stderr else str(e)}
+            continue
+        results[module] = {
+            "median_s": statistics.median(samples),
+            "min_s": min(samples),
+            "max_s": max(samples),
+            "samples": samples,
+            "top_imports": top_imports(module, args.top),
+        }
+
+    report = {"python": sys.version.split()[0], "repeat": args.repeat, "entry_points": results}
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+동시 세션 부하 테스트
+
+N개의 가상 세션이 실제 퀴즈 흐름(퀴즈 시작 → 모든 문제 풀이 → 결과 저장 →
+리더보드 → 기록 조회)을 동시에 진행합니다. OpenAI는 로컬 가짜 서버로,
+저장소는 지연을 넣은 메모리 백엔드로 대체하며 단계별 처리량과 p50/p95/p99를
+JSON으로 출력합니다. 커밋 간 결과를 비교해 성능 회귀를 확인할 수 있습니다.
+
+    python benchmarks/load_test.py --sessions 50 --rounds 2 --llm-latency 1.0 --output load.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_openai import FakeOpenAIServer  # noqa: E402
+
+STEPS = ["start", "questions_ready", "answer", "record_answers", "save", "leaderboard", "history", "session"]
+
+
+def percentile(samples, pct):
+    """
+    최근접 순위 방식 백분위수
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(samples, elapsed):
+    return {
+        "count": len(samples),
+        "throughput_per_s": round(len(samples) / elapsed, 3) if elapsed else None,
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 2) if samples else None,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2) if samples else None,
+        "p95_ms": round(percentile(samples, 95) * 1000, 2) if samples else None,
+        "p99_ms": round(percentile(samples, 99) * 1000, 2) if samples else None,
+        "max_ms": round(max(samples) * 1000, 2) if samples else None,
+    }
+
+
+def make_latency_backend(latency, jitter):
+    """
+    모든 호출에 지연을 넣는 메모리 저장소 백엔드
+    """
+    from storage_backends import HISTORY_FIELDS, InMemoryBackend
+
+    class LatencyBackend(InMemoryBackend):
+        def _sleep(self):
+            if latency or jitter:
+                time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+        def write_results(self, results):
+            self._sleep()
+            return super().write_results(results)
+
+        def get_user_stats(self, user_id):
+            self._sleep()
+            return super().get_user_stats(user_id)
+
+        def get_leaderboard(self, limit):
+            self._sleep()
+            return super().get_leaderboard(limit)
+
+        def get_history(self, user_id, limit, start_after=None, fields=HISTORY_FIELDS):
+            self._sleep()
+            return super().get_history(user_id, limit, start_after=start_after, fields=fields)
+
+    return LatencyBackend()
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def time(self, step, fn, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.errors[step] += 1
+            raise
+        self.add(step, time.perf_counter() - started)
+        return result
+
+    def add(self, step, seconds):
+        with self._lock:
+            self.samples[step].append(seconds)
+
+    def error(self, step):
+        with self._lock:
+            self.errors[step] += 1
+
+
+def run_session(session_id, args, quiz_service, firebase_service, recorder):
+    """
+    app.py의 show_quiz_page → show_quiz_question → finish_quiz → 리더보드/기록 페이지와
+    같은 순서로 서비스를 호출
+    """
+    from config import HISTORY_PAGE_SIZE, QUESTION_STREAM_TIMEOUT, QUESTIONS_PER_QUIZ
+    from user_stats import UserStats
+
+    user_id = f"load-user-{session_id}"
+    stats = UserStats.from_dict(firebase_service.get_user_data(user_id))
+
+    for _ in range(args.rounds):
+        difficulty = random.choice(args.difficulties)
+        session_started = time.perf_counter()
+
+        # 퀴즈 시작: 첫 문제를 화면에 그릴 수 있을 때까지
+        started = time.perf_counter()
+        if args.streaming:
+            stream = quiz_service.start_quiz_stream(difficulty, QUESTIONS_PER_QUIZ)
+            if not stream or not stream.wait_for(1, QUESTION_STREAM_TIMEOUT):
+                recorder.error("start")
+                continue
+            recorder.add("start", time.perf_counter() - started)
+            questions = stream.questions
+        else:
+            questions = quiz_service.get_quiz_questions(difficulty, QUESTIONS_PER_QUIZ)
+            if not questions:
+                recorder.error("start")
+                continue
+            recorder.add("start", time.perf_counter() - started)
+            stream = None
+
+        # 세션처럼 공유 문제 저장소의 ID 목록만 보유
+        lease = quiz_service.question_registry.lease(questions)
+
+        # 문제 풀이: 스트리밍이면 다음 문제가 도착할 때까지 기다리는 시간이 포함됨
+        results = []
+        index = 0
+        while index < (stream.total if stream else len(questions)):
+            answer_started = time.perf_counter()
+            if stream:
+                if not stream.wait_for(index + 1, QUESTION_STREAM_TIMEOUT):
+                    break
+                lease.sync(stream.questions)
+            question = lease[index]
+            results.append(quiz_service.check_answer(random.randrange(4), question["correct_answer"]))
+            recorder.add("answer", time.perf_counter() - answer_started)
+            index += 1
+            if args.think_time:
+                time.sleep(random.uniform(0, args.think_time))
+        recorder.add("questions_ready", time.perf_counter() - started)
+
+        if stream and stream.error:
+            recorder.error("questions_ready")
+
+        recorder.time("record_answers", quiz_service.record_answers, lease, results)
+        score = quiz_service.calculate_score(sum(results), index)
+        stats.record(score, difficulty)
+        recorder.time(
+            "save", firebase_service.save_quiz_result,
+            user_id, score, index, difficulty,
+            username=user_id, recent_scores=list(stats.recent_scores)
+        )
+        recorder.time("leaderboard", firebase_service.get_leaderboard, 20)
+        recorder.time("history", firebase_service.get_user_quiz_history, user_id, HISTORY_PAGE_SIZE)
+        recorder.add("session", time.perf_counter() - session_started)
+        lease.release()
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 세션 퀴즈 흐름 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=20, help="동시 세션 수")
+    parser.add_argument("--rounds", type=int, default=1, help="세션당 퀴즈 횟수")
+    parser.add_argument("--difficulties", nargs="+", default=["쉬움", "보통", "어려움"])
+    parser.add_argument("--think-time", type=float, default=0.0, help="문제당 최대 풀이 시간(초)")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="가짜 OpenAI 첫 바이트 지연(초)")
+    parser.add_argument("--llm-chunk-delay", type=float, default=0.01, help="스트리밍 조각 간격(초)")
+    parser.add_argument("--llm-invalid-rate", type=float, default=0.0, help="형식이 잘못된 문제 비율")
+    parser.add_argument("--llm-rate-limit-rate", type=float, default=0.0, help="429로 응답할 요청 비율")
+    parser.add_argument("--storage-latency", type=float, default=0.02, help="저장소 호출 지연(초)")
+    parser.add_argument("--storage-jitter", type=float, default=0.01)
+    parser.add_argument("--no-streaming", dest="streaming", action="store_false")
+    parser.add_argument("--no-pool", dest="pool", action="store_false", help="문제 풀 백그라운드 보충 끄기")
+    parser.add_argument("--no-write-behind", dest="write_behind", action="store_false")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (생략하면 표준 출력)")
+    parser.add_argument("--prometheus", help="LLM 호출 지표를 Prometheus 텍스트로 저장할 경로")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(
+        latency=args.llm_latency, chunk_delay=args.llm_chunk_delay,
+        invalid_rate=args.llm_invalid_rate, rate_limit_rate=args.llm_rate_limit_rate
+    ).start()
+    workdir = tempfile.mkdtemp(prefix="quiz-load-")
+
+    # config는 import 시점에 환경 변수를 읽으므로 서비스 import 전에 설정
+    os.environ.update({
+        "OPENAI_API_KEY": "sk-load-test",
+        "OPENAI_BASE_URL": server.base_url,
+        "STORAGE_BACKEND": "memory",
+        "QUESTION_STORE_PATH": os.path.join(workdir, "questions.db"),
+        "WRITE_BEHIND_SPILL_PATH": os.path.join(workdir, "pending_results.jsonl"),
+        "SHARED_CACHE_PATH": os.path.join(workdir, "shared_cache.db"),
+        "QUESTION_POOL_ENABLED": str(args.pool).lower(),
+        "QUESTION_STREAMING_ENABLED": str(args.streaming).lower(),
+        "WRITE_BEHIND_ENABLED": str(args.write_behind).lower(),
+    })
+
+    from firebase_service import FirebaseService
+    from quiz_service import QuizService
+
+    quiz_service = QuizService()
+    firebase_service = FirebaseService(backend=make_latency_backend(args.storage_latency, args.storage_jitter))
+    recorder = Recorder()
+
+    def worker(session_id):
+        try:
+            run_session(session_id, args, quiz_service, firebase_service, recorder)
+        except Exception as e:
+            recorder.error("session")
+            print(f"세션 {session_id} 실패: {e}", file=sys.stderr)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.sessions)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if firebase_service.write_queue:
+        firebase_service.write_queue.flush()
+
+    report = {
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "prometheus")},
+        "elapsed_s": round(elapsed, 3),
+        "quizzes_per_s": round(len(recorder.samples["session"]) / elapsed, 3),
+        "llm_requests": server.requests,
+        "llm_rate_limited": server.rate_limited,
+        "steps": {step: summarize(recorder.samples[step], elapsed) for step in STEPS},
+        "errors": dict(recorder.errors),
+    }
+    report["llm"] = quiz_service.telemetry.snapshot()
+    report["scheduler"] = quiz_service.scheduler.stats()
+    report["coalescer"] = quiz_service.coalescer.stats()
+    report["question_registry"] = quiz_service.question_registry.stats()
+    if quiz_service.pool:
+        report["pool"] = quiz_service.pool.stats()
+    if firebase_service.write_queue:
+        report["write_behind"] = firebase_service.write_queue.stats()
+
+    if quiz_service.pool:
+        quiz_service.pool.stop()
+    server.stop()
+
+    if args.prometheus:
+        with open(args.prometheus, "w", encoding="utf-8") as f:
+            f.write(quiz_service.telemetry.prometheus_text())
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+오프라인 문제 은행(question_bank.bin) 생성
+
+로컬 문제 저장소(questions.db)의 출제 가능한 문제와 JSONL 파일(줄마다 "difficulty"가 있는 문제 객체)을
+모아 형식을 검증하고 중복을 제거한 뒤, 난이도별로 mmap에서 바로 읽을 수 있는 파일로 저장합니다.
+실행 중인 앱은 다음 시작 때 새 파일을 엽니다.
+
+    python build_question_bank.py --store questions.db --jsonl extra_questions.jsonl --output question_bank.bin
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List
+
+from config import BACKUP_QUESTIONS, OFFLINE_BANK_PATH, QUESTION_STORE_PATH, QUIZ_DIFFICULTY_LEVELS
+from question_bank import write_question_bank
+from question_store import QuestionStore, question_id
+from question_validation import is_valid_question
+
+
+def iter_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                question = json.loads(line)
+                yield question.get("difficulty", "보통"), question
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 문제 은행 생성")
+    parser.add_argument("--store", default=QUESTION_STORE_PATH, help="문제 저장소 SQLite 파일 (없으면 백업 문제만 사용)")
+    parser.add_argument("--no-store", action="store_true", help="문제 저장소를 사용하지 않음")
+    parser.add_argument("--jsonl", action="append", default=[], help="추가할 JSONL 파일 (여러 번 지정 가능)")
+    parser.add_argument("--output", default=OFFLINE_BANK_PATH)
+    args = parser.parse_args()
+
+    sources = [(question.get("difficulty", "보통"), question) for question in BACKUP_QUESTIONS]
+    store = None
+    if not args.no_store:
+        # 경로가 틀렸을 때 새 저장소 파일을 만들지 않도록 있는 파일만 엶
+        if os.path.exists(args.store):
+            store = QuestionStore(args.store, seed_questions=BACKUP_QUESTIONS)
+            sources = store.iter_servable()
+        else:
+            print(f"문제 저장소가 없어 백업 문제만 사용합니다: {args.store}", file=sys.stderr)
+    sources = [sources] + [iter_jsonl(path) for path in args.jsonl]
+
+    by_difficulty: Dict[str, List[Dict]] = {level: [] for level in QUIZ_DIFFICULTY_LEVELS}
+    seen = set()
+    skipped = 0
+    for source in sources:
+        for difficulty, question in source:
+            qid = question_id(question)
+            if difficulty not in by_difficulty or qid in seen or not is_valid_question(question):
+                skipped += 1
+                continue
+            seen.add(qid)
+            by_difficulty[difficulty].append(question)
+    if store:
+        store.close()
+
+    counts = write_question_bank(args.output, by_difficulty)
+    json.dump({"output": args.output, "questions": counts, "skipped": skipped},
+              sys.stdout, ensure_ascii=False, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
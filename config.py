@@ -1,52 +1,186 @@
 import os
 import json
+from functools import cached_property, lru_cache
 from dotenv import load_dotenv
-import streamlit as st
 
 # Load environment variables
 load_dotenv()
 
-# OpenAI API Key
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY") or st.secrets.get("OPENAI_API_KEY")
 
-# Firebase Credentials
-FIREBASE_CREDENTIALS = None
-if os.getenv("FIREBASE_CREDENTIALS"):
-    FIREBASE_CREDENTIALS = json.loads(os.getenv("FIREBASE_CREDENTIALS"))
-elif st.secrets.get("FIREBASE_CREDENTIALS"):
-    FIREBASE_CREDENTIALS = json.loads(st.secrets.get("FIREBASE_CREDENTIALS"))
+def _get_secret(name, default=None):
+    """환경변수 → Streamlit secrets 순으로 조회 (streamlit은 필요할 때만 import)"""
+    value = os.getenv(name)
+    if value:
+        return value
+    try:
+        import streamlit as st
+        return st.secrets.get(name, default)
+    except Exception:
+        # secrets.toml이 없는 환경 (로컬 실행, 테스트 등)
+        return default
+
+
+class Settings:
+    """
+    비밀 값 설정 (처음 사용할 때 한 번만 조회하고 캐시)
+    """
+
+    # OpenAI API Key
+    @cached_property
+    def openai_api_key(self):
+        return _get_secret("OPENAI_API_KEY")
+
+    # Firebase Credentials
+    @cached_property
+    def firebase_credentials(self):
+        credentials = _get_secret("FIREBASE_CREDENTIALS")
+        if isinstance(credentials, str):
+            return json.loads(credentials)
+        return dict(credentials) if credentials else None
+
+    # Firebase Configuration
+    @cached_property
+    def firebase_config(self):
+        return {
+            "apiKey": _get_secret("FIREBASE_API_KEY"),
+            "authDomain": _get_secret("FIREBASE_AUTH_DOMAIN"),
+            "projectId": _get_secret("FIREBASE_PROJECT_ID"),
+            "storageBucket": _get_secret("FIREBASE_STORAGE_BUCKET"),
+            "messagingSenderId": _get_secret("FIREBASE_MESSAGING_SENDER_ID"),
+            "appId": _get_secret("FIREBASE_APP_ID"),
+            "databaseURL": _get_secret("FIREBASE_DATABASE_URL")
+        }
+
+    # Firebase Service Account Key Path (for admin operations)
+    @cached_property
+    def firebase_service_account_key(self):
+        return os.getenv("FIREBASE_SERVICE_ACCOUNT_KEY", "")
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    return Settings()
+
+
+# 이전 모듈 전역 이름 호환 (import 시점이 아니라 처음 접근할 때 조회)
+_LAZY_SETTINGS = {
+    "OPENAI_API_KEY": "openai_api_key",
+    "FIREBASE_CREDENTIALS": "firebase_credentials",
+    "FIREBASE_CONFIG": "firebase_config",
+    "FIREBASE_SERVICE_ACCOUNT_KEY": "firebase_service_account_key",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_SETTINGS:
+        return getattr(get_settings(), _LAZY_SETTINGS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Quiz Configuration
 QUESTIONS_PER_QUIZ = 5
 POINTS_PER_CORRECT_ANSWER = 10
 QUIZ_DIFFICULTY_LEVELS = ["쉬움", "보통", "어려움"]
+HISTORY_PAGE_SIZE = 10
+
+# Generation Engine Configuration (비동기 OpenAI 호출 동시 실행 한도)
+ASYNC_MAX_CONCURRENCY = int(os.getenv("ASYNC_MAX_CONCURRENCY", "8"))
+GENERATION_TIMEOUT = float(os.getenv("GENERATION_TIMEOUT", "60"))
+
+# Question Pool Configuration (난이도별 사전 생성 문제 수)
+QUESTION_POOL_ENABLED = os.getenv("QUESTION_POOL_ENABLED", "true").lower() == "true"
+QUESTION_POOL_LOW_WATERMARK = int(os.getenv("QUESTION_POOL_LOW_WATERMARK", "10"))
+QUESTION_POOL_HIGH_WATERMARK = int(os.getenv("QUESTION_POOL_HIGH_WATERMARK", "30"))
+
+# Shared Cache Configuration (같은 서버의 여러 앱 프로세스가 문제 풀/리더보드 스냅샷을 공유하는 SQLite 파일)
+SHARED_CACHE_ENABLED = os.getenv("SHARED_CACHE_ENABLED", "true").lower() == "true"
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", "shared_cache.db")
 
 # Default backup questions in case API fails
+# (문제 저장소가 처음 조회될 때 오프라인 문제 은행으로 적재됩니다)
 BACKUP_QUESTIONS = [
     {
         "question": "대한민국의 수도는?",
         "options": ["서울", "부산", "인천", "대구"],
-        "correct_answer": "서울",
+        "correct_answer": 0,
+        "explanation": "대한민국의 수도는 서울입니다.",
+        "category": "지리",
         "difficulty": "쉬움"
     },
     {
         "question": "1 + 1 = ?",
         "options": ["1", "2", "3", "4"],
-        "correct_answer": "2",
+        "correct_answer": 1,
+        "explanation": "1에 1을 더하면 2입니다.",
+        "category": "수학",
         "difficulty": "쉬움"
     }
 ]
 
-# Firebase Configuration
-FIREBASE_CONFIG = {
-    "apiKey": os.getenv("FIREBASE_API_KEY") or st.secrets.get("FIREBASE_API_KEY"),
-    "authDomain": os.getenv("FIREBASE_AUTH_DOMAIN") or st.secrets.get("FIREBASE_AUTH_DOMAIN"),
-    "projectId": os.getenv("FIREBASE_PROJECT_ID") or st.secrets.get("FIREBASE_PROJECT_ID"),
-    "storageBucket": os.getenv("FIREBASE_STORAGE_BUCKET") or st.secrets.get("FIREBASE_STORAGE_BUCKET"),
-    "messagingSenderId": os.getenv("FIREBASE_MESSAGING_SENDER_ID") or st.secrets.get("FIREBASE_MESSAGING_SENDER_ID"),
-    "appId": os.getenv("FIREBASE_APP_ID") or st.secrets.get("FIREBASE_APP_ID"),
-    "databaseURL": os.getenv("FIREBASE_DATABASE_URL") or st.secrets.get("FIREBASE_DATABASE_URL")
-}
+# Request Scheduler Configuration (프로세스 전체 OpenAI 요청 한도, 429 재시도, 같은 난이도 요청 합치기)
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "20"))
+COALESCE_MAX_QUESTIONS = int(os.getenv("COALESCE_MAX_QUESTIONS", "10"))
+
+# Near-Duplicate Filter Configuration (MinHash 유사도 기준, 중복/형식 오류 문제 제외 후 부족분 재요청 횟수)
+DEDUP_SIMILARITY_THRESHOLD = float(os.getenv("DEDUP_SIMILARITY_THRESHOLD", "0.6"))
+DEDUP_MAX_ATTEMPTS = int(os.getenv("DEDUP_MAX_ATTEMPTS", "3"))
+
+# Question Streaming Configuration (첫 문제가 도착하면 바로 퀴즈 시작)
+QUESTION_STREAMING_ENABLED = os.getenv("QUESTION_STREAMING_ENABLED", "true").lower() == "true"
+QUESTION_STREAM_TIMEOUT = float(os.getenv("QUESTION_STREAM_TIMEOUT", "60"))
+
+# Question Store Configuration (생성된 문제를 보관하는 로컬 SQLite 파일)
+QUESTION_STORE_PATH = os.getenv("QUESTION_STORE_PATH", "questions.db")
+QUESTION_STORE_MAX_SERVES = int(os.getenv("QUESTION_STORE_MAX_SERVES", "3"))
+
+# Offline Question Bank Configuration (API 장애/한도 초과 시 build_question_bank.py로 만든 mmap 문제 은행에서 출제)
+OFFLINE_BANK_PATH = os.getenv("OFFLINE_BANK_PATH", "question_bank.bin")
+OFFLINE_COOLDOWN = float(os.getenv("OFFLINE_COOLDOWN", "60"))
+OFFLINE_SEEN_BITS = int(os.getenv("OFFLINE_SEEN_BITS", "8192"))
+OFFLINE_SEEN_TTL = float(os.getenv("OFFLINE_SEEN_TTL", "86400"))
+OFFLINE_SEEN_MAXSIZE = int(os.getenv("OFFLINE_SEEN_MAXSIZE", "100000"))
+
+# Question Registry Configuration (세션 간 공유 문제 저장소에서 사용하지 않는 문제를 남겨 둘 최대 개수)
+QUESTION_REGISTRY_MAX_UNUSED = int(os.getenv("QUESTION_REGISTRY_MAX_UNUSED", "5000"))
+
+# Question Analytics Configuration (답안 기록으로 문항 정답률/변별도를 계산해 출제 난이도 보정)
+ANALYTICS_MIN_ANSWERS = int(os.getenv("ANALYTICS_MIN_ANSWERS", "20"))
+ANALYTICS_EASY_THRESHOLD = float(os.getenv("ANALYTICS_EASY_THRESHOLD", "0.75"))
+ANALYTICS_HARD_THRESHOLD = float(os.getenv("ANALYTICS_HARD_THRESHOLD", "0.4"))
+ANALYTICS_RETIRE_DISCRIMINATION = float(os.getenv("ANALYTICS_RETIRE_DISCRIMINATION", "-0.2"))
+ANALYTICS_REFRESH_EVERY = int(os.getenv("ANALYTICS_REFRESH_EVERY", "100"))
+
+# Storage Backend Configuration ("firestore", "sqlite", "memory")
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "firestore")
+STORAGE_SQLITE_PATH = os.getenv("STORAGE_SQLITE_PATH", "quiz_data.db")
+
+# Write-Behind Configuration (퀴즈 결과를 모아서 Firestore에 일괄 커밋)
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "true").lower() == "true"
+WRITE_BEHIND_MAX_BATCH = int(os.getenv("WRITE_BEHIND_MAX_BATCH", "200"))
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", "1.0"))
+WRITE_BEHIND_MAX_RETRIES = int(os.getenv("WRITE_BEHIND_MAX_RETRIES", "3"))
+WRITE_BEHIND_SPILL_PATH = os.getenv("WRITE_BEHIND_SPILL_PATH", "pending_results.jsonl")
+
+# User Profile Cache Configuration (사이드바 사용자 정보 읽기 캐시)
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "30"))
+USER_CACHE_MAXSIZE = int(os.getenv("USER_CACHE_MAXSIZE", "10000"))
+
+# Rank Index Configuration (총점 구간 크기, 저장소에서 순위 색인을 다시 만드는 간격(초), 0이면 시작 시 한 번만)
+RANK_INDEX_BUCKET_SIZE = int(os.getenv("RANK_INDEX_BUCKET_SIZE", str(POINTS_PER_CORRECT_ANSWER)))
+RANK_INDEX_REBUILD_INTERVAL = float(os.getenv("RANK_INDEX_REBUILD_INTERVAL", "300"))
+
+# Warm-up Configuration (프로세스 시작 시 서비스 준비, 상태 파일({pid}는 프로세스 ID)/HTTP /ready 포트(0이면 끔), Firestore 연결 유지 간격)
+WARMUP_READY_FILE = os.getenv("WARMUP_READY_FILE", "warmup_status.{pid}.json")
+WARMUP_HEALTH_PORT = int(os.getenv("WARMUP_HEALTH_PORT", "0"))
+WARMUP_POOL_TIMEOUT = float(os.getenv("WARMUP_POOL_TIMEOUT", "30"))
+WARMUP_KEEPALIVE_INTERVAL = float(os.getenv("WARMUP_KEEPALIVE_INTERVAL", "240"))
+
+# Leaderboard Cache Configuration (모든 세션이 공유하는 리더보드 스냅샷 유효 시간, 초)
+LEADERBOARD_CACHE_TTL = float(os.getenv("LEADERBOARD_CACHE_TTL", "10"))
 
-# Firebase Service Account Key Path (for admin operations)
-FIREBASE_SERVICE_ACCOUNT_KEY = os.getenv("FIREBASE_SERVICE_ACCOUNT_KEY", "") 
\ No newline at end of file
+# Windowed Leaderboard Configuration (일/주/월 리더보드 기준 시간대(UTC 기준 시차), 기간이 끝난 버킷을 보관하는 일수)
+LEADERBOARD_UTC_OFFSET_HOURS = float(os.getenv("LEADERBOARD_UTC_OFFSET_HOURS", "9"))
+LEADERBOARD_BUCKET_RETENTION_DAYS = int(os.getenv("LEADERBOARD_BUCKET_RETENTION_DAYS", "7"))
@@ -0,0 +1,127 @@
+import threading
+import zlib
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from question_store import normalize_question_text, question_id
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# crc32 해시(32비트)보다 큰 소수. 계수를 2^31 미만으로 두어 uint64 곱셈이 넘치지 않게 함
+_PRIME = 4294967311
+_MAX_COEFFICIENT = 2 ** 31
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH 기반 유사 문제 색인
+
+    문제 텍스트의 문자 bigram과 선택지로 MinHash 서명을 만들고, 밴드별 해시 버킷으로
+    후보만 골라 비교하므로 색인 크기와 무관하게 조회가 거의 상수 시간에 끝납니다.
+    """
+
+    def __init__(self, num_perm: int = 96, bands: int = 32, threshold: float = 0.6,
+                 shingle_size: int = 2, seed: int = 42):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm은 bands의 배수여야 합니다.")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        # numpy는 색인을 만들 때 불러옴 (모듈 import 시간을 늘리지 않도록)
+        import numpy as np
+
+        self._prime = np.uint64(_PRIME)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MAX_COEFFICIENT, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MAX_COEFFICIENT, size=num_perm, dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, "np.ndarray"] = {}
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, question: Dict) -> "np.ndarray":
+        """
+        문제 텍스트 + 선택지의 MinHash 서명
+        """
+        import numpy as np
+
+        text = normalize_question_text(question.get("question", ""))
+        # 선택지는 순서와 무관하게 하나씩 shingle로 추가
+        shingles = self._shingles(text) | {
+            "#" + normalize_question_text(str(option)) for option in question.get("options", [])
+        }
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        # (num_perm, shingles) 행렬에서 순열별 최소값
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % self._prime
+        return permuted.min(axis=1)
+
+    def find_duplicate(self, question: Dict, signature: Optional["np.ndarray"] = None) -> Optional[str]:
+        """
+        유사도가 threshold 이상인 기존 문제 키 반환 (없으면 None)
+        """
+        if signature is None:
+            signature = self.signature(question)
+        with self._lock:
+            return self._find_locked(signature)
+
+    def add(self, question: Dict, key: Optional[str] = None) -> bool:
+        """
+        문제를 색인에 추가. 이미 유사한 문제가 있으면 추가하지 않고 False 반환
+        """
+        key = key or question_id(question)
+        signature = self.signature(question)
+        with self._lock:
+            if key in self._signatures or self._find_locked(signature) is not None:
+                return False
+            self._signatures[key] = signature
+            for band, band_key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(band_key, []).append(key)
+            return True
+
+    def filter_new(self, questions: Iterable[Dict]) -> List[Dict]:
+        """
+        색인에 없는 문제만 골라 색인에 추가하고 반환 (배치 내부 중복도 제거)
+        """
+        return [question for question in questions if self.add(question)]
+
+    def load(self, items: Iterable[Tuple[str, Dict]]):
+        """
+        (키, 문제) 목록으로 색인 구성 (저장소에 있는 문제로 초기화할 때 사용)
+        """
+        for key, question in items:
+            self.add(question, key)
+
+    def _find_locked(self, signature: "np.ndarray") -> Optional[str]:
+        seen = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            for candidate in self._buckets[band].get(band_key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                similarity = float((self._signatures[candidate] == signature).mean())
+                if similarity >= self.threshold:
+                    return candidate
+        return None
+
+    def _band_keys(self, signature: "np.ndarray") -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def _shingles(self, text: str) -> set:
+        if len(text) <= self.shingle_size:
+            return {text}
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
@@ -1,13 +1,64 @@
 import firebase_admin
-from firebase_admin import credentials, firestore, auth
+from firebase_admin import credentials, auth
 import streamlit as st
-import json
 import os
+import time
+import uuid
+from config import (
+    get_settings, STORAGE_BACKEND, STORAGE_SQLITE_PATH,
+    WRITE_BEHIND_ENABLED, WRITE_BEHIND_MAX_BATCH, WRITE_BEHIND_FLUSH_INTERVAL,
+    WRITE_BEHIND_MAX_RETRIES, WRITE_BEHIND_SPILL_PATH, USER_CACHE_TTL, USER_CACHE_MAXSIZE,
+    LEADERBOARD_CACHE_TTL, SHARED_CACHE_ENABLED, SHARED_CACHE_PATH,
+    RANK_INDEX_BUCKET_SIZE, RANK_INDEX_REBUILD_INTERVAL
+)
+from leaderboard_cache import LeaderboardCache, LeaderboardSnapshot
+from leaderboard_windows import WINDOWS, merge_pending, period_key
+from rank_index import RankIndex
+from shared_cache import SharedCache
+from storage_backends import HISTORY_FIELDS, aggregate_results, create_backend
+from ttl_cache import TTLCache
+from write_behind import WriteBehindQueue
 
 class FirebaseService:
-    def __init__(self):
-        self.initialize_firebase()
-        self.db = firestore.client()
+    def __init__(self, backend=None):
+        # Firestore 백엔드일 때만 Firebase 앱 초기화 (메모리/SQLite는 자격 증명 불필요)
+        if backend is None:
+            if STORAGE_BACKEND == "firestore":
+                self.initialize_firebase()
+            backend = create_backend(STORAGE_BACKEND, STORAGE_SQLITE_PATH)
+        self.backend = backend
+        self.user_cache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL)
+        shared = SharedCache(SHARED_CACHE_PATH) if SHARED_CACHE_ENABLED else None
+        self.leaderboard_cache = LeaderboardCache(
+            self.backend.get_leaderboard,
+            ttl=LEADERBOARD_CACHE_TTL,
+            shared=shared
+        )
+        # 일/주/월 리더보드 (현재 기간 버킷 하나만 조회)
+        self.window_caches = {
+            window: LeaderboardCache(
+                lambda limit, window=window: self.backend.get_window_leaderboard(
+                    period_key(window, time.time()), limit
+                ),
+                ttl=LEADERBOARD_CACHE_TTL,
+                shared=shared,
+                name=f"leaderboard-{window}"
+            )
+            for window in WINDOWS
+        }
+        # 총점 순위 색인 (저장소에서 백그라운드로 만들고, 저장한 결과로 갱신)
+        self.rank_index = RankIndex(bucket_size=RANK_INDEX_BUCKET_SIZE)
+        self.rank_index.rebuild_in_background(self.backend.iter_user_totals, interval=RANK_INDEX_REBUILD_INTERVAL)
+        self.write_queue = None
+        if WRITE_BEHIND_ENABLED:
+            self.write_queue = WriteBehindQueue(
+                self._commit_results,
+                max_batch=WRITE_BEHIND_MAX_BATCH,
+                flush_interval=WRITE_BEHIND_FLUSH_INTERVAL,
+                max_retries=WRITE_BEHIND_MAX_RETRIES,
+                spill_path=WRITE_BEHIND_SPILL_PATH
+            )
+            self.write_queue.start()
 
     def initialize_firebase(self):
         if not firebase_admin._apps:
@@ -15,12 +66,8 @@ class FirebaseService:
                 cred = credentials.Certificate('firebase-credentials.json')
             else:
                 # For Streamlit Cloud deployment
-                firebase_credentials = st.secrets.get("FIREBASE_CREDENTIALS", None)
-                if firebase_credentials:
-                    if isinstance(firebase_credentials, str):
-                        cred_dict = json.loads(firebase_credentials)
-                    else:
-                        cred_dict = firebase_credentials
+                cred_dict = get_settings().firebase_credentials
+                if cred_dict:
                     cred = credentials.Certificate(cred_dict)
                 else:
                     raise Exception("Firebase credentials not found")
@@ -53,32 +100,118 @@ class FirebaseService:
             return None
 
     def save_score(self, user_id, score, difficulty):
+        return self.save_quiz_result(user_id, score, None, difficulty)
+
+    def save_quiz_result(self, user_id, score, total_questions, difficulty, username=None, recent_scores=None):
+        result = {
+            'id': uuid.uuid4().hex,
+            'user_id': user_id,
+            'username': username,
+            'score': score,
+            'total_questions': total_questions,
+            'difficulty': difficulty,
+            'recent_scores': recent_scores,
+            'timestamp': time.time()
+        }
+
+        self.user_cache.invalidate(user_id)
+
+        # 쓰기 지연 큐가 있으면 백그라운드에서 묶어서 커밋
+        if self.write_queue:
+            self.write_queue.enqueue(result)
+            return True
+
         try:
-            # Add score to user's history
-            score_ref = self.db.collection('scores').document()
-            score_ref.set({
-                'user_id': user_id,
-                'score': score,
-                'difficulty': difficulty,
-                'timestamp': firestore.SERVER_TIMESTAMP
-            })
+            self._commit_results([result])
             return True
         except Exception as e:
             st.error(f"Error saving score: {str(e)}")
             return False
 
-    def get_leaderboard(self):
+    def _commit_results(self, results):
+        """
+        결과 목록을 한 번에 커밋 (같은 사용자의 통계 증가분은 합쳐서 기록)
+        """
+        self.backend.write_results(results)
+
+        # 커밋 전에 캐시된 값이 남지 않도록 다시 무효화
+        for result in results:
+            self.user_cache.invalidate(result['user_id'])
+        self.leaderboard_cache.invalidate()
+        for cache in self.window_caches.values():
+            cache.invalidate()
+        for user_id, totals in aggregate_results(results).items():
+            self.rank_index.add(user_id, totals['score'])
+
+    def get_user_data(self, user_id):
+        # 사이드바가 매 rerun마다 호출하므로 사용자별 TTL 캐시에서 먼저 조회
         try:
-            scores = self.db.collection('scores').order_by('score', direction=firestore.Query.DESCENDING).limit(10).stream()
-            return [score.to_dict() for score in scores]
+            return self.user_cache.get(user_id)
+        except KeyError:
+            pass
+
+        try:
+            user_data = self.backend.get_user_stats(user_id)
+            self.user_cache.set(user_id, user_data)
+            return user_data
+        except Exception as e:
+            st.error(f"Error getting user data: {str(e)}")
+            return None
+
+    def get_leaderboard(self, limit=10):
+        snapshot = self.get_leaderboard_snapshot(limit)
+        return [dict(entry) for entry in snapshot.entries] if snapshot else []
+
+    def get_leaderboard_snapshot(self, limit=20):
+        """
+        모든 세션이 공유하는 리더보드 스냅샷 (내용이 바뀔 때만 version이 바뀜)
+        """
+        try:
+            return self.leaderboard_cache.get(limit)
+        except Exception as e:
+            st.error(f"Error getting leaderboard: {str(e)}")
+            return None
+
+    def get_window_leaderboard_snapshot(self, window, limit=20):
+        """
+        이번 기간("daily", "weekly", "monthly") 리더보드 스냅샷
+        저장소의 기간 버킷 상위 limit명에 아직 커밋되지 않은 결과를 메모리에서 더함
+        """
+        try:
+            snapshot = self.window_caches[window].get(limit)
+            pending = self.write_queue.pending() if self.write_queue else []
+            period = period_key(window, time.time())
+            pending = [result for result in pending if period_key(window, result['timestamp']) == period]
+            if not pending:
+                return snapshot
+            entries = merge_pending(snapshot.entries, pending, period, limit)
+            # 대기 중인 결과가 바뀔 때만 버전이 바뀌도록 마지막 결과 ID를 포함
+            return LeaderboardSnapshot((snapshot.version, len(pending), pending[-1]['id']), tuple(entries))
         except Exception as e:
             st.error(f"Error getting leaderboard: {str(e)}")
-            return []
+            return None
+
+    def get_user_rank(self, user_id):
+        """
+        사용자의 총점 순위 {"rank", "total", "top_percent", "score"} (색인 준비 전이거나 기록이 없으면 None)
+        """
+        return self.rank_index.rank(user_id)
 
     def get_user_scores(self, user_id):
         try:
-            scores = self.db.collection('scores').where('user_id', '==', user_id).order_by('timestamp', direction=firestore.Query.DESCENDING).stream()
-            return [score.to_dict() for score in scores]
+            scores, _ = self.backend.get_history(user_id, None, fields=None)
+            return scores
+        except Exception as e:
+            st.error(f"Error getting user scores: {str(e)}")
+            return [] 
+
+    def get_user_quiz_history(self, user_id, limit=20, start_after=None, fields=HISTORY_FIELDS):
+        """
+        사용자 기록 한 페이지 조회. (기록 목록, 다음 페이지 커서)를 반환하며
+        마지막 페이지면 커서는 None
+        """
+        try:
+            return self.backend.get_history(user_id, limit, start_after=start_after, fields=fields)
         except Exception as e:
             st.error(f"Error getting user scores: {str(e)}")
-            return [] 
\ No newline at end of file
+            return [], None
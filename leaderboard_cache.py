@@ -0,0 +1,98 @@
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+# 스냅샷 버전은 프로세스 안에서 유일 (limit이 달라도 겹치지 않음)
+_versions = itertools.count(1)
+
+
+class LeaderboardSnapshot:
+    """
+    리더보드 조회 결과와 데이터 버전
+
+    내용이 바뀔 때만 버전이 올라가므로, 화면 쪽은 버전을 키로 차트와 표를 재사용할 수 있습니다.
+    """
+
+    __slots__ = ("version", "entries", "created_at")
+
+    def __init__(self, version: int, entries: Tuple[Dict, ...]):
+        self.version = version
+        self.entries = entries
+        self.created_at = time.time()
+
+
+def _fingerprint(entries: List[Dict]) -> Tuple:
+    return tuple(
+        (entry.get('user_id'), entry.get('username'), entry.get('total_score'), entry.get('quiz_count'))
+        for entry in entries
+    )
+
+
+class LeaderboardCache:
+    """
+    모든 세션이 공유하는 리더보드 스냅샷 캐시
+
+    스냅샷은 ttl초 동안 재사용하고, 이 프로세스에서 결과를 저장하면 무효화됩니다.
+    다시 조회한 내용이 이전과 같으면 버전을 유지합니다.
+    shared(SharedCache)를 주면 스냅샷과 버전을 같은 서버의 다른 프로세스와 공유하여
+    프로세스가 몇 개든 ttl마다 한 번만 백엔드를 조회합니다.
+    name은 공유 스냅샷 키의 접두사 (리더보드 종류별로 다르게)
+    """
+
+    def __init__(self, fetch_fn: Callable[[int], List[Dict]], ttl: float = 10.0, shared=None,
+                 name: str = "leaderboard"):
+        self.fetch_fn = fetch_fn
+        self.ttl = ttl
+        self.shared = shared
+        self.name = name
+        self._lock = threading.Lock()
+        self._snapshots: Dict[int, Tuple[float, Tuple, LeaderboardSnapshot]] = {}
+
+    def get(self, limit: int) -> LeaderboardSnapshot:
+        # 만료 시 갱신은 한 번에 하나만 (동시에 들어온 세션은 갱신된 스냅샷을 함께 사용)
+        with self._lock:
+            cached = self._snapshots.get(limit)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[2]
+
+            if self.shared is not None:
+                return self._get_shared(limit, cached)
+
+            entries = self.fetch_fn(limit)
+            fingerprint = _fingerprint(entries)
+            if cached is not None and cached[1] == fingerprint:
+                snapshot = cached[2]
+            else:
+                snapshot = LeaderboardSnapshot(next(_versions), tuple(entries))
+            self._snapshots[limit] = (time.monotonic() + self.ttl, fingerprint, snapshot)
+            return snapshot
+
+    def _get_shared(self, limit: int, cached) -> LeaderboardSnapshot:
+        # 다른 프로세스가 만든 유효한 스냅샷이 있으면 남은 시간만큼 사용
+        key = f"{self.name}:{limit}"
+        hit = self.shared.get_snapshot(key)
+        if hit is not None:
+            version, entries, remaining = hit
+        else:
+            entries = self.fetch_fn(limit)
+            version = self.shared.put_snapshot(key, entries, self.ttl)
+            remaining = self.ttl
+        if cached is not None and cached[2].version == version:
+            snapshot = cached[2]
+        else:
+            snapshot = LeaderboardSnapshot(version, tuple(entries))
+        self._snapshots[limit] = (time.monotonic() + remaining, None, snapshot)
+        return snapshot
+
+    def invalidate(self):
+        """
+        다음 조회 때 다시 읽도록 만료 처리 (버전은 내용이 바뀐 경우에만 올라감)
+        """
+        with self._lock:
+            self._snapshots = {
+                limit: (0.0, fingerprint, snapshot)
+                for limit, (_, fingerprint, snapshot) in self._snapshots.items()
+            }
+        if self.shared is not None:
+            self.shared.expire_snapshots(f"{self.name}:")
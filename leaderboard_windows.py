@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Tuple
+
+from config import LEADERBOARD_UTC_OFFSET_HOURS, LEADERBOARD_BUCKET_RETENTION_DAYS
+
+# 기간 리더보드 종류 (일/주/월, 기준 시간대는 LEADERBOARD_UTC_OFFSET_HOURS)
+WINDOWS = ("daily", "weekly", "monthly")
+LOCAL_TZ = timezone(timedelta(hours=LEADERBOARD_UTC_OFFSET_HOURS))
+
+
+def _period_start(window: str, moment: datetime) -> datetime:
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if window == "daily":
+        return day
+    if window == "weekly":
+        return day - timedelta(days=day.weekday())
+    if window == "monthly":
+        return day.replace(day=1)
+    raise ValueError(f"알 수 없는 리더보드 기간: {window}")
+
+
+def _period_end(window: str, start: datetime) -> datetime:
+    if window == "daily":
+        return start + timedelta(days=1)
+    if window == "weekly":
+        return start + timedelta(days=7)
+    # 다음 달 1일
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def period_key(window: str, timestamp: float) -> str:
+    """
+    timestamp가 속한 기간의 버킷 키 (예: "daily:2026-10-18", "weekly:2026-W42", "monthly:2026-10")
+    """
+    moment = datetime.fromtimestamp(timestamp, tz=LOCAL_TZ)
+    if window == "daily":
+        return f"daily:{moment:%Y-%m-%d}"
+    if window == "weekly":
+        year, week, _ = moment.isocalendar()
+        return f"weekly:{year}-W{week:02d}"
+    if window == "monthly":
+        return f"monthly:{moment:%Y-%m}"
+    raise ValueError(f"알 수 없는 리더보드 기간: {window}")
+
+
+def period_expires_at(window: str, timestamp: float) -> float:
+    """
+    버킷 만료 시각 (기간이 끝나고 LEADERBOARD_BUCKET_RETENTION_DAYS일 뒤)
+    """
+    start = _period_start(window, datetime.fromtimestamp(timestamp, tz=LOCAL_TZ))
+    end = _period_end(window, start)
+    return (end + timedelta(days=LEADERBOARD_BUCKET_RETENTION_DAYS)).timestamp()
+
+
+def aggregate_window_results(results: Iterable[Dict]) -> Dict[Tuple[str, str], Dict]:
+    """
+    결과 목록을 (기간 버킷 키, user_id)별 증가분으로 합침 (모든 백엔드가 같은 방식으로 버킷을 갱신)
+    """
+    buckets: Dict[Tuple[str, str], Dict] = {}
+    for result in results:
+        for window in WINDOWS:
+            key = (period_key(window, result['timestamp']), result['user_id'])
+            bucket = buckets.setdefault(key, {
+                'score': 0, 'count': 0, 'username': None,
+                'expires_at': period_expires_at(window, result['timestamp'])
+            })
+            bucket['score'] += result['score']
+            bucket['count'] += 1
+            bucket['username'] = result.get('username') or bucket['username']
+    return buckets
+
+
+def merge_pending(entries: Iterable[Dict], pending: Iterable[Dict], period: str, limit: int) -> List[Dict]:
+    """
+    저장소에서 읽은 기간 순위에 아직 커밋되지 않은(쓰기 지연 큐의) 결과를 더해 다시 정렬
+
+    목록 밖 사용자는 대기 중인 점수만으로 계산하므로, 그 사용자의 점수는 실제보다 낮게 보일 수 있지만
+    커밋되면 바로잡힙니다.
+    """
+    window = period.split(":", 1)[0]
+    merged = {entry['user_id']: dict(entry) for entry in entries}
+    for result in pending:
+        if period_key(window, result['timestamp']) != period:
+            continue
+        entry = merged.setdefault(result['user_id'], {
+            'user_id': result['user_id'], 'username': 'User', 'total_score': 0, 'quiz_count': 0
+        })
+        entry['total_score'] += result['score']
+        entry['quiz_count'] += 1
+        if result.get('username'):
+            entry['username'] = result['username']
+    return sorted(merged.values(), key=lambda entry: entry['total_score'], reverse=True)[:limit]
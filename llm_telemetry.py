@@ -0,0 +1,274 @@
+import bisect
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간 히스토그램 경계(초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+# 응답 파싱은 밀리초 단위이므로 더 촘촘한 경계 사용
+PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+
+def classify_error(error: Optional[BaseException]) -> str:
+    """
+    예외를 실패 분류 이름으로 변환
+    """
+    if error is None:
+        return "ok"
+    if isinstance(error, json.JSONDecodeError):
+        return "parse_error"
+    if isinstance(error, openai.AuthenticationError):
+        return "auth_error"
+    if isinstance(error, openai.RateLimitError):
+        return "rate_limited"
+    if isinstance(error, openai.APITimeoutError):
+        return "timeout"
+    if isinstance(error, openai.APIConnectionError):
+        return "connection_error"
+    if isinstance(error, openai.APIError):
+        return "api_error"
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    return "other"
+
+
+class Histogram:
+    """
+    누적 버킷 히스토그램 (Prometheus histogram과 같은 형식)
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        버킷 경계로 근사한 분위수 (마지막 버킷이면 가장 큰 경계)
+        """
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.bounds[-1]
+
+    def to_dict(self) -> Dict:
+        cumulative = []
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            cumulative.append([bound, seen])
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": cumulative
+        }
+
+
+class LLMCall:
+    """
+    API 호출 한 번의 측정값. telemetry.begin()으로 만들고 finish() 또는 fail()로 기록
+    """
+
+    __slots__ = ("telemetry", "mode", "difficulty", "requested", "attempt",
+                 "queued_at", "started_at", "first_byte_at", "parse_seconds",
+                 "prompt_tokens", "completion_tokens", "invalid", "throttled", "retries", "_done")
+
+    def __init__(self, telemetry: "LLMTelemetry", mode: str, difficulty: str, requested: int,
+                 attempt: int = 0, queued_at: Optional[float] = None):
+        self.telemetry = telemetry
+        self.mode = mode
+        self.difficulty = difficulty
+        self.requested = requested
+        self.attempt = attempt
+        self.started_at = time.perf_counter()
+        self.queued_at = queued_at
+        self.first_byte_at: Optional[float] = None
+        self.parse_seconds = 0.0
+        self.prompt_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+        self.invalid = 0
+        # 요청 한도 대기와 429 백오프로 보낸 시간, 백오프 재시도 횟수
+        self.throttled = 0.0
+        self.retries = 0
+        self._done = False
+
+    def first_byte(self):
+        if self.first_byte_at is None:
+            self.first_byte_at = time.perf_counter()
+
+    def add_parse_time(self, seconds: float):
+        self.parse_seconds += seconds
+
+    def set_usage(self, usage):
+        if usage is not None:
+            self.prompt_tokens = usage.prompt_tokens
+            self.completion_tokens = usage.completion_tokens
+
+    def finish(self, returned: int):
+        outcome = "ok" if returned >= self.requested else "short"
+        self._record(outcome, returned)
+
+    def fail(self, error: BaseException, returned: int = 0):
+        self._record(classify_error(error), returned)
+
+    def _record(self, outcome: str, returned: int):
+        if self._done:
+            return
+        self._done = True
+        now = time.perf_counter()
+        self.telemetry.record({
+            "mode": self.mode,
+            "difficulty": self.difficulty,
+            "attempt": self.attempt,
+            "outcome": outcome,
+            "queue_wait": self.started_at - self.queued_at if self.queued_at is not None else None,
+            "ttfb": self.first_byte_at - self.started_at if self.first_byte_at is not None else None,
+            "latency": now - self.started_at,
+            "parse": self.parse_seconds,
+            "throttled": self.throttled,
+            "backoff_retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "requested": self.requested,
+            "returned": returned,
+            "invalid": self.invalid
+        })
+
+
+class LLMTelemetry:
+    """
+    문제 생성 API 호출 텔레메트리
+
+    호출마다 대기 시간, 첫 바이트까지 시간, 전체 지연, 파싱 시간, 토큰 사용량,
+    요청/반환 문제 수, 실패 분류를 기록하고 모드별 히스토그램과 카운터로 집계합니다.
+    집계는 Prometheus 텍스트 형식이나 JSON 스냅샷으로 내보낼 수 있습니다.
+    """
+
+    HISTOGRAMS = {
+        "queue_wait": LATENCY_BUCKETS,
+        "ttfb": LATENCY_BUCKETS,
+        "latency": LATENCY_BUCKETS,
+        "parse": PARSE_BUCKETS,
+        "throttled": LATENCY_BUCKETS
+    }
+    # 카운터 이름 → Prometheus 지표 이름
+    COUNTERS = {
+        "prompt_tokens": "quiz_llm_prompt_tokens_total",
+        "completion_tokens": "quiz_llm_completion_tokens_total",
+        "requested": "quiz_llm_questions_requested_total",
+        "returned": "quiz_llm_questions_returned_total",
+        "invalid": "quiz_llm_questions_invalid_total",
+        "backoff_retries": "quiz_llm_backoff_retries_total"
+    }
+
+    def __init__(self, recent_size: int = 100):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str], int] = {}
+        self._outcomes: Dict[Tuple[str, str], int] = {}
+        self._retries: Dict[str, int] = {}
+        self._recent = deque(maxlen=recent_size)
+
+    def begin(self, mode: str, difficulty: str, requested: int, attempt: int = 0,
+              queued_at: Optional[float] = None) -> LLMCall:
+        return LLMCall(self, mode, difficulty, requested, attempt, queued_at)
+
+    def record(self, call: Dict):
+        mode = call["mode"]
+        with self._lock:
+            for name in self.HISTOGRAMS:
+                if call[name] is not None:
+                    key = (name, mode)
+                    if key not in self._histograms:
+                        self._histograms[key] = Histogram(self.HISTOGRAMS[name])
+                    self._histograms[key].observe(call[name])
+            for name in self.COUNTERS:
+                if call[name]:
+                    self._counters[(name, mode)] = self._counters.get((name, mode), 0) + call[name]
+            outcome_key = (mode, call["outcome"])
+            self._outcomes[outcome_key] = self._outcomes.get(outcome_key, 0) + 1
+            if call["attempt"]:
+                self._retries[mode] = self._retries.get(mode, 0) + 1
+            self._recent.append(call)
+        logger.info("llm_call %s", json.dumps(call, ensure_ascii=False))
+
+    def snapshot(self) -> Dict:
+        """
+        JSON으로 직렬화 가능한 집계 스냅샷
+        """
+        with self._lock:
+            modes = sorted({mode for _, mode in self._histograms} | {mode for mode, _ in self._outcomes})
+            return {
+                mode: {
+                    "calls": {outcome: count for (m, outcome), count in self._outcomes.items() if m == mode},
+                    "retries": self._retries.get(mode, 0),
+                    "totals": {name: self._counters.get((name, mode), 0) for name in self.COUNTERS},
+                    "histograms": {
+                        name: self._histograms[(name, mode)].to_dict()
+                        for name in self.HISTOGRAMS if (name, mode) in self._histograms
+                    }
+                }
+                for mode in modes
+            }
+
+    def recent_calls(self) -> List[Dict]:
+        with self._lock:
+            return list(self._recent)
+
+    def prometheus_text(self) -> str:
+        """
+        Prometheus 텍스트 노출 형식
+        """
+        lines = []
+        with self._lock:
+            lines.append("# TYPE quiz_llm_calls_total counter")
+            for (mode, outcome), count in sorted(self._outcomes.items()):
+                lines.append(f'quiz_llm_calls_total{{mode="{mode}",outcome="{outcome}"}} {count}')
+
+            lines.append("# TYPE quiz_llm_retries_total counter")
+            for mode, count in sorted(self._retries.items()):
+                lines.append(f'quiz_llm_retries_total{{mode="{mode}"}} {count}')
+
+            for name, metric in self.COUNTERS.items():
+                lines.append(f"# TYPE {metric} counter")
+                for (counter, mode), value in sorted(self._counters.items()):
+                    if counter == name:
+                        lines.append(f'{metric}{{mode="{mode}"}} {value}')
+
+            for name in self.HISTOGRAMS:
+                metric = f"quiz_llm_{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for (histogram_name, mode), histogram in sorted(self._histograms.items()):
+                    if histogram_name != name:
+                        continue
+                    seen = 0
+                    for bound, count in zip(histogram.bounds, histogram.counts):
+                        seen += count
+                        lines.append(f'{metric}_bucket{{mode="{mode}",le="{bound}"}} {seen}')
+                    lines.append(f'{metric}_bucket{{mode="{mode}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{metric}_sum{{mode="{mode}"}} {histogram.sum:.6f}')
+                    lines.append(f'{metric}_count{{mode="{mode}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,192 @@
+import logging
+import threading
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 문항별 충분 통계 (답안 수, 정답 수, 나머지 점수가 있는 답안 수와 그 합/제곱합/곱의 합)
+STAT_COLUMNS = ["n", "correct", "n_rest", "correct_rest_n", "rest", "rest_sq", "correct_rest"]
+
+
+def summarize_answers(question_ids: Sequence[str], correct: "np.ndarray", rest_score: "np.ndarray") -> "pd.DataFrame":
+    """
+    답안 묶음을 문항별 충분 통계로 집계. 묶음끼리 더하면 전체 로그의 통계가 됨
+    rest_score: 같은 퀴즈에서 해당 문항을 뺀 나머지 문항 정답률 (없으면 NaN)
+    """
+    # numpy/pandas는 집계할 때만 불러옴 (앱 시작 시간을 늘리지 않도록)
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(np.asarray(question_ids, dtype=object))
+    size = len(uniques)
+    x = correct.astype(np.float64)
+    has_rest = ~np.isnan(rest_score)
+    y = np.where(has_rest, rest_score, 0.0)
+    # 문항 코드별 가중 합 (bincount가 groupby보다 빠름)
+    columns = {
+        "n": np.bincount(codes, minlength=size).astype(np.float64),
+        "correct": np.bincount(codes, weights=x, minlength=size),
+        "n_rest": np.bincount(codes, weights=has_rest, minlength=size),
+        "correct_rest_n": np.bincount(codes, weights=x * has_rest, minlength=size),
+        "rest": np.bincount(codes, weights=y, minlength=size),
+        "rest_sq": np.bincount(codes, weights=y * y, minlength=size),
+        "correct_rest": np.bincount(codes, weights=x * y, minlength=size)
+    }
+    return pd.DataFrame(columns, index=pd.Index(uniques, name="question_id"))
+
+
+def question_metrics(stats: "pd.DataFrame", levels: Sequence[str], min_answers: int,
+                     easy_threshold: float, hard_threshold: float, retire_below: float) -> "pd.DataFrame":
+    """
+    충분 통계로 문항별 정답률, 변별도(점이연 상관계수), 경험적 난이도 계산
+
+    답안이 min_answers개 미만이면 경험적 난이도는 비워 두어 생성 시 난이도를 그대로 쓰고,
+    변별도가 retire_below보다 낮으면(정답 키 오류 가능성) 출제에서 제외합니다.
+    """
+    import numpy as np
+    import pandas as pd
+
+    n = stats["n"].to_numpy()
+    correct_rate = stats["correct"].to_numpy() / n
+
+    # 점이연 상관계수: 문항 정답 여부(0/1)와 나머지 문항 점수의 피어슨 상관
+    m = stats["n_rest"].to_numpy()
+    sx = stats["correct_rest_n"].to_numpy()
+    sy = stats["rest"].to_numpy()
+    covariance = m * stats["correct_rest"].to_numpy() - sx * sy
+    variance_x = m * sx - sx * sx
+    variance_y = m * stats["rest_sq"].to_numpy() - sy * sy
+    denominator = np.sqrt(np.clip(variance_x * variance_y, 0, None))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discrimination = np.where(denominator > 0, covariance / denominator, np.nan)
+
+    # 답안 수가 적은 문항이 극단값으로 튀지 않도록 라플라스 평활한 정답률로 난이도 구분
+    smoothed = (stats["correct"].to_numpy() + 1) / (n + 2)
+    level = np.select(
+        [smoothed >= easy_threshold, smoothed < hard_threshold],
+        [levels[0], levels[-1]],
+        default=levels[len(levels) // 2]
+    ).astype(object)
+    enough = n >= min_answers
+    level[~enough] = None
+
+    return pd.DataFrame({
+        "answer_count": n.astype(np.int64),
+        "correct_rate": correct_rate,
+        "discrimination": discrimination,
+        "empirical_difficulty": level,
+        "retired": enough & (discrimination < retire_below)
+    }, index=stats.index)
+
+
+class QuestionAnalytics:
+    """
+    답안 기록 기반 문항 통계
+
+    저장소의 답안 기록을 마지막으로 읽은 위치부터 묶음 단위로 읽어 벡터 연산으로
+    문항별 충분 통계에 더하고, 바뀐 문항의 정답률/변별도/출제 난이도를 저장소에 반영합니다.
+    시작할 때는 전체 기록을, 이후에는 새로 쌓인 기록만 처리합니다.
+    """
+
+    def __init__(self, store, levels: Sequence[str], min_answers: int = 20,
+                 easy_threshold: float = 0.75, hard_threshold: float = 0.4,
+                 retire_below: float = -0.2, refresh_every: int = 100):
+        self.store = store
+        self.levels = list(levels)
+        self.min_answers = min_answers
+        self.easy_threshold = easy_threshold
+        self.hard_threshold = hard_threshold
+        self.retire_below = retire_below
+        self.refresh_every = refresh_every
+
+        # 첫 답안 묶음을 반영할 때 만듦
+        self._stats: Optional["pd.DataFrame"] = None
+        self._cursor = 0
+        self._unprocessed = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def record(self, rows: List[Tuple[str, str, int, Optional[float], float]]):
+        """
+        답안 기록 저장. 처리하지 않은 기록이 refresh_every개를 넘으면 백그라운드에서 갱신
+        """
+        self.store.add_answers(rows)
+        with self._lock:
+            self._unprocessed += len(rows)
+            due = self._unprocessed >= self.refresh_every
+            if due:
+                self._unprocessed = 0
+        if due:
+            self.refresh_in_background()
+
+    def refresh_in_background(self):
+        threading.Thread(target=self._safe_refresh, name="question-analytics", daemon=True).start()
+
+    def refresh(self) -> int:
+        """
+        새 답안 기록을 반영하고 처리한 기록 수를 반환
+        """
+        # 갱신은 한 번에 하나만 (진행 중이면 그 갱신이 새 기록까지 읽음)
+        if not self._refresh_lock.acquire(blocking=False):
+            return 0
+        try:
+            processed = 0
+            for rows in self.store.iter_answers(self._cursor):
+                processed += len(rows)
+                self._apply(rows)
+            return processed
+        finally:
+            self._refresh_lock.release()
+
+    def metrics(self) -> "pd.DataFrame":
+        """
+        모든 문항의 현재 통계
+        """
+        with self._lock:
+            stats = self._stats.copy() if self._stats is not None else None
+        if stats is None:
+            import numpy as np
+
+            stats = summarize_answers([], np.empty(0), np.empty(0))
+        return self._metrics(stats)
+
+    def _apply(self, rows):
+        import numpy as np
+
+        count = len(rows)
+        batch = summarize_answers(
+            [row[1] for row in rows],
+            np.fromiter((row[2] for row in rows), dtype=np.float64, count=count),
+            np.fromiter((np.nan if row[3] is None else row[3] for row in rows), dtype=np.float64, count=count)
+        )
+        with self._lock:
+            self._stats = batch if self._stats is None else self._stats.add(batch, fill_value=0)
+            self._cursor = rows[-1][0]
+            changed = self._stats.loc[batch.index]
+
+        metrics = self._metrics(changed)
+        discrimination = metrics["discrimination"].astype(object).where(metrics["discrimination"].notna(), None)
+        self.store.update_question_stats(list(zip(
+            metrics["answer_count"].tolist(),
+            metrics["correct_rate"].tolist(),
+            discrimination.tolist(),
+            metrics["empirical_difficulty"].tolist(),
+            metrics["retired"].astype(int).tolist(),
+            metrics.index.tolist()
+        )))
+
+    def _metrics(self, stats: "pd.DataFrame") -> "pd.DataFrame":
+        return question_metrics(
+            stats, self.levels, self.min_answers,
+            self.easy_threshold, self.hard_threshold, self.retire_below
+        )
+
+    def _safe_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning("문항 통계 갱신 실패: %s", e)
@@ -0,0 +1,193 @@
+import json
+import mmap
+import os
+import random
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 파일 구조 (리틀 엔디언)
+#   헤더:   매직(4) 버전(u16) 난이도 수(u16)
+#   목차:   난이도마다 이름 길이(u16) 이름(UTF-8) 문제 수(u32) 오프셋 표 위치(u64)
+#   오프셋: 난이도마다 (문제 수 + 1)개의 u64 절대 위치 (8바이트 정렬)
+#   본문:   문제마다 압축하지 않은 JSON(UTF-8)
+MAGIC = b"QBNK"
+VERSION = 1
+_HEADER = struct.Struct("<4sHH")
+_NAME_LENGTH = struct.Struct("<H")
+_ENTRY = struct.Struct("<IQ")
+# 문제 하나의 시작/끝 위치 (오프셋 표의 이웃한 두 값)
+_SPAN = struct.Struct("<QQ")
+
+
+class SeenFilter:
+    """
+    사용자가 이미 받은 문제 번호의 블룸 필터
+
+    문제 은행 크기와 관계없이 크기가 고정되며, 오탐(본 적 없는 문제를 본 것으로 판단)은
+    그 문제를 건너뛸 뿐이므로 반복 출제는 생기지 않습니다. 채워진 정도가 커지면 비웁니다.
+    """
+
+    __slots__ = ("bits", "size", "hashes", "count", "capacity")
+
+    def __init__(self, size_bits: int = 8192, hashes: int = 4):
+        self.size = size_bits
+        self.hashes = hashes
+        self.bits = bytearray((size_bits + 7) // 8)
+        self.count = 0
+        # 오탐률이 약 2%를 넘지 않는 항목 수
+        self.capacity = size_bits // 8
+
+    def _positions(self, index: int):
+        h1 = (index * 0x9E3779B1 + 0x7F4A7C15) & 0xFFFFFFFF
+        h2 = ((index * 0x85EBCA77) & 0xFFFFFFFF) | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, index: int):
+        if self.count >= self.capacity:
+            self.clear()
+        for position in self._positions(index):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, index: int) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(index))
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+        self.count = 0
+
+
+class QuestionBank:
+    """
+    mmap으로 여는 읽기 전용 오프라인 문제 은행
+
+    난이도별 오프셋 표만 메모리 맵 위에서 참조하고, 뽑힌 문제만 그때그때 JSON으로 해석합니다.
+    파일 페이지는 운영체제가 프로세스 간에 공유하므로 은행이 커져도 워커 메모리는 늘지 않습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"지원하지 않는 문제 은행 파일입니다: {path}")
+
+        # 난이도 -> (오프셋 표 위치, 문제 수). 오프셋은 바이트 순서를 지정해 읽으므로 다른 플랫폼에서 만든 파일도 사용 가능
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        position = _HEADER.size
+        for _ in range(count):
+            (name_length,) = _NAME_LENGTH.unpack_from(self._mmap, position)
+            position += _NAME_LENGTH.size
+            name = bytes(self._mmap[position:position + name_length]).decode("utf-8")
+            position += name_length
+            questions, table = _ENTRY.unpack_from(self._mmap, position)
+            position += _ENTRY.size
+            self._offsets[name] = (table, questions)
+
+    @classmethod
+    def open(cls, path: str) -> Optional["QuestionBank"]:
+        """
+        파일이 있으면 열고, 없으면 None
+        """
+        if not path or not os.path.exists(path):
+            return None
+        return cls(path)
+
+    @property
+    def difficulties(self) -> List[str]:
+        return list(self._offsets)
+
+    def count(self, difficulty: str) -> int:
+        entry = self._offsets.get(difficulty)
+        return entry[1] if entry is not None else 0
+
+    def get(self, difficulty: str, index: int) -> Dict:
+        table, questions = self._offsets[difficulty]
+        if not 0 <= index < questions:
+            raise IndexError(f"문제 번호가 범위를 벗어났습니다: {index}")
+        start, end = _SPAN.unpack_from(self._mmap, table + index * 8)
+        return json.loads(self._mmap[start:end].decode("utf-8"))
+
+    def sample(self, difficulty: str, count: int, seen: Optional[SeenFilter] = None,
+               max_probes: int = 32) -> List[Dict]:
+        """
+        seen에 없는 문제를 count개 무작위로 뽑고 seen에 기록
+        문제가 부족하면 빈 리스트를 반환
+        """
+        total = self.count(difficulty)
+        if total < count:
+            return []
+
+        chosen: List[int] = []
+        for _ in range(count):
+            for _ in range(max_probes):
+                index = random.randrange(total)
+                if index not in chosen and (seen is None or index not in seen):
+                    break
+            else:
+                # 거의 모두 본 경우: 남은 문제를 순서대로 찾고, 없으면 기록을 비움
+                start = random.randrange(total)
+                index = next(
+                    (i % total for i in range(start, start + total)
+                     if i % total not in chosen and (seen is None or i % total not in seen)),
+                    None
+                )
+                if index is None:
+                    if seen is not None:
+                        seen.clear()
+                    index = start
+                    while index in chosen:
+                        index = random.randrange(total)
+            chosen.append(index)
+            if seen is not None:
+                seen.add(index)
+        return [self.get(difficulty, index) for index in chosen]
+
+    def close(self):
+        self._offsets = {}
+        self._mmap.close()
+
+
+def write_question_bank(path: str, questions_by_difficulty: Dict[str, Iterable[Dict]]) -> Dict[str, int]:
+    """
+    문제 은행 파일 작성. 임시 파일에 쓴 뒤 교체하므로 이미 열어 둔 워커는 이전 파일을 계속 사용
+    난이도별로 저장한 문제 수를 반환
+    """
+    encoded = {
+        difficulty: [json.dumps(q, ensure_ascii=False, separators=(",", ":")).encode("utf-8") for q in questions]
+        for difficulty, questions in questions_by_difficulty.items()
+    }
+    names = {difficulty: difficulty.encode("utf-8") for difficulty in encoded}
+
+    directory_end = _HEADER.size + sum(_NAME_LENGTH.size + len(name) + _ENTRY.size for name in names.values())
+    position = directory_end + (-directory_end % 8)
+    tables = {}
+    for difficulty, records in encoded.items():
+        tables[difficulty] = position
+        position += (len(records) + 1) * 8
+    data_start = position
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(encoded)))
+        for difficulty, records in encoded.items():
+            f.write(_NAME_LENGTH.pack(len(names[difficulty])))
+            f.write(names[difficulty])
+            f.write(_ENTRY.pack(len(records), tables[difficulty]))
+        f.write(b"\0" * (-directory_end % 8))
+
+        position = data_start
+        for records in encoded.values():
+            offsets = [position]
+            for record in records:
+                position += len(record)
+                offsets.append(position)
+            f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        for records in encoded.values():
+            for record in records:
+                f.write(record)
+    os.replace(temp_path, path)
+    return {difficulty: len(records) for difficulty, records in encoded.items()}
@@ -0,0 +1,231 @@
+import threading
+import time
+import logging
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionPool:
+    """
+    난이도별 사전 생성 문제 풀
+
+    백그라운드 워커가 풀 깊이를 low/high 워터마크 사이로 유지하므로
+    퀴즈 시작은 메모리에서 문제를 꺼내는 것으로 끝납니다.
+    """
+
+    def __init__(self, generate_fn: Callable[[str, int], List[Dict]], difficulties: List[str],
+                 low_watermark: int = 10, high_watermark: int = 30, batch_size: int = 5,
+                 retry_delay: float = 5.0):
+        if high_watermark < low_watermark:
+            raise ValueError("high_watermark는 low_watermark 이상이어야 합니다.")
+
+        self.generate_fn = generate_fn
+        self.difficulties = list(difficulties)
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+
+        self._lock = threading.Lock()
+        self._queues = {difficulty: deque() for difficulty in self.difficulties}
+        self._refill_events = {difficulty: threading.Event() for difficulty in self.difficulties}
+        # 워터마크 아래로 떨어진 시각 (리필 지연 측정용)
+        self._below_since: Dict[str, Optional[float]] = {difficulty: None for difficulty in self.difficulties}
+        self._stop = threading.Event()
+        self._workers: List[threading.Thread] = []
+
+        self._stats = {
+            difficulty: {
+                "hits": 0,
+                "misses": 0,
+                "refills": 0,
+                "refill_failures": 0,
+                "generated": 0,
+                "last_refill_lag": 0.0,
+                "max_refill_lag": 0.0,
+            }
+            for difficulty in self.difficulties
+        }
+
+    def start(self):
+        """
+        난이도별 리필 워커 시작
+        """
+        if self._workers:
+            return
+        for difficulty in self.difficulties:
+            worker = threading.Thread(
+                target=self._refill_loop,
+                args=(difficulty,),
+                name=f"question-pool-{difficulty}",
+                daemon=True
+            )
+            self._workers.append(worker)
+            self._below_since[difficulty] = time.monotonic()
+            self._refill_events[difficulty].set()
+            worker.start()
+
+    def stop(self, timeout: float = 1.0):
+        """
+        리필 워커 종료
+        """
+        self._stop.set()
+        for event in self._refill_events.values():
+            event.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+
+    def take(self, difficulty: str, count: int) -> List[Dict]:
+        """
+        풀에서 문제를 꺼냄. 부족하면 빈 리스트를 반환하고 리필을 요청
+        """
+        if difficulty not in self._queues:
+            return []
+
+        with self._lock:
+            queue = self._queues[difficulty]
+            if len(queue) >= count:
+                questions = [queue.popleft() for _ in range(count)]
+                self._stats[difficulty]["hits"] += 1
+            else:
+                questions = []
+                self._stats[difficulty]["misses"] += 1
+            needs_refill = len(queue) < self.low_watermark
+
+        if needs_refill:
+            self._request_refill(difficulty)
+        return questions
+
+    def put(self, difficulty: str, questions: List[Dict]):
+        """
+        문제를 풀에 추가 (high 워터마크까지만)
+        """
+        if difficulty not in self._queues:
+            return
+        with self._lock:
+            queue = self._queues[difficulty]
+            room = max(self.high_watermark - len(queue), 0)
+            queue.extend(questions[:room])
+
+    def depth(self, difficulty: str) -> int:
+        with self._lock:
+            return len(self._queues.get(difficulty, ()))
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        난이도별 풀 깊이, 적중/실패, 리필 지연 통계
+        """
+        with self._lock:
+            return {
+                difficulty: dict(self._stats[difficulty], depth=len(self._queues[difficulty]))
+                for difficulty in self.difficulties
+            }
+
+    def _request_refill(self, difficulty: str):
+        with self._lock:
+            if self._below_since[difficulty] is None:
+                self._below_since[difficulty] = time.monotonic()
+        self._refill_events[difficulty].set()
+
+    def _refill_loop(self, difficulty: str):
+        event = self._refill_events[difficulty]
+        while not self._stop.is_set():
+            event.wait()
+            event.clear()
+            if self._stop.is_set():
+                break
+
+            while not self._stop.is_set() and self.depth(difficulty) < self.high_watermark:
+                if not self._acquire_refill(difficulty):
+                    # 다른 프로세스가 리필 중이면 잠시 후 깊이를 다시 확인
+                    self._stop.wait(self.retry_delay)
+                    continue
+                needed = min(self.high_watermark - self.depth(difficulty), self.batch_size)
+                try:
+                    questions = self.generate_fn(difficulty, needed)
+                except Exception as e:
+                    logger.warning("문제 풀 리필 실패 (%s): %s", difficulty, e)
+                    questions = []
+
+                if not questions:
+                    with self._lock:
+                        self._stats[difficulty]["refill_failures"] += 1
+                    # 실패 시 잠시 대기 후 재시도 (종료 요청이 오면 즉시 중단)
+                    self._stop.wait(self.retry_delay)
+                    continue
+
+                self.put(difficulty, questions)
+                depth = self.depth(difficulty)
+                with self._lock:
+                    stats = self._stats[difficulty]
+                    stats["refills"] += 1
+                    stats["generated"] += len(questions)
+                    below_since = self._below_since[difficulty]
+                    if below_since is not None and depth >= self.low_watermark:
+                        lag = time.monotonic() - below_since
+                        stats["last_refill_lag"] = lag
+                        stats["max_refill_lag"] = max(stats["max_refill_lag"], lag)
+                        self._below_since[difficulty] = None
+            self._release_refill(difficulty)
+
+    def _acquire_refill(self, difficulty: str) -> bool:
+        """
+        이 난이도를 리필해도 되면 True (프로세스 하나만 쓰는 풀은 항상 True)
+        """
+        return True
+
+    def _release_refill(self, difficulty: str):
+        pass
+
+
+class SharedQuestionPool(QuestionPool):
+    """
+    여러 앱 프로세스가 SharedCache 파일을 통해 함께 쓰는 문제 풀
+
+    문제는 프로세스 메모리 대신 공유 캐시에 보관하고 꺼낼 때 원자적으로 삭제하므로
+    같은 문제가 두 번 출제되지 않습니다. 리필은 난이도별 임대를 잡은 프로세스 하나만 하므로
+    프로세스가 늘어도 생성 요청이 겹치지 않고, 모든 프로세스가 같은 풀에서 적중합니다.
+    """
+
+    def __init__(self, shared, generate_fn: Callable[[str, int], List[Dict]], difficulties: List[str],
+                 lease_ttl: float = 120.0, **kwargs):
+        super().__init__(generate_fn, difficulties, **kwargs)
+        self.shared = shared
+        self.lease_ttl = lease_ttl
+
+    def take(self, difficulty: str, count: int) -> List[Dict]:
+        if difficulty not in self._queues:
+            return []
+
+        questions = self.shared.claim_questions(difficulty, count)
+        with self._lock:
+            self._stats[difficulty]["hits" if questions else "misses"] += 1
+        if self.shared.pool_depth(difficulty) < self.low_watermark:
+            self._request_refill(difficulty)
+        return questions
+
+    def put(self, difficulty: str, questions: List[Dict]):
+        if difficulty in self._queues:
+            self.shared.put_questions(difficulty, questions, self.high_watermark)
+
+    def depth(self, difficulty: str) -> int:
+        if difficulty not in self._queues:
+            return 0
+        return self.shared.pool_depth(difficulty)
+
+    def stats(self) -> Dict[str, Dict]:
+        depths = {difficulty: self.shared.pool_depth(difficulty) for difficulty in self.difficulties}
+        with self._lock:
+            return {
+                difficulty: dict(self._stats[difficulty], depth=depths[difficulty])
+                for difficulty in self.difficulties
+            }
+
+    def _acquire_refill(self, difficulty: str) -> bool:
+        return self.shared.try_lease(f"pool-refill:{difficulty}", self.lease_ttl)
+
+    def _release_refill(self, difficulty: str):
+        self.shared.release_lease(f"pool-refill:{difficulty}")
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping
+
+
+def content_hash(question: Mapping) -> str:
+    """
+    문제 내용 전체(선택지/정답/설명 포함)의 해시
+    """
+    payload = json.dumps(dict(question), sort_keys=True, ensure_ascii=False, default=list)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _freeze(question: Mapping) -> Mapping:
+    """
+    세션 간에 공유해도 바뀌지 않도록 읽기 전용 사본으로 변환
+    """
+    return MappingProxyType({
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in question.items()
+    })
+
+
+class QuestionLease:
+    """
+    세션이 보유한 문제 ID 목록
+
+    리스트처럼 인덱스로 접근하면 공유 저장소의 문제를 돌려줍니다. 세션 상태에서
+    사라져 가비지 컬렉션되거나 release()를 호출하면 보유한 참조를 모두 반환합니다.
+    """
+
+    __slots__ = ("_registry", "ids", "_finalizer", "__weakref__")
+
+    def __init__(self, registry: "QuestionRegistry"):
+        self._registry = registry
+        self.ids: List[str] = []
+        # 나중에 extend로 늘어난 ID까지 반환하도록 리스트 객체 자체를 넘김
+        self._finalizer = weakref.finalize(self, registry._release, self.ids)
+
+    def extend(self, questions: Iterable[Mapping]):
+        self.ids.extend(self._registry._acquire(questions))
+
+    def sync(self, questions: List[Mapping]):
+        """
+        스트리밍으로 늘어난 문제 목록에서 아직 받지 않은 문제만 추가
+        """
+        if len(questions) > len(self.ids):
+            self.extend(questions[len(self.ids):])
+
+    def release(self):
+        self._finalizer()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Mapping:
+        return self._registry.get(self.ids[index])
+
+    def __iter__(self) -> Iterator[Mapping]:
+        for qid in list(self.ids):
+            yield self._registry.get(qid)
+
+
+class QuestionRegistry:
+    """
+    프로세스 전체에서 공유하는 불변 문제 저장소
+
+    문제를 내용 해시로 한 번만 보관하고 세션은 QuestionLease로 ID만 가집니다.
+    항목마다 사용 중인 세션 수를 세며, 아무도 쓰지 않는 항목은 LRU 순서로
+    최대 max_unused개까지만 남겨 두었다가 다시 출제되면 재사용합니다.
+    """
+
+    def __init__(self, max_unused: int = 5000):
+        self.max_unused = max_unused
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Mapping] = {}
+        self._refcounts: Dict[str, int] = {}
+        self._unused: "OrderedDict[str, None]" = OrderedDict()
+        self._stats = {"interned": 0, "shared": 0, "evictions": 0}
+
+    def lease(self, questions: Iterable[Mapping] = ()) -> QuestionLease:
+        lease = QuestionLease(self)
+        lease.extend(questions)
+        return lease
+
+    def get(self, qid: str) -> Mapping:
+        # 사용 중인 항목은 제거되지 않으므로 잠금 없이 조회
+        return self._entries[qid]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(
+                self._stats,
+                entries=len(self._entries),
+                in_use=len(self._refcounts),
+                unused=len(self._unused)
+            )
+
+    def _acquire(self, questions: Iterable[Mapping]) -> List[str]:
+        # 해시 계산은 잠금 밖에서
+        hashed = [(content_hash(question), question) for question in questions]
+        with self._lock:
+            for qid, question in hashed:
+                if qid in self._entries:
+                    self._stats["shared"] += 1
+                    self._unused.pop(qid, None)
+                else:
+                    self._entries[qid] = _freeze(question)
+                    self._stats["interned"] += 1
+                self._refcounts[qid] = self._refcounts.get(qid, 0) + 1
+        return [qid for qid, _ in hashed]
+
+    def _release(self, ids: List[str]):
+        with self._lock:
+            for qid in ids:
+                count = self._refcounts.get(qid, 0) - 1
+                if count > 0:
+                    self._refcounts[qid] = count
+                    continue
+                self._refcounts.pop(qid, None)
+                self._unused[qid] = None
+                self._unused.move_to_end(qid)
+            while len(self._unused) > self.max_unused:
+                qid, _ = self._unused.popitem(last=False)
+                del self._entries[qid]
+                self._stats["evictions"] += 1
+            ids.clear()
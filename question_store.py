@@ -0,0 +1,264 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_question_text(text: str) -> str:
+    """
+    중복 판별용 문제 텍스트 정규화 (유니코드 정규화, 소문자, 공백/구두점 제거)
+    """
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return _NON_WORD.sub("", text)
+
+
+def question_id(question: Dict) -> str:
+    """
+    정규화된 문제 텍스트의 해시 (저장소 기본 키)
+    """
+    normalized = normalize_question_text(question.get("question", ""))
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class QuestionStore:
+    """
+    SQLite 기반 로컬 문제 저장소
+
+    생성된 문제를 난이도/분야별로 색인하여 보관하고, 정규화된 문제 텍스트의
+    해시로 중복을 제거합니다. 프로세스를 재시작해도 저장된 문제를 그대로 사용할 수 있습니다.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS questions (
+        id TEXT PRIMARY KEY,
+        difficulty TEXT NOT NULL,
+        category TEXT,
+        data TEXT NOT NULL,
+        served_count INTEGER NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_questions_difficulty
+        ON questions (difficulty, served_count);
+    CREATE INDEX IF NOT EXISTS idx_questions_category
+        ON questions (difficulty, category);
+    CREATE TABLE IF NOT EXISTS answers (
+        question_id TEXT NOT NULL,
+        quiz_id TEXT NOT NULL,
+        correct INTEGER NOT NULL,
+        rest_score REAL,
+        created_at REAL NOT NULL
+    );
+    """
+
+    # 답안 통계로 채워지는 열 (기존 파일에는 시작할 때 추가)
+    STATS_COLUMNS = {
+        "serve_difficulty": "TEXT",
+        "answer_count": "INTEGER NOT NULL DEFAULT 0",
+        "correct_rate": "REAL",
+        "discrimination": "REAL",
+        "retired": "INTEGER NOT NULL DEFAULT 0"
+    }
+
+    def __init__(self, path: str, seed_questions: Optional[List[Dict]] = None, max_serves: int = 3):
+        self.path = path
+        self.max_serves = max_serves
+        self._seed_questions = seed_questions or []
+        self._seeded = False
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._migrate()
+        self._conn.commit()
+
+    def add_questions(self, difficulty: str, questions: Iterable[Dict], served: int = 0) -> int:
+        """
+        문제 저장 (이미 있는 문제는 무시). 새로 저장된 개수를 반환
+        served: 이미 출제된 횟수 (풀이나 즉시 생성으로 바로 출제되는 문제는 1)
+        """
+        now = time.time()
+        rows = [
+            (question_id(q), difficulty, difficulty, q.get("category"),
+             json.dumps(q, ensure_ascii=False), served, now)
+            for q in questions
+            if q.get("question")
+        ]
+        if not rows:
+            return 0
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO questions "
+                "(id, difficulty, serve_difficulty, category, data, served_count, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def take(self, difficulty: str, count: int, category: Optional[str] = None) -> List[Dict]:
+        """
+        적게 출제된 문제부터 count개를 꺼냄. 충분하지 않으면 빈 리스트 반환
+        난이도는 답안 통계로 보정된 출제 난이도 기준이며, 변별도가 낮아 제외된 문제는 출제하지 않음
+        """
+        self._ensure_seeded()
+
+        query = ("SELECT id, data FROM questions "
+                 "WHERE serve_difficulty = ? AND retired = 0 AND served_count < ?")
+        params = [difficulty, self.max_serves]
+        if category:
+            query += " AND category = ?"
+            params.append(category)
+        query += " ORDER BY served_count, RANDOM() LIMIT ?"
+        params.append(count)
+
+        with self._lock:
+            # 같은 파일을 쓰는 다른 프로세스와 출제 횟수가 엇갈리지 않도록 쓰기 잠금을 먼저 잡음
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(query, params).fetchall()
+                if len(rows) < count:
+                    self._conn.rollback()
+                    return []
+                self._conn.executemany(
+                    "UPDATE questions SET served_count = served_count + 1 WHERE id = ?",
+                    [(row[0],) for row in rows]
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+        return [json.loads(row[1]) for row in rows]
+
+    def iter_questions(self, page_size: int = 1000) -> Iterator[Tuple[str, Dict]]:
+        """
+        저장된 모든 문제를 (id, 문제) 형태로 페이지 단위 순회
+        """
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, id, data FROM questions WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (last_rowid, page_size)
+                ).fetchall()
+            if not rows:
+                return
+            for rowid, qid, data in rows:
+                yield qid, json.loads(data)
+            last_rowid = rows[-1][0]
+
+    def iter_servable(self, page_size: int = 1000) -> Iterator[Tuple[str, Dict]]:
+        """
+        출제 가능한(제외되지 않은) 문제를 (출제 난이도, 문제) 형태로 페이지 단위 순회
+        """
+        self._ensure_seeded()
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, serve_difficulty, data FROM questions "
+                    "WHERE rowid > ? AND retired = 0 ORDER BY rowid LIMIT ?",
+                    (last_rowid, page_size)
+                ).fetchall()
+            if not rows:
+                return
+            for _, difficulty, data in rows:
+                yield difficulty, json.loads(data)
+            last_rowid = rows[-1][0]
+
+    def add_answers(self, rows: List[Tuple[str, str, int, Optional[float], float]]):
+        """
+        문항별 답안 기록 저장 (question_id, quiz_id, correct, rest_score, created_at)
+        """
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO answers (question_id, quiz_id, correct, rest_score, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def iter_answers(self, after_rowid: int = 0,
+                     page_size: int = 500000) -> Iterator[List[Tuple[int, str, int, Optional[float]]]]:
+        """
+        after_rowid 이후의 답안 기록을 (rowid, question_id, correct, rest_score) 묶음 단위로 순회
+        """
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, question_id, correct, rest_score FROM answers "
+                    "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (after_rowid, page_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield rows
+            after_rowid = rows[-1][0]
+
+    def update_question_stats(self, rows: List[Tuple[int, Optional[float], Optional[float],
+                                                     Optional[str], int, str]]):
+        """
+        답안 통계 반영 (answer_count, correct_rate, discrimination, serve_difficulty, retired, id)
+        serve_difficulty가 None이면 생성 시 난이도로 출제
+        """
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE questions SET answer_count = ?, correct_rate = ?, discrimination = ?, "
+                "serve_difficulty = COALESCE(?, difficulty), retired = ? WHERE id = ?",
+                rows
+            )
+            self._conn.commit()
+
+    def count(self, difficulty: Optional[str] = None) -> int:
+        with self._lock:
+            if difficulty is None:
+                row = self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) FROM questions WHERE difficulty = ?", (difficulty,)
+                ).fetchone()
+        return row[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _migrate(self):
+        """
+        이전 버전 파일에 통계 열과 출제용 색인 추가
+        """
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(questions)")}
+        for name, definition in self.STATS_COLUMNS.items():
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE questions ADD COLUMN {name} {definition}")
+        self._conn.execute("UPDATE questions SET serve_difficulty = difficulty WHERE serve_difficulty IS NULL")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_questions_serving "
+            "ON questions (serve_difficulty, retired, served_count)"
+        )
+
+    def _ensure_seeded(self):
+        """
+        백업 문제를 처음 조회할 때 한 번만 저장소에 적재 (지연 로딩)
+        """
+        if self._seeded:
+            return
+        self._seeded = True
+        by_difficulty: Dict[str, List[Dict]] = {}
+        for question in self._seed_questions:
+            by_difficulty.setdefault(question.get("difficulty", "보통"), []).append(question)
+        for difficulty, questions in by_difficulty.items():
+            self.add_questions(difficulty, questions)
@@ -0,0 +1,133 @@
+import json
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+class QuestionStreamParser:
+    """
+    증분 JSON 파서
+
+    스트리밍 응답 조각을 받아 배열 안의 문제 객체가 닫히는 즉시 반환합니다.
+    {"questions": [{...}, {...}]} 와 최상위 배열 [{...}, {...}] 형식을 모두 지원합니다.
+    """
+
+    def __init__(self):
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        # 현재 수집 중인 문제 객체의 문자들 (수집 중이 아니면 None)
+        self._current = None
+        self._current_depth = 0
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        응답 조각을 추가하고 새로 완성된 문제 객체 목록을 반환
+        """
+        completed = []
+
+        for char in chunk:
+            if self._current is not None:
+                self._current.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                # 배열의 직접적인 원소인 객체가 시작되면 수집 시작
+                if (char == "{" and self._current is None and self._stack
+                        and self._stack[-1] == "[" and len(self._stack) <= 2):
+                    self._current = [char]
+                    self._current_depth = len(self._stack)
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if char == "}" and self._current is not None and len(self._stack) == self._current_depth:
+                    question = self._decode("".join(self._current))
+                    self._current = None
+                    if question is not None:
+                        completed.append(question)
+
+        return completed
+
+    @staticmethod
+    def _decode(text: str) -> Optional[Dict]:
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        return obj if isinstance(obj, dict) else None
+
+
+class QuestionStream:
+    """
+    백그라운드에서 채워지는 세션별 문제 목록
+
+    첫 문제가 도착하면 바로 퀴즈를 시작하고, 나머지 문제는 스트리밍되는 동안
+    questions 리스트에 순서대로 추가됩니다.
+    """
+
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.questions: List[Dict] = []
+        self.done = False
+        self.error: Optional[Exception] = None
+        # 생성이 모자랄 때 오프라인 문제 은행에서 채우며 사용하는 사용자 키
+        self.user_key: Optional[str] = None
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_questions(cls, questions: List[Dict]) -> "QuestionStream":
+        """
+        이미 준비된 문제로 완료 상태의 스트림 생성 (풀/저장소 적중 시)
+        """
+        stream = cls(len(questions))
+        stream.questions.extend(questions)
+        stream.done = True
+        return stream
+
+    def append(self, question: Dict) -> bool:
+        """
+        도착한 문제 추가. 예상 개수를 채웠으면 False를 반환
+        """
+        with self._cond:
+            if len(self.questions) >= self.expected:
+                return False
+            self.questions.append(question)
+            self._cond.notify_all()
+            return len(self.questions) < self.expected
+
+    def finish(self, error: Optional[Exception] = None,
+               on_complete: Optional[Callable[[List[Dict]], None]] = None):
+        """
+        스트림 종료 처리 (대기 중인 쪽을 깨움)
+        """
+        with self._cond:
+            self.error = error
+            self.done = True
+            self._cond.notify_all()
+        if on_complete and self.questions:
+            on_complete(list(self.questions))
+
+    def wait_for(self, count: int, timeout: Optional[float] = None) -> bool:
+        """
+        문제가 count개 이상 도착할 때까지 대기. 도착했으면 True
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: len(self.questions) >= count or self.done, timeout)
+            return len(self.questions) >= count
+
+    @property
+    def total(self) -> int:
+        """
+        이 퀴즈의 최종 문제 수 (스트림이 일찍 끝나면 받은 문제 수)
+        """
+        return len(self.questions) if self.done else self.expected
@@ -0,0 +1,18 @@
+def is_valid_question(question) -> bool:
+    """
+    생성된 문제 형식 검증 (지문, 4개 선택지, 범위 안의 정답 인덱스, 설명)
+    """
+    if not isinstance(question, dict):
+        return False
+    text = question.get("question")
+    options = question.get("options")
+    correct_answer = question.get("correct_answer")
+    explanation = question.get("explanation")
+    return bool(
+        isinstance(text, str) and text.strip()
+        and isinstance(options, list) and len(options) == 4
+        and all(isinstance(option, str) and option.strip() for option in options)
+        and isinstance(correct_answer, int) and not isinstance(correct_answer, bool)
+        and 0 <= correct_answer < len(options)
+        and isinstance(explanation, str) and explanation.strip()
+    )
@@ -1,52 +1,429 @@
 import openai
 import json
 import random
-from typing import Dict, List
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import CancelledError, Future
+from typing import Dict, List, Optional
 import streamlit as st
-from config import OPENAI_API_KEY, QUESTIONS_PER_QUIZ
+from config import (
+    get_settings, QUESTIONS_PER_QUIZ, QUIZ_DIFFICULTY_LEVELS,
+    QUESTION_POOL_ENABLED, QUESTION_POOL_LOW_WATERMARK, QUESTION_POOL_HIGH_WATERMARK,
+    QUESTION_STORE_PATH, QUESTION_STORE_MAX_SERVES, BACKUP_QUESTIONS,
+    ASYNC_MAX_CONCURRENCY, GENERATION_TIMEOUT,
+    DEDUP_SIMILARITY_THRESHOLD, DEDUP_MAX_ATTEMPTS,
+    LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE, LLM_BACKOFF_MAX, COALESCE_MAX_QUESTIONS,
+    ANALYTICS_MIN_ANSWERS, ANALYTICS_EASY_THRESHOLD, ANALYTICS_HARD_THRESHOLD,
+    ANALYTICS_RETIRE_DISCRIMINATION, ANALYTICS_REFRESH_EVERY, QUESTION_REGISTRY_MAX_UNUSED,
+    OFFLINE_BANK_PATH, OFFLINE_COOLDOWN, OFFLINE_SEEN_BITS, OFFLINE_SEEN_TTL, OFFLINE_SEEN_MAXSIZE,
+    SHARED_CACHE_ENABLED, SHARED_CACHE_PATH
+)
+from async_engine import AsyncGenerationEngine
+from dedup_index import NearDuplicateIndex
+from llm_telemetry import LLMTelemetry
+from question_bank import QuestionBank, SeenFilter
+from question_stream import QuestionStream, QuestionStreamParser
+from question_pool import QuestionPool, SharedQuestionPool
+from question_analytics import QuestionAnalytics
+from question_registry import QuestionRegistry
+from question_store import QuestionStore, question_id
+from question_validation import is_valid_question
+from request_scheduler import RETRYABLE_ERRORS, RequestCoalescer, RequestScheduler, estimate_tokens
+from shared_cache import SharedCache
+from ttl_cache import TTLCache
+
+DIFFICULTY_PROMPTS = {
+    "쉬움": "초등학생도 알 수 있는 매우 기본적인",
+    "보통": "중고등학생 수준의 일반적인",
+    "어려움": "대학생이나 성인이 알만한 고급"
+}
+
+# 이 오류로 생성이 실패하면 OFFLINE_COOLDOWN초 동안 API 대신 오프라인 문제 은행에서 출제
+OFFLINE_ERRORS = RETRYABLE_ERRORS + (openai.AuthenticationError, openai.APITimeoutError)
+
+SYSTEM_PROMPT = "당신은 교육 전문가이며, 양질의 퀴즈 문제를 생성하는 전문가입니다. 요청된 개수만큼 정확히 문제를 생성해주세요."
+
+def parse_questions(content: str) -> List[Dict]:
+    """
+    응답 본문에서 문제 목록 추출. JSON이 중간에 잘렸으면 완성된 문제 객체만 살림
+    스트림 파서와 같이 {"questions": [...]} 와 최상위 배열 [...] 형식을 모두 지원
+    """
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        salvaged = QuestionStreamParser().feed(content)
+        if not salvaged:
+            raise
+        return salvaged
+    if isinstance(data, dict):
+        data = data.get("questions", [])
+    if not isinstance(data, list):
+        return []
+    return [question for question in data if isinstance(question, dict)]
 
 class QuizService:
     def __init__(self):
-        self.client = None
+        self.engine = None
         self.api_available = False
+        # 생성 중 발생한 문제 (워밍업 스레드에서 만들어질 수 있으므로 안내는 app.py에서 표시)
+        self.api_error: Optional[str] = None
+        self.bank_error: Optional[str] = None
+        self.pool = None
+        # API 호출별 지연/토큰/실패 집계
+        self.telemetry = LLMTelemetry()
+        # 프로세스 전체 요청 한도/429 백오프와 같은 난이도 동시 요청 합치기
+        self.scheduler = RequestScheduler(
+            LLM_REQUESTS_PER_MINUTE,
+            LLM_TOKENS_PER_MINUTE,
+            max_retries=LLM_MAX_RETRIES,
+            backoff_base=LLM_BACKOFF_BASE,
+            backoff_max=LLM_BACKOFF_MAX
+        )
+        self.coalescer = RequestCoalescer(max_total=COALESCE_MAX_QUESTIONS)
+        # 세션은 문제 ID만 보유하고 문제 내용은 프로세스 전체에서 한 번만 보관
+        self.question_registry = QuestionRegistry(max_unused=QUESTION_REGISTRY_MAX_UNUSED)
+        self.store = QuestionStore(
+            QUESTION_STORE_PATH,
+            seed_questions=BACKUP_QUESTIONS,
+            max_serves=QUESTION_STORE_MAX_SERVES
+        )
+        # 유사 문제 색인 (저장된 문제로 백그라운드에서 초기화)
+        self.dedup_index = NearDuplicateIndex(threshold=DEDUP_SIMILARITY_THRESHOLD)
+        threading.Thread(
+            target=self.dedup_index.load,
+            args=(self.store.iter_questions(),),
+            name="dedup-index-loader",
+            daemon=True
+        ).start()
+        # 문항별 답안 통계 (시작 시 전체 기록을 백그라운드에서 집계)
+        self.analytics = QuestionAnalytics(
+            self.store,
+            QUIZ_DIFFICULTY_LEVELS,
+            min_answers=ANALYTICS_MIN_ANSWERS,
+            easy_threshold=ANALYTICS_EASY_THRESHOLD,
+            hard_threshold=ANALYTICS_HARD_THRESHOLD,
+            retire_below=ANALYTICS_RETIRE_DISCRIMINATION,
+            refresh_every=ANALYTICS_REFRESH_EVERY
+        )
+        self.analytics.refresh_in_background()
+        # 오프라인 문제 은행 (파일이 없으면 사용하지 않음)과 사용자별 출제 기록
+        self.bank = None
+        try:
+            self.bank = QuestionBank.open(OFFLINE_BANK_PATH)
+        except Exception as e:
+            self.bank_error = str(e)
+        self.seen_filters = TTLCache(maxsize=OFFLINE_SEEN_MAXSIZE, ttl=OFFLINE_SEEN_TTL)
+        self._offline_until = 0.0
         
-        if OPENAI_API_KEY and OPENAI_API_KEY.strip() and OPENAI_API_KEY != "your_openai_api_key_here":
+        api_key = get_settings().openai_api_key
+        if api_key and api_key.strip() and api_key != "your_openai_api_key_here":
             try:
-                self.client = openai.OpenAI(api_key=OPENAI_API_KEY)
+                # 모든 API 호출은 전용 이벤트 루프의 비동기 클라이언트로 실행
+                # (재시도는 클라이언트 대신 스케줄러가 지터 백오프로 처리)
+                self.engine = AsyncGenerationEngine(api_key, max_concurrency=ASYNC_MAX_CONCURRENCY, max_retries=0)
+                self.engine.start()
                 self.api_available = True
-                st.success("🤖 OpenAI API 연결 성공! AI가 맞춤형 문제를 생성합니다.")
             except Exception as e:
-                st.error(f"❌ OpenAI API 연결 실패: {str(e)}")
-                st.warning("⚠️ API 키를 확인해주세요. API 키가 없으면 퀴즈를 플레이할 수 없습니다.")
-                self.client = None
+                self.api_error = str(e)
+                self.engine = None
                 self.api_available = False
-        else:
-            st.error("💡 OpenAI API 키가 필요합니다!")
-            st.info("🔑 API 키를 설정하지 않으면 퀴즈를 플레이할 수 없습니다.")
-            st.info("📖 setup_guide.md 파일을 참고하여 OpenAI API 키를 설정해주세요.")
-            self.api_available = False
+        
+        # 사전 생성 문제 풀 (백그라운드에서 워터마크까지 리필)
+        # 공유 캐시를 쓰면 같은 서버의 모든 앱 프로세스가 하나의 풀을 함께 사용
+        if self.api_available and QUESTION_POOL_ENABLED:
+            pool_options = dict(
+                low_watermark=QUESTION_POOL_LOW_WATERMARK,
+                high_watermark=QUESTION_POOL_HIGH_WATERMARK,
+                batch_size=QUESTION_POOL_HIGH_WATERMARK
+            )
+            if SHARED_CACHE_ENABLED:
+                self.pool = SharedQuestionPool(
+                    SharedCache(SHARED_CACHE_PATH),
+                    self._generate_for_pool,
+                    QUIZ_DIFFICULTY_LEVELS,
+                    lease_ttl=GENERATION_TIMEOUT * 2,
+                    **pool_options
+                )
+            else:
+                self.pool = QuestionPool(self._generate_for_pool, QUIZ_DIFFICULTY_LEVELS, **pool_options)
+            self.pool.start()
     
-    def generate_quiz_questions(self, difficulty: str = "보통", num_questions: int = QUESTIONS_PER_QUIZ) -> List[Dict]:
+    def generate_quiz_questions(self, difficulty: str = "보통", num_questions: int = QUESTIONS_PER_QUIZ,
+                                user_key: Optional[str] = None) -> List[Dict]:
         """
-        OpenAI를 사용하여 퀴즈 문제 생성 (백업 문제 없음)
+        OpenAI를 사용하여 퀴즈 문제 생성 (API가 없거나 실패하면 오프라인 문제 은행에서 출제)
         """
-        if not self.client or not self.api_available:
-            st.error("❌ OpenAI API가 설정되지 않았습니다.")
-            st.info("🔑 API 키를 설정해주세요. 백업 문제는 제공하지 않습니다.")
+        if not self.api_available:
+            offline = self.take_offline_questions(difficulty, num_questions, user_key)
+            if offline:
+                return offline
+            st.error("❌ OpenAI API가 설정되지 않았고 오프라인 문제 은행에도 출제할 문제가 없습니다.")
+            st.info("🔑 API 키를 설정하거나 build_question_bank.py로 오프라인 문제 은행을 만들어주세요.")
             return []
         
         # API 호출 전 사용자에게 알림
         with st.spinner("🤖 AI가 새로운 문제를 생성 중입니다..."):
             try:
-                difficulty_prompts = {
-                    "쉬움": "초등학생도 알 수 있는 매우 기본적인",
-                    "보통": "중고등학생 수준의 일반적인",
-                    "어려움": "대학생이나 성인이 알만한 고급"
-                }
-                
-                difficulty_description = difficulty_prompts.get(difficulty, "일반적인")
-                
-                prompt = f"""
+                questions = self._request_questions(difficulty, num_questions)
+            except Exception as e:
+                self._note_api_failure(e)
+                offline = self.take_offline_questions(difficulty, num_questions, user_key)
+                if offline:
+                    st.warning("⚠️ AI 문제 생성에 실패하여 오프라인 문제 은행의 문제로 출제합니다.")
+                    return offline
+                self.report_generation_error(e)
+                return []
+            
+            if questions and len(questions) >= num_questions:
+                self.store.add_questions(difficulty, questions[:num_questions], served=1)
+                st.success("✨ AI가 새로운 문제를 성공적으로 생성했습니다!")
+                return questions[:num_questions]
+            else:
+                # 부족분 재요청 후에도 모자라면 검증된 문제는 저장소에 남겨 다음 퀴즈에서 사용
+                if questions:
+                    self.store.add_questions(difficulty, questions)
+                offline = self.take_offline_questions(difficulty, num_questions, user_key)
+                if offline:
+                    st.warning("⚠️ AI가 충분한 문제를 생성하지 못해 오프라인 문제 은행의 문제로 출제합니다.")
+                    return offline
+                st.error(f"❌ AI가 충분한 문제를 생성하지 못했습니다. (요청: {num_questions}개, 생성: {len(questions)}개)")
+                st.warning("⚠️ 다시 시도해주세요.")
+                return []
+    
+    def report_generation_error(self, error: Exception):
+        """
+        문제 생성 중 발생한 예외를 사용자에게 안내
+        """
+        if isinstance(error, json.JSONDecodeError):
+            st.error(f"❌ AI 응답 해석 실패: {str(error)}")
+            st.warning("⚠️ AI 응답을 이해할 수 없습니다. 다시 시도해주세요.")
+        
+        elif isinstance(error, openai.AuthenticationError):
+            st.error("❌ OpenAI API 인증 실패!")
+            st.warning("🔑 API 키가 유효하지 않습니다. 설정을 확인해주세요.")
+            self.api_available = False
+        
+        elif isinstance(error, openai.RateLimitError):
+            st.error("❌ API 사용량 한도 초과!")
+            st.warning("⏰ 잠시 후 다시 시도해주세요.")
+        
+        elif isinstance(error, openai.APIConnectionError):
+            st.error("❌ OpenAI 서버 연결 실패!")
+            st.warning("🌐 인터넷 연결을 확인하고 다시 시도해주세요.")
+        
+        elif isinstance(error, openai.APIError):
+            st.error(f"❌ OpenAI API 오류: {str(error)}")
+            st.warning("⚠️ API 서비스에 문제가 있습니다. 잠시 후 다시 시도해주세요.")
+        
+        else:
+            st.error(f"❌ 예상치 못한 오류 발생: {str(error)}")
+            st.warning("⚠️ 시스템 오류가 발생했습니다. 다시 시도해주세요.")
+    
+    def start_quiz_stream(self, difficulty: str = "보통", num_questions: int = QUESTIONS_PER_QUIZ,
+                          user_key: Optional[str] = None) -> Optional[QuestionStream]:
+        """
+        퀴즈 문제 스트림 시작 (문제 풀/저장소/오프라인 문제 은행 적중 시 즉시 완료된 스트림 반환)
+        첫 문제가 도착하면 바로 퀴즈를 시작할 수 있습니다.
+        """
+        if self.pool:
+            questions = self.pool.take(difficulty, num_questions)
+            if questions:
+                return QuestionStream.from_questions(questions)
+        questions = self.store.take(difficulty, num_questions)
+        if questions:
+            return QuestionStream.from_questions(questions)
+        if self.offline_mode:
+            questions = self.take_offline_questions(difficulty, num_questions, user_key)
+            if questions:
+                return QuestionStream.from_questions(questions)
+        
+        if not self.api_available:
+            st.error("❌ OpenAI API가 설정되지 않았고 오프라인 문제 은행에도 출제할 문제가 없습니다.")
+            st.info("🔑 API 키를 설정하거나 build_question_bank.py로 오프라인 문제 은행을 만들어주세요.")
+            return None
+        
+        # 같은 난이도로 동시에 시작한 세션은 하나의 스트리밍 생성을 나눠 받음
+        stream = QuestionStream(num_questions)
+        stream.user_key = user_key
+        self.coalescer.join(
+            ("stream", difficulty), stream, num_questions,
+            start=lambda batch: self._start_stream_batch(difficulty, batch)
+        )
+        return stream
+    
+    def _start_stream_batch(self, difficulty: str, batch):
+        """
+        묶음의 스트리밍 생성을 엔진에 제출하고, 끝나면 묶음의 모든 스트림을 종료
+        """
+        on_complete = lambda questions: self.store.add_questions(difficulty, questions, served=1)
+        future = self.engine.submit(
+            lambda client: self._stream_questions_async(client, difficulty, batch)
+        )
+        
+        def finish(f):
+            error = CancelledError() if f.cancelled() else f.exception()
+            if error is not None:
+                self._note_api_failure(error)
+            for stream in batch.waiters:
+                # 생성이 실패했거나 모자라면 오프라인 문제 은행으로 채움
+                missing = stream.expected - len(stream.questions)
+                if missing > 0:
+                    for question in self.take_offline_questions(difficulty, missing, stream.user_key):
+                        stream.append(question)
+                stream.finish(error if len(stream.questions) < stream.expected else None, on_complete)
+        
+        future.add_done_callback(finish)
+    
+    async def _stream_questions_async(self, client: openai.AsyncOpenAI, difficulty: str, batch):
+        """
+        스트리밍 응답으로 문제 생성. 각 문제 객체가 완성되는 즉시 묶음의 스트림에 번갈아 추가하여
+        함께 기다리는 모든 세션이 첫 문제를 빨리 받도록 함
+        이벤트 루프 스레드에서 실행되므로 st.* 를 사용하지 않습니다.
+        """
+        streams = self.coalescer.close(batch)
+        num_questions = sum(stream.expected for stream in streams)
+        pending = deque(streams)
+        delivered = 0
+        kwargs = self._completion_kwargs(difficulty, num_questions)
+        call = self.telemetry.begin("stream", difficulty, num_questions, queued_at=batch.created_at)
+        try:
+            response = await self.scheduler.run(
+                lambda: client.chat.completions.create(**kwargs, stream=True),
+                estimate_tokens(kwargs),
+                call
+            )
+            
+            parser = QuestionStreamParser()
+            # 스트리밍 응답에는 usage가 없으므로 조각 수(대략 토큰 수)를 완성 토큰으로 기록
+            chunks = 0
+            async for chunk in response:
+                call.first_byte()
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
+                chunks += 1
+                call.completion_tokens = chunks
+                parse_started = time.perf_counter()
+                questions = parser.feed(content)
+                call.add_parse_time(time.perf_counter() - parse_started)
+                for question in questions:
+                    # 형식이 잘못되었거나 이미 출제된 문제와 유사하면 건너뜀
+                    if not is_valid_question(question):
+                        call.invalid += 1
+                        continue
+                    if not self.dedup_index.add(question):
+                        continue
+                    stream = pending.popleft()
+                    delivered += 1
+                    if stream.append(question):
+                        pending.append(stream)
+                    if not pending:
+                        call.finish(delivered)
+                        await response.response.aclose()
+                        return
+        except Exception as e:
+            call.fail(e, delivered)
+            raise
+        call.finish(delivered)
+        
+        # 검증/중복으로 빠진 만큼만 추가 생성
+        missing = num_questions - delivered
+        if missing > 0:
+            for question in await self._request_questions_async(client, difficulty, missing):
+                if not pending:
+                    break
+                stream = pending.popleft()
+                if stream.append(question):
+                    pending.append(stream)
+    
+    def get_quiz_questions(self, difficulty: str = "보통", num_questions: int = QUESTIONS_PER_QUIZ,
+                           user_key: Optional[str] = None) -> List[Dict]:
+        """
+        퀴즈 문제 가져오기 (문제 풀 → 로컬 저장소 → 즉시 생성 순, API 장애 중에는 오프라인 문제 은행)
+        """
+        if self.pool:
+            questions = self.pool.take(difficulty, num_questions)
+            if questions:
+                return questions
+        questions = self.store.take(difficulty, num_questions)
+        if questions:
+            return questions
+        if self.offline_mode:
+            questions = self.take_offline_questions(difficulty, num_questions, user_key)
+            if questions:
+                return questions
+        return self.generate_quiz_questions(difficulty, num_questions, user_key)
+    
+    @property
+    def offline_mode(self) -> bool:
+        """
+        API를 쓸 수 없거나 최근 한도 초과/연결 실패로 쉬는 중이면 True
+        """
+        return not self.api_available or time.monotonic() < self._offline_until
+    
+    @property
+    def offline_available(self) -> bool:
+        """
+        오프라인 문제 은행에 출제할 문제가 있으면 True (API 없이도 플레이 가능)
+        """
+        return bool(self.bank and any(self.bank.count(d) for d in self.bank.difficulties))
+    
+    def _note_api_failure(self, error: BaseException):
+        if isinstance(error, OFFLINE_ERRORS):
+            self._offline_until = time.monotonic() + OFFLINE_COOLDOWN
+    
+    def take_offline_questions(self, difficulty: str, num_questions: int,
+                               user_key: Optional[str] = None) -> List[Dict]:
+        """
+        오프라인 문제 은행에서 사용자가 최근에 받지 않은 문제를 뽑음 (API 호출 없음)
+        문제 은행이 없거나 문제가 부족하면 빈 리스트를 반환
+        """
+        if not self.bank or num_questions <= 0:
+            return []
+        seen = None
+        if user_key:
+            seen = self.seen_filters.get((user_key, difficulty), None)
+            if seen is None:
+                seen = SeenFilter(OFFLINE_SEEN_BITS)
+                self.seen_filters.set((user_key, difficulty), seen)
+        return self.bank.sample(difficulty, num_questions, seen)
+    
+    def _generate_for_pool(self, difficulty: str, num_questions: int) -> List[Dict]:
+        """
+        문제 풀 리필용 생성. 필요한 문제 수를 퀴즈 단위로 나누어 동시에 요청하고
+        생성된 문제는 저장소에도 보관
+        """
+        futures = [
+            self.generate_questions_async(difficulty, min(QUESTIONS_PER_QUIZ, num_questions - start))
+            for start in range(0, num_questions, QUESTIONS_PER_QUIZ)
+        ]
+        
+        questions = []
+        errors = []
+        for future in futures:
+            try:
+                questions.extend(future.result(timeout=GENERATION_TIMEOUT))
+            except Exception as e:
+                errors.append(e)
+        if not questions and errors:
+            raise errors[0]
+        
+        # 풀에서 한 번 출제될 문제이므로 출제 횟수 1로 저장
+        self.store.add_questions(difficulty, questions, served=1)
+        return questions
+    
+    def _build_prompt(self, difficulty: str, num_questions: int) -> str:
+        """
+        난이도별 문제 생성 프롬프트 작성
+        """
+        difficulty_description = DIFFICULTY_PROMPTS.get(difficulty, "일반적인")
+        
+        return f"""
                 {difficulty_description} 상식 문제 {num_questions}개를 생성해주세요.
                 각 문제는 4지선다 형식이어야 하며, 다음 JSON 형식으로 반환해주세요:
 
@@ -56,7 +433,8 @@ class QuizService:
                             "question": "문제 내용",
                             "options": ["선택지1", "선택지2", "선택지3", "선택지4"],
                             "correct_answer": 0,
-                            "explanation": "정답 설명"
+                            "explanation": "정답 설명",
+                            "category": "분야"
                         }}
                     ]
                 }}
@@ -69,60 +447,105 @@ class QuizService:
                 - 설명은 간단명료하게 작성
                 - 정확히 {num_questions}개의 문제를 생성해주세요
                 """
-                
-                response = self.client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "당신은 교육 전문가이며, 양질의 퀴즈 문제를 생성하는 전문가입니다. 요청된 개수만큼 정확히 문제를 생성해주세요."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=2500
+    
+    def _completion_kwargs(self, difficulty: str, num_questions: int) -> Dict:
+        """
+        문제 생성용 chat.completions.create 인자
+        """
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": self._build_prompt(difficulty, num_questions)}
+            ],
+            "temperature": 0.7,
+            # 합쳐진 요청은 문제 수가 많으므로 문제당 400토큰 기준으로 늘림 (최대 4000)
+            "max_tokens": min(4000, max(2500, 400 * num_questions))
+        }
+    
+    def generate_questions_async(self, difficulty: str, num_questions: int) -> Future:
+        """
+        이벤트 루프에서 문제 생성을 실행하고 Future 반환 (동시 요청 수는 엔진이 제한)
+        같은 난이도의 동시 요청은 하나의 생성으로 합친 뒤 요청 순서대로 나눠 받음
+        """
+        future = Future()
+        self.coalescer.join(
+            ("complete", difficulty), (num_questions, future), num_questions,
+            start=lambda batch: self._start_request_batch(difficulty, batch)
+        )
+        return future
+    
+    def _start_request_batch(self, difficulty: str, batch):
+        """
+        묶음 전체 문제 수로 생성을 제출하고, 결과를 대기자별 개수대로 나눔
+        """
+        async def run(client: openai.AsyncOpenAI) -> List[Dict]:
+            waiters = self.coalescer.close(batch)
+            total = sum(count for count, _ in waiters)
+            return await self._request_questions_async(client, difficulty, total, batch.created_at)
+        
+        def split(f):
+            error = CancelledError() if f.cancelled() else f.exception()
+            if error is not None:
+                self._note_api_failure(error)
+            questions = [] if error else f.result()
+            start = 0
+            for count, waiter in batch.waiters:
+                if error:
+                    waiter.set_exception(error)
+                    continue
+                waiter.set_result(questions[start:start + count])
+                start += count
+        
+        self.engine.submit(run).add_done_callback(split)
+    
+    async def _request_questions_async(self, client: openai.AsyncOpenAI, difficulty: str,
+                                       num_questions: int, queued_at: Optional[float] = None) -> List[Dict]:
+        """
+        문제 생성 후 형식이 잘못된 문제와 유사 문제를 걸러내고, 부족한 개수만큼만 다시 요청
+        """
+        questions = []
+        for attempt in range(DEDUP_MAX_ATTEMPTS):
+            missing = num_questions - len(questions)
+            # 엔진 대기 시간은 첫 요청에만 해당
+            call = self.telemetry.begin(
+                "complete", difficulty, missing, attempt=attempt,
+                queued_at=queued_at if attempt == 0 else None
+            )
+            kwargs = self._completion_kwargs(difficulty, missing)
+            try:
+                response = await self.scheduler.run(
+                    lambda: client.chat.completions.create(**kwargs),
+                    estimate_tokens(kwargs),
+                    call
                 )
-                
-                content = response.choices[0].message.content
-                
-                # JSON 파싱
-                try:
-                    quiz_data = json.loads(content)
-                    questions = quiz_data.get("questions", [])
-                    if questions and len(questions) >= num_questions:
-                        st.success("✨ AI가 새로운 문제를 성공적으로 생성했습니다!")
-                        return questions[:num_questions]
-                    else:
-                        st.error(f"❌ AI가 충분한 문제를 생성하지 못했습니다. (요청: {num_questions}개, 생성: {len(questions)}개)")
-                        st.warning("⚠️ 다시 시도해주세요.")
-                        return []
-                except json.JSONDecodeError as e:
-                    st.error(f"❌ AI 응답 해석 실패: {str(e)}")
-                    st.warning("⚠️ AI 응답을 이해할 수 없습니다. 다시 시도해주세요.")
-                    return []
-                    
-            except openai.AuthenticationError:
-                st.error("❌ OpenAI API 인증 실패!")
-                st.warning("🔑 API 키가 유효하지 않습니다. 설정을 확인해주세요.")
-                self.api_available = False
-                return []
-            
-            except openai.RateLimitError:
-                st.error("❌ API 사용량 한도 초과!")
-                st.warning("⏰ 잠시 후 다시 시도해주세요.")
-                return []
-            
-            except openai.APIConnectionError:
-                st.error("❌ OpenAI 서버 연결 실패!")
-                st.warning("🌐 인터넷 연결을 확인하고 다시 시도해주세요.")
-                return []
-            
-            except openai.APIError as e:
-                st.error(f"❌ OpenAI API 오류: {str(e)}")
-                st.warning("⚠️ API 서비스에 문제가 있습니다. 잠시 후 다시 시도해주세요.")
-                return []
-            
+                # 비스트리밍 응답은 본문 전체를 받은 뒤 반환되므로 첫 바이트 시간은 기록하지 않음
+                call.set_usage(response.usage)
+                parse_started = time.perf_counter()
+                batch = parse_questions(response.choices[0].message.content)
+                valid = [question for question in batch if is_valid_question(question)]
+                new_questions = self.dedup_index.filter_new(valid)
+                call.add_parse_time(time.perf_counter() - parse_started)
+                call.invalid = len(batch) - len(valid)
             except Exception as e:
-                st.error(f"❌ 예상치 못한 오류 발생: {str(e)}")
-                st.warning("⚠️ 시스템 오류가 발생했습니다. 다시 시도해주세요.")
-                return []
+                call.fail(e)
+                # 첫 요청 실패는 그대로 전달, 재요청 실패 시에는 지금까지의 문제 반환
+                if attempt == 0:
+                    raise
+                break
+            
+            call.finish(len(new_questions))
+            questions.extend(new_questions)
+            if len(questions) >= num_questions or not batch:
+                break
+        return questions
+    
+    def _request_questions(self, difficulty: str, num_questions: int) -> List[Dict]:
+        """
+        OpenAI API 호출 후 문제 목록 반환 (UI 출력 없음, 오류는 예외로 전달)
+        백그라운드 스레드에서도 호출되므로 st.* 를 사용하지 않습니다.
+        """
+        return self.generate_questions_async(difficulty, num_questions).result(timeout=GENERATION_TIMEOUT)
     
     def check_answer(self, user_answer: int, correct_answer: int) -> bool:
         """
@@ -130,6 +553,29 @@ class QuizService:
         """
         return user_answer == correct_answer
     
+    def record_answers(self, questions: List[Dict], results: List[bool]):
+        """
+        퀴즈 한 번의 문항별 정답 여부 기록 (문항 정답률/변별도 계산용)
+        """
+        count = len(results)
+        if not count:
+            return
+        quiz_id = uuid.uuid4().hex
+        total_correct = sum(results)
+        now = time.time()
+        # 나머지 점수: 같은 퀴즈에서 이 문항을 뺀 나머지 문항의 정답률
+        rows = [
+            (
+                question_id(question), quiz_id, int(correct),
+                (total_correct - correct) / (count - 1) if count > 1 else None, now
+            )
+            for question, correct in zip(questions, results)
+        ]
+        try:
+            self.analytics.record(rows)
+        except Exception as e:
+            st.warning(f"⚠️ 답안 기록 저장 실패: {str(e)}")
+    
     def calculate_score(self, correct_answers: int, total_questions: int) -> int:
         """
         점수 계산
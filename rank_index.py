@@ -0,0 +1,185 @@
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class FenwickTree:
+    """
+    구간 합 트리 (점 갱신과 접두사 합이 모두 O(log n))
+    """
+
+    __slots__ = ("_tree",)
+
+    def __init__(self, size: int):
+        self._tree = [0] * (size + 1)
+
+    @classmethod
+    def from_counts(cls, counts: List[int]) -> "FenwickTree":
+        # O(n) 구성: 각 노드의 값을 부모 노드에 한 번씩 더함
+        tree = cls(len(counts))
+        nodes = tree._tree
+        nodes[1:] = counts
+        for i in range(1, len(nodes)):
+            parent = i + (i & -i)
+            if parent < len(nodes):
+                nodes[parent] += nodes[i]
+        return tree
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    def add(self, index: int, delta: int):
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index: int) -> int:
+        """
+        0..index 구간의 합
+        """
+        total = 0
+        i = min(index + 1, len(self._tree) - 1)
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+
+class RankIndex:
+    """
+    총점 순위 색인
+
+    총점을 bucket_size 단위 구간으로 나눠 구간별 사용자 수를 펜윅 트리에 보관하므로
+    "내 순위"는 나보다 높은 구간의 사용자 수를 O(log n)으로 세어 구합니다.
+    점수가 모두 bucket_size의 배수이면 정확한 순위이고(같은 점수는 같은 순위),
+    아니면 같은 구간 안의 사용자를 동점으로 봅니다.
+    시작할 때 저장소의 전체 사용자 총점으로 만들고, 이후에는 저장된 결과의 증가분으로 갱신합니다.
+    다른 프로세스가 저장한 결과와 재구성 중의 오차는 주기적인 재구성으로 맞춥니다.
+    """
+
+    def __init__(self, bucket_size: int = 10, initial_buckets: int = 1024):
+        self.bucket_size = max(int(bucket_size), 1)
+        self._lock = threading.Lock()
+        self._scores: Dict[str, int] = {}
+        self._counts = [0] * initial_buckets
+        self._tree = FenwickTree(initial_buckets)
+        self._ready = False
+        # 재구성 중에 들어온 증가분 (읽어 온 총점에 다시 더함)
+        self._pending: Optional[Dict[str, int]] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def rebuild(self, totals: Iterable[Tuple[str, int]]) -> int:
+        """
+        전체 사용자 총점으로 색인을 다시 만들고 사용자 수를 반환
+        저장소 읽기는 잠금 밖에서 하므로 그동안에도 순위 조회와 갱신이 가능
+        """
+        with self._lock:
+            self._pending = {}
+        try:
+            loaded = {user_id: int(score or 0) for user_id, score in totals}
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            # 읽는 도중 저장된 결과는 읽은 총점에 이미 포함되어 두 번 더해질 수 있음
+            # (저장소의 총점에는 결과 ID가 없어 구분할 수 없으므로, 다음 주기 재구성에서 바로잡힘)
+            for user_id, delta in self._pending.items():
+                loaded[user_id] = loaded.get(user_id, 0) + delta
+            self._pending = None
+            self._scores = loaded
+            size = len(self._counts)
+            top = max((self._bucket(score) for score in loaded.values()), default=0)
+            while size <= top:
+                size *= 2
+            counts = [0] * size
+            for score in loaded.values():
+                counts[self._bucket(score)] += 1
+            self._counts = counts
+            self._tree = FenwickTree.from_counts(counts)
+            self._ready = True
+            return len(loaded)
+
+    def add(self, user_id: str, delta: int):
+        """
+        사용자 총점에 delta를 더함 (처음 보는 사용자는 0점에서 시작)
+        """
+        with self._lock:
+            self._set(user_id, self._scores.get(user_id, 0) + int(delta))
+            if self._pending is not None:
+                self._pending[user_id] = self._pending.get(user_id, 0) + int(delta)
+
+    def rank(self, user_id: str) -> Optional[Dict]:
+        """
+        {"rank", "total", "top_percent", "score"}. 색인이 준비되지 않았거나 없는 사용자면 None
+        """
+        with self._lock:
+            if not self._ready or user_id not in self._scores:
+                return None
+            return self._rank_of(self._scores[user_id])
+
+    def rebuild_in_background(self, load_fn: Callable[[], Iterable[Tuple[str, int]]], interval: float = 0.0):
+        """
+        백그라운드에서 재구성. interval초마다 다시 만들어 다른 프로세스가 저장한 결과도 반영
+        """
+        def run():
+            while True:
+                try:
+                    count = self.rebuild(load_fn())
+                    logger.info("순위 색인 재구성: 사용자 %d명", count)
+                except Exception as e:
+                    logger.warning("순위 색인 재구성 실패: %s", e)
+                if interval <= 0:
+                    return
+                time.sleep(interval)
+
+        threading.Thread(target=run, name="rank-index", daemon=True).start()
+
+    def _bucket(self, score: int) -> int:
+        return max(score, 0) // self.bucket_size
+
+    def _set(self, user_id: str, score: int):
+        previous = self._scores.get(user_id)
+        if previous is not None:
+            old_bucket = self._bucket(previous)
+            self._counts[old_bucket] -= 1
+            self._tree.add(old_bucket, -1)
+        bucket = self._bucket(score)
+        if bucket >= len(self._counts):
+            self._grow(bucket)
+        self._counts[bucket] += 1
+        self._tree.add(bucket, 1)
+        self._scores[user_id] = score
+
+    def _grow(self, bucket: int):
+        size = len(self._counts)
+        while size <= bucket:
+            size *= 2
+        self._counts.extend([0] * (size - len(self._counts)))
+        self._tree = FenwickTree.from_counts(self._counts)
+
+    def _rank_of(self, score: int) -> Dict:
+        total = len(self._scores)
+        bucket = self._bucket(score)
+        # 나보다 높은 구간의 사용자 수 + 1
+        higher = total - self._tree.prefix_sum(bucket) if bucket < len(self._counts) else 0
+        rank = higher + 1
+        return {
+            "rank": rank,
+            "total": total,
+            # 소수 첫째 자리에서 올림 (1위가 "상위 0%"로 보이지 않게)
+            "top_percent": math.ceil(rank / total * 1000) / 10 if total else 100.0,
+            "score": score
+        }
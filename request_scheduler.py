@@ -0,0 +1,190 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+import openai
+
+# 잠시 후 다시 시도하면 성공할 수 있는 오류 (429, 연결 오류, 5xx)
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+
+def estimate_tokens(kwargs: Dict) -> int:
+    """
+    chat.completions.create 인자로 예약할 토큰 수 추정 (프롬프트 글자 수 + max_tokens)
+    OpenAI도 한도를 계산할 때 max_tokens를 미리 포함하므로 넉넉하게 잡음
+    """
+    prompt = sum(len(message["content"]) for message in kwargs["messages"])
+    return prompt + kwargs.get("max_tokens", 0)
+
+
+class TokenBucket:
+    """
+    분당 한도를 가진 토큰 버킷 (이벤트 루프 스레드 전용)
+
+    최대 capacity만큼 쌓이며 초당 rate_per_minute / 60 씩 다시 채워집니다.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """
+        amount만큼 꺼내려면 기다려야 하는 시간(초)
+        """
+        self._refill()
+        # 용량보다 큰 요청은 가득 찼을 때 바로 허용 (영원히 기다리지 않도록)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class RequestScheduler:
+    """
+    프로세스 전체 OpenAI 요청 스케줄러
+
+    분당 요청 수와 분당 토큰 수를 토큰 버킷으로 제한하고, 429 등 일시적인 오류는
+    지터를 넣은 지수 백오프로 재시도합니다. 모든 메서드는 엔진의 이벤트 루프에서 호출됩니다.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float,
+                 max_retries: int = 4, backoff_base: float = 0.5, backoff_max: float = 20.0):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock: Optional[asyncio.Lock] = None
+        self._stats = {"requests": 0, "retries": 0, "gave_up": 0, "throttled_seconds": 0.0}
+
+    async def run(self, request: Callable[[], Awaitable[Any]], estimated_tokens: int, call=None) -> Any:
+        """
+        한도 안에서 request()를 실행하고, 재시도할 수 있는 오류면 백오프 후 다시 실행
+        call(LLMCall)이 주어지면 대기 시간과 재시도 횟수를 함께 기록
+        """
+        for attempt in range(self.max_retries + 1):
+            waited = await self._acquire(estimated_tokens)
+            if call is not None:
+                call.throttled += waited
+            try:
+                return await request()
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    self._stats["gave_up"] += 1
+                    raise
+                delay = self._backoff(attempt, e)
+                self._stats["retries"] += 1
+                self._stats["throttled_seconds"] += delay
+                if call is not None:
+                    call.retries += 1
+                    call.throttled += delay
+                await asyncio.sleep(delay)
+
+    def stats(self) -> Dict:
+        return dict(self._stats, throttled_seconds=round(self._stats["throttled_seconds"], 3))
+
+    async def _acquire(self, estimated_tokens: int) -> float:
+        # 대기 순서를 지키도록 한 번에 하나씩 버킷을 확인
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        waited = 0.0
+        async with self._lock:
+            while True:
+                delay = max(self.request_bucket.delay_for(1), self.token_bucket.delay_for(estimated_tokens))
+                if delay <= 0:
+                    break
+                waited += delay
+                await asyncio.sleep(delay)
+            self.request_bucket.consume(1)
+            self.token_bucket.consume(estimated_tokens)
+        self._stats["requests"] += 1
+        self._stats["throttled_seconds"] += waited
+        return waited
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """
+        지터를 넣은 지수 백오프. 서버가 retry-after를 주면 그보다 짧게 기다리지 않음
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            delay = max(delay, float(retry_after))
+        except (TypeError, ValueError):
+            pass
+        return min(delay, self.backoff_max)
+
+
+class CoalescedBatch:
+    """
+    같은 키(예: 난이도)로 함께 처리될 대기자 묶음
+    """
+
+    def __init__(self, key: Hashable):
+        self.key = key
+        self.waiters: List[Any] = []
+        self.total = 0
+        self.created_at = time.perf_counter()
+
+
+class RequestCoalescer:
+    """
+    같은 키의 동시 요청을 하나의 생성으로 합치는 single-flight 묶음 관리
+
+    묶음은 실제 요청이 시작되어 close()될 때까지 열려 있으며, 그 사이 들어온
+    같은 키의 대기자는 새 요청을 만들지 않고 기존 묶음에 합류합니다.
+    """
+
+    def __init__(self, max_total: int):
+        self.max_total = max_total
+        self._lock = threading.Lock()
+        self._open: Dict[Hashable, CoalescedBatch] = {}
+        self._stats = {"batches": 0, "joined": 0}
+
+    def join(self, key: Hashable, waiter: Any, count: int,
+             start: Callable[[CoalescedBatch], None]) -> CoalescedBatch:
+        """
+        열린 묶음에 대기자를 추가. 새 묶음을 만들었으면 start(batch)로 요청 시작
+        """
+        with self._lock:
+            batch = self._open.get(key)
+            if batch is None or batch.total + count > self.max_total:
+                batch = CoalescedBatch(key)
+                self._open[key] = batch
+                self._stats["batches"] += 1
+                created = True
+            else:
+                self._stats["joined"] += 1
+                created = False
+            batch.waiters.append(waiter)
+            batch.total += count
+        if created:
+            start(batch)
+        return batch
+
+    def close(self, batch: CoalescedBatch) -> List[Any]:
+        """
+        요청 직전에 묶음을 닫고 대기자 목록 반환 (이후 요청은 새 묶음으로)
+        """
+        with self._lock:
+            if self._open.get(batch.key) is batch:
+                del self._open[batch.key]
+            return list(batch.waiters)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,27 @@
+"""
+워밍업과 함께 앱 실행
+
+서비스 워밍업을 먼저 시작한 뒤 같은 프로세스에서 Streamlit을 실행하므로, 첫 방문자가 오기 전에
+Firebase/Firestore/OpenAI 연결과 문제 풀이 준비됩니다. 준비 상태는 WARMUP_READY_FILE과
+WARMUP_HEALTH_PORT의 /ready로 확인할 수 있습니다. 인자는 streamlit run에 그대로 전달됩니다.
+
+    WARMUP_HEALTH_PORT=8502 python run_app.py --server.port 8501
+"""
+import os
+import sys
+
+from streamlit.web import cli
+
+from warmup import get_warmup
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    get_warmup().start()
+    sys.argv = ["streamlit", "run", os.path.join(ROOT, "app.py"), *sys.argv[1:]]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
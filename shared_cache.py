@@ -0,0 +1,178 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class SharedCache:
+    """
+    같은 서버의 여러 앱 프로세스가 함께 쓰는 SQLite(WAL) 캐시
+
+    사전 생성 문제 풀, 풀 리필 임대(한 번에 한 프로세스만 생성), 리더보드 스냅샷을 보관합니다.
+    꺼내기/추가는 BEGIN IMMEDIATE 트랜잭션으로 파일 쓰기 잠금을 먼저 잡으므로
+    두 프로세스가 같은 문제를 동시에 가져가는 일이 없습니다.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS pool_questions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        difficulty TEXT NOT NULL,
+        data TEXT NOT NULL,
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_pool_questions_difficulty
+        ON pool_questions (difficulty, id);
+    CREATE TABLE IF NOT EXISTS leases (
+        name TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS snapshots (
+        key TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        data TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS counters (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    );
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        # 임대 소유자 구분 (프로세스 + 인스턴스)
+        self.owner = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        # 트랜잭션은 직접 시작 (isolation_level=None)
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # 문제 풀
+
+    def claim_questions(self, difficulty: str, count: int) -> List[Dict]:
+        """
+        먼저 들어온 문제부터 count개를 꺼내 삭제. 부족하면 빈 리스트
+        """
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, data FROM pool_questions WHERE difficulty = ? ORDER BY id LIMIT ?",
+                (difficulty, count)
+            ).fetchall()
+            if len(rows) < count:
+                return []
+            conn.executemany("DELETE FROM pool_questions WHERE id = ?", [(row[0],) for row in rows])
+        return [json.loads(row[1]) for row in rows]
+
+    def put_questions(self, difficulty: str, questions: List[Dict], limit: int) -> int:
+        """
+        풀이 limit개가 될 때까지만 추가하고 추가한 개수를 반환
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            depth = conn.execute(
+                "SELECT COUNT(*) FROM pool_questions WHERE difficulty = ?", (difficulty,)
+            ).fetchone()[0]
+            rows = [
+                (difficulty, json.dumps(question, ensure_ascii=False), now)
+                for question in questions[:max(limit - depth, 0)]
+            ]
+            conn.executemany(
+                "INSERT INTO pool_questions (difficulty, data, created_at) VALUES (?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def pool_depth(self, difficulty: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM pool_questions WHERE difficulty = ?", (difficulty,)
+            ).fetchone()[0]
+
+    # 임대
+
+    def try_lease(self, name: str, ttl: float) -> bool:
+        """
+        임대가 비었거나 만료되었거나 이미 내 것이면 ttl초 동안 차지하고 True
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+            if row is not None and row[0] != self.owner and row[1] > now:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                (name, self.owner, now + ttl)
+            )
+        return True
+
+    def release_lease(self, name: str):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, self.owner))
+
+    # 스냅샷
+
+    def get_snapshot(self, key: str) -> Optional[Tuple[int, Any, float]]:
+        """
+        유효한 스냅샷의 (버전, 값, 남은 시간). 없거나 만료되었으면 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, data, expires_at FROM snapshots WHERE key = ?", (key,)
+            ).fetchone()
+        remaining = row[2] - time.time() if row else 0
+        if remaining <= 0:
+            return None
+        return row[0], json.loads(row[1]), remaining
+
+    def put_snapshot(self, key: str, value: Any, ttl: float) -> int:
+        """
+        스냅샷 저장 후 버전 반환. 내용이 이전과 같으면 버전을 유지하고 만료 시각만 연장
+        버전은 모든 키와 프로세스에서 유일
+        """
+        data = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+        with self._transaction() as conn:
+            row = conn.execute("SELECT version, data FROM snapshots WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[1] == data:
+                version = row[0]
+            else:
+                conn.execute(
+                    "INSERT INTO counters (name, value) VALUES ('snapshot_version', 1) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + 1"
+                )
+                version = conn.execute(
+                    "SELECT value FROM counters WHERE name = 'snapshot_version'"
+                ).fetchone()[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots (key, version, data, expires_at) VALUES (?, ?, ?, ?)",
+                (key, version, data, time.time() + ttl)
+            )
+        return version
+
+    def expire_snapshots(self, prefix: str):
+        """
+        prefix로 시작하는 스냅샷을 만료 처리 (다음 조회 때 다시 읽음)
+        """
+        with self._transaction() as conn:
+            # LIKE는 "_"와 "%"를 와일드카드로 해석하므로 앞부분을 그대로 비교
+            conn.execute("UPDATE snapshots SET expires_at = 0 WHERE substr(key, 1, length(?)) = ?", (prefix, prefix))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
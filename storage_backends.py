@@ -0,0 +1,483 @@
+import copy
+import heapq
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from leaderboard_windows import aggregate_window_results
+
+# 기록 페이지에서 사용하는 필드만 조회
+HISTORY_FIELDS = ('score', 'total_questions', 'difficulty', 'timestamp')
+
+
+def aggregate_results(results: List[Dict]) -> Dict[str, Dict]:
+    """
+    결과 목록을 사용자별 증가분으로 합침 (모든 백엔드가 같은 방식으로 통계를 갱신)
+    """
+    user_totals = {}
+    for result in results:
+        totals = user_totals.setdefault(result['user_id'], {
+            'score': 0, 'count': 0, 'username': None, 'difficulty': {}, 'recent_scores': None
+        })
+        totals['score'] += result['score']
+        totals['count'] += 1
+        totals['username'] = result.get('username') or totals['username']
+        difficulty_totals = totals['difficulty'].setdefault(result['difficulty'], {'count': 0, 'total': 0})
+        difficulty_totals['count'] += 1
+        difficulty_totals['total'] += result['score']
+        # 최근 점수 링 버퍼는 세션의 UserStats가 관리하므로 가장 마지막 값으로 덮어씀
+        if result.get('recent_scores') is not None:
+            totals['recent_scores'] = result['recent_scores']
+    return user_totals
+
+
+def merge_user_stats(current: Optional[Dict], user_id: str, totals: Dict) -> Dict:
+    """
+    기존 사용자 통계 문서에 증가분을 반영한 새 문서 (Firestore 외 백엔드용)
+    """
+    stats = dict(current or {})
+    stats['user_id'] = user_id
+    stats['total_score'] = stats.get('total_score', 0) + totals['score']
+    stats['quiz_count'] = stats.get('quiz_count', 0) + totals['count']
+    difficulty_stats = {d: dict(values) for d, values in (stats.get('difficulty_stats') or {}).items()}
+    for difficulty, values in totals['difficulty'].items():
+        merged = difficulty_stats.setdefault(difficulty, {'count': 0, 'total': 0})
+        merged['count'] += values['count']
+        merged['total'] += values['total']
+    stats['difficulty_stats'] = difficulty_stats
+    if totals['username']:
+        stats['username'] = totals['username']
+    if totals['recent_scores'] is not None:
+        stats['recent_scores'] = list(totals['recent_scores'])
+    stats['updated_at'] = datetime.now(timezone.utc)
+    return stats
+
+
+def _leaderboard_entry(data: Dict) -> Dict:
+    data.setdefault('username', 'User')
+    data.setdefault('quiz_count', 0)
+    return data
+
+
+def _project(record: Dict, fields: Optional[Sequence[str]]) -> Dict:
+    if not fields:
+        return record
+    return {field: record[field] for field in fields if field in record}
+
+
+class StorageBackend(ABC):
+    """
+    퀴즈 결과 저장소 인터페이스
+
+    결과 저장, 리더보드, 사용자 통계, 기록 페이지 조회를 제공합니다.
+    write_results는 결과 묶음을 원자적으로 반영해야 하고, 이미 저장된 결과 ID는 건너뛰어야 합니다
+    (쓰기 지연 큐의 재시도와 디스크 재적재가 통계를 중복 반영하지 않도록).
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def write_results(self, results: List[Dict]) -> None:
+        """
+        결과 묶음 저장 + 사용자별 통계 갱신
+        """
+
+    @abstractmethod
+    def get_user_stats(self, user_id: str) -> Optional[Dict]:
+        """
+        사용자 누적 통계 문서 (없으면 None)
+        """
+
+    @abstractmethod
+    def get_leaderboard(self, limit: int) -> List[Dict]:
+        """
+        총점 내림차순 상위 limit명
+        """
+
+    @abstractmethod
+    def get_window_leaderboard(self, period: str, limit: int) -> List[Dict]:
+        """
+        기간 버킷(예: "weekly:2026-W42")의 점수 내림차순 상위 limit명
+        """
+
+    @abstractmethod
+    def get_history(self, user_id: str, limit: Optional[int], start_after: Any = None,
+                    fields: Optional[Sequence[str]] = HISTORY_FIELDS) -> Tuple[List[Dict], Any]:
+        """
+        최신순 기록 한 페이지와 다음 페이지 커서 (마지막 페이지면 None)
+        """
+
+    @abstractmethod
+    def iter_user_totals(self) -> Iterator[Tuple[str, int]]:
+        """
+        모든 사용자의 (user_id, total_score) (순위 색인 재구성용)
+        """
+
+    def ping(self) -> None:
+        """
+        연결을 열어 두기 위한 가벼운 읽기 (원격 저장소만 구현)
+        """
+
+
+class FirestoreBackend(StorageBackend):
+    name = "firestore"
+
+    # 트랜잭션 하나에 담는 결과 수 (결과 하나당 문서 최대 5개: 기록, 사용자 통계, 기간 버킷 3개)
+    MAX_RESULTS_PER_COMMIT = 100
+
+    def __init__(self, db=None, firestore=None):
+        if firestore is None:
+            from firebase_admin import firestore
+
+        self._firestore = firestore
+        self.db = db or firestore.client()
+
+    def write_results(self, results):
+        # 결과 ID를 문서 ID로 쓰고, 트랜잭션 안에서 이미 저장된 결과를 걸러내므로
+        # 타임아웃 뒤 실제로는 커밋된 묶음을 재시도하거나 디스크에서 다시 읽어도 통계가 중복되지 않음
+        for start in range(0, len(results), self.MAX_RESULTS_PER_COMMIT):
+            chunk = results[start:start + self.MAX_RESULTS_PER_COMMIT]
+            self._firestore.transactional(self._write_chunk)(self.db.transaction(), chunk)
+
+    def _write_chunk(self, transaction, results):
+        firestore = self._firestore
+        scores = self.db.collection('scores')
+        refs = {}
+        for result in results:
+            refs.setdefault(result['id'], scores.document(result['id']))
+        existing = {snapshot.id for snapshot in transaction.get_all(list(refs.values())) if snapshot.exists}
+
+        # 이미 저장된 결과(재시도)는 통계에 다시 더하지 않음 (같은 묶음 안의 중복 ID도 한 번만)
+        new_results = []
+        for result in results:
+            if result['id'] in existing:
+                continue
+            existing.add(result['id'])
+            new_results.append(result)
+            transaction.set(refs[result['id']], {
+                'user_id': result['user_id'],
+                'score': result['score'],
+                'total_questions': result['total_questions'],
+                'difficulty': result['difficulty'],
+                'timestamp': datetime.fromtimestamp(result['timestamp'], tz=timezone.utc)
+            })
+
+        # 사용자별 누적 통계 (원자적 증가로 갱신, 리더보드는 이 문서만 읽음)
+        for user_id, totals in aggregate_results(new_results).items():
+            stats = {
+                'user_id': user_id,
+                'total_score': firestore.Increment(totals['score']),
+                'quiz_count': firestore.Increment(totals['count']),
+                'difficulty_stats': {
+                    difficulty: {
+                        'count': firestore.Increment(values['count']),
+                        'total': firestore.Increment(values['total'])
+                    }
+                    for difficulty, values in totals['difficulty'].items()
+                },
+                'updated_at': firestore.SERVER_TIMESTAMP
+            }
+            if totals['username']:
+                stats['username'] = totals['username']
+            if totals['recent_scores'] is not None:
+                stats['recent_scores'] = totals['recent_scores']
+            transaction.set(self.db.collection('user_stats').document(user_id), stats, merge=True)
+
+        # 일/주/월 리더보드 버킷 (expires_at에 TTL 정책을 걸어 두면 지난 버킷은 Firestore가 삭제)
+        for (period, user_id), totals in aggregate_window_results(new_results).items():
+            bucket = {
+                'period': period,
+                'user_id': user_id,
+                'total_score': firestore.Increment(totals['score']),
+                'quiz_count': firestore.Increment(totals['count']),
+                'expires_at': datetime.fromtimestamp(totals['expires_at'], tz=timezone.utc)
+            }
+            if totals['username']:
+                bucket['username'] = totals['username']
+            transaction.set(self.db.collection('leaderboard_buckets').document(f"{period}_{user_id}"),
+                            bucket, merge=True)
+
+    def get_user_stats(self, user_id):
+        doc = self.db.collection('user_stats').document(user_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    def iter_user_totals(self):
+        # 총점 필드만 스트리밍으로 읽음
+        for doc in self.db.collection('user_stats').select(['total_score']).stream():
+            yield doc.id, (doc.to_dict() or {}).get('total_score', 0)
+
+    def ping(self):
+        # 없는 문서 한 건 조회로 gRPC 채널을 열고 유지
+        self.db.collection('user_stats').document('__warmup__').get()
+
+    def get_leaderboard(self, limit):
+        users = (self.db.collection('user_stats')
+                 .order_by('total_score', direction=self._firestore.Query.DESCENDING)
+                 .limit(limit)
+                 .stream())
+        return [_leaderboard_entry(user.to_dict()) for user in users]
+
+    def get_window_leaderboard(self, period, limit):
+        # 복합 색인 (period ASC, total_score DESC) 필요
+        buckets = (self.db.collection('leaderboard_buckets')
+                   .where('period', '==', period)
+                   .order_by('total_score', direction=self._firestore.Query.DESCENDING)
+                   .limit(limit)
+                   .stream())
+        return [_leaderboard_entry(bucket.to_dict()) for bucket in buckets]
+
+    def get_history(self, user_id, limit, start_after=None, fields=HISTORY_FIELDS):
+        query = (self.db.collection('scores')
+                 .where('user_id', '==', user_id)
+                 .order_by('timestamp', direction=self._firestore.Query.DESCENDING))
+        if fields:
+            query = query.select(list(fields))
+        if start_after is not None:
+            query = query.start_after(start_after)
+        if limit:
+            query = query.limit(limit)
+
+        docs = list(query.stream())
+        cursor = docs[-1] if limit and len(docs) == limit else None
+        return [doc.to_dict() for doc in docs], cursor
+
+
+class InMemoryBackend(StorageBackend):
+    """
+    프로세스 메모리 저장소 (로컬 실행, 벤치마크용)
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scores: Dict[str, Dict] = {}
+        self._history: Dict[str, List[Dict]] = {}
+        self._user_stats: Dict[str, Dict] = {}
+        # 기간 버킷 키 -> (만료 시각, user_id -> 기간 통계)
+        self._buckets: Dict[str, Tuple[float, Dict[str, Dict]]] = {}
+
+    def write_results(self, results):
+        with self._lock:
+            # 이미 저장된 결과(재시도)는 통계에 다시 더하지 않음
+            new_results = []
+            for result in results:
+                if result['id'] in self._scores:
+                    continue
+                new_results.append(result)
+                record = {
+                    'id': result['id'],
+                    'user_id': result['user_id'],
+                    'score': result['score'],
+                    'total_questions': result['total_questions'],
+                    'difficulty': result['difficulty'],
+                    'timestamp': datetime.fromtimestamp(result['timestamp'], tz=timezone.utc)
+                }
+                self._scores[record['id']] = record
+                self._history.setdefault(record['user_id'], []).append(record)
+
+            for user_id, totals in aggregate_results(new_results).items():
+                self._user_stats[user_id] = merge_user_stats(self._user_stats.get(user_id), user_id, totals)
+
+            for (period, user_id), totals in aggregate_window_results(new_results).items():
+                _, users = self._buckets.setdefault(period, (totals['expires_at'], {}))
+                entry = users.setdefault(user_id, {'user_id': user_id, 'total_score': 0, 'quiz_count': 0})
+                entry['total_score'] += totals['score']
+                entry['quiz_count'] += totals['count']
+                if totals['username']:
+                    entry['username'] = totals['username']
+
+            # 만료된 기간은 통째로 삭제
+            now = time.time()
+            for period in [p for p, (expires_at, _) in self._buckets.items() if expires_at <= now]:
+                del self._buckets[period]
+
+    def get_user_stats(self, user_id):
+        with self._lock:
+            stats = self._user_stats.get(user_id)
+            return copy.deepcopy(stats) if stats else None
+
+    def get_leaderboard(self, limit):
+        with self._lock:
+            users = sorted(self._user_stats.values(), key=lambda s: s['total_score'], reverse=True)[:limit]
+            return [_leaderboard_entry(dict(user)) for user in users]
+
+    def get_window_leaderboard(self, period, limit):
+        with self._lock:
+            _, users = self._buckets.get(period, (0, {}))
+            top = heapq.nlargest(limit, users.values(), key=lambda s: s['total_score'])
+            return [_leaderboard_entry(dict(user)) for user in top]
+
+    def iter_user_totals(self):
+        with self._lock:
+            totals = [(user_id, stats.get('total_score', 0)) for user_id, stats in self._user_stats.items()]
+        return iter(totals)
+
+    def get_history(self, user_id, limit, start_after=None, fields=HISTORY_FIELDS):
+        with self._lock:
+            records = sorted(self._history.get(user_id, []),
+                             key=lambda r: (r['timestamp'], r['id']), reverse=True)
+        # 커서는 마지막으로 반환한 기록의 (timestamp, id)
+        if start_after is not None:
+            records = [r for r in records if (r['timestamp'], r['id']) < start_after]
+        page = records[:limit] if limit else records
+        cursor = None
+        if limit and len(page) == limit:
+            cursor = (page[-1]['timestamp'], page[-1]['id'])
+        return [_project(dict(r), fields) for r in page], cursor
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    SQLite(WAL) 저장소 (단일 서버 소규모 배포, 로컬 벤치마크용)
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS scores (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        total_questions INTEGER,
+        difficulty TEXT,
+        timestamp REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_scores_user_time ON scores (user_id, timestamp DESC, id DESC);
+    CREATE TABLE IF NOT EXISTS user_stats (
+        user_id TEXT PRIMARY KEY,
+        total_score INTEGER NOT NULL,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_user_stats_total ON user_stats (total_score DESC);
+    CREATE TABLE IF NOT EXISTS leaderboard_buckets (
+        period TEXT NOT NULL,
+        user_id TEXT NOT NULL,
+        username TEXT,
+        total_score INTEGER NOT NULL,
+        quiz_count INTEGER NOT NULL,
+        expires_at REAL NOT NULL,
+        PRIMARY KEY (period, user_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_buckets_period_score ON leaderboard_buckets (period, total_score DESC);
+    CREATE INDEX IF NOT EXISTS idx_buckets_expires ON leaderboard_buckets (expires_at);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def write_results(self, results):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 이미 저장된 결과(재시도)는 통계에 다시 더하지 않음
+                new_results = []
+                for r in results:
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO scores (id, user_id, score, total_questions, difficulty, timestamp) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (r['id'], r['user_id'], r['score'], r['total_questions'], r['difficulty'], r['timestamp'])
+                    )
+                    if cursor.rowcount:
+                        new_results.append(r)
+                for user_id, totals in aggregate_results(new_results).items():
+                    row = self._conn.execute("SELECT data FROM user_stats WHERE user_id = ?", (user_id,)).fetchone()
+                    stats = merge_user_stats(json.loads(row[0]) if row else None, user_id, totals)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO user_stats (user_id, total_score, data) VALUES (?, ?, ?)",
+                        (user_id, stats['total_score'], json.dumps(stats, ensure_ascii=False, default=str))
+                    )
+                for (period, user_id), totals in aggregate_window_results(new_results).items():
+                    self._conn.execute(
+                        "INSERT INTO leaderboard_buckets (period, user_id, username, total_score, quiz_count, expires_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT (period, user_id) DO UPDATE SET "
+                        "total_score = total_score + excluded.total_score, "
+                        "quiz_count = quiz_count + excluded.quiz_count, "
+                        "username = COALESCE(excluded.username, username)",
+                        (period, user_id, totals['username'], totals['score'], totals['count'], totals['expires_at'])
+                    )
+                # 만료된 버킷 정리 (expires_at 색인으로 지난 행만 찾음)
+                self._conn.execute("DELETE FROM leaderboard_buckets WHERE expires_at <= ?", (time.time(),))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_user_stats(self, user_id):
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM user_stats WHERE user_id = ?", (user_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_leaderboard(self, limit):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM user_stats ORDER BY total_score DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [_leaderboard_entry(json.loads(row[0])) for row in rows]
+
+    def get_window_leaderboard(self, period, limit):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT user_id, username, total_score, quiz_count FROM leaderboard_buckets "
+                "WHERE period = ? ORDER BY total_score DESC LIMIT ?", (period, limit)
+            ).fetchall()
+        return [
+            _leaderboard_entry({'user_id': row[0], 'username': row[1] or 'User', 'total_score': row[2], 'quiz_count': row[3]})
+            for row in rows
+        ]
+
+    def iter_user_totals(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT user_id, total_score FROM user_stats").fetchall()
+        return iter(rows)
+
+    def get_history(self, user_id, limit, start_after=None, fields=HISTORY_FIELDS):
+        query = "SELECT id, user_id, score, total_questions, difficulty, timestamp FROM scores WHERE user_id = ?"
+        params: List[Any] = [user_id]
+        if start_after is not None:
+            query += " AND (timestamp, id) < (?, ?)"
+            params.extend(start_after)
+        query += " ORDER BY timestamp DESC, id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        records = [
+            {
+                'id': row[0],
+                'user_id': row[1],
+                'score': row[2],
+                'total_questions': row[3],
+                'difficulty': row[4],
+                'timestamp': datetime.fromtimestamp(row[5], tz=timezone.utc)
+            }
+            for row in rows
+        ]
+        cursor = (rows[-1][5], rows[-1][0]) if limit and len(rows) == limit else None
+        return [_project(r, fields) for r in records], cursor
+
+
+def create_backend(name: str, sqlite_path: str = "quiz_data.db") -> StorageBackend:
+    """
+    설정 이름으로 저장소 백엔드 생성
+    """
+    if name == "firestore":
+        return FirestoreBackend()
+    if name == "sqlite":
+        return SQLiteBackend(sqlite_path)
+    if name == "memory":
+        return InMemoryBackend()
+    raise ValueError(f"알 수 없는 저장소 백엔드: {name}")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 루트의 모듈을 그대로 import (패키지가 아닌 평면 구조)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,49 @@
+"""
+유사 문제 색인 테스트
+
+표현만 조금 다른 문제는 중복으로, 내용이 다른 문제는 새 문제로 판단하는지 확인합니다.
+"""
+from dedup_index import NearDuplicateIndex
+
+ORIGINAL = {
+    "question": "대한민국의 수도는 어디인가요?",
+    "options": ["서울", "부산", "대구", "인천"],
+    "correct_answer": 0
+}
+# 조사/문장부호만 다르고 선택지 순서가 바뀐 문제
+NEAR_DUPLICATE = {
+    "question": "대한민국 수도는 어디인가요",
+    "options": ["부산", "서울", "인천", "대구"],
+    "correct_answer": 1
+}
+DISTINCT = {
+    "question": "물의 화학식은 무엇인가요?",
+    "options": ["H2O", "CO2", "O2", "NaCl"],
+    "correct_answer": 0
+}
+
+
+def test_near_duplicate_is_detected():
+    index = NearDuplicateIndex()
+    assert index.add(ORIGINAL, "original")
+    assert index.find_duplicate(NEAR_DUPLICATE) == "original"
+    assert not index.add(NEAR_DUPLICATE)
+    assert len(index) == 1
+
+
+def test_distinct_question_is_added():
+    index = NearDuplicateIndex()
+    index.load([("original", ORIGINAL)])
+    assert index.find_duplicate(DISTINCT) is None
+    assert index.add(DISTINCT)
+    assert len(index) == 2
+
+
+def test_filter_new_removes_duplicates_within_batch():
+    index = NearDuplicateIndex()
+    assert index.filter_new([ORIGINAL, DISTINCT, NEAR_DUPLICATE, dict(ORIGINAL)]) == [ORIGINAL, DISTINCT]
+
+
+def test_signatures_are_deterministic_for_the_same_seed():
+    first, second = NearDuplicateIndex(seed=7), NearDuplicateIndex(seed=7)
+    assert (first.signature(ORIGINAL) == second.signature(ORIGINAL)).all()
@@ -0,0 +1,63 @@
+"""
+증분 JSON 파서 테스트
+
+응답 조각의 경계가 문자열/이스케이프 한가운데에 오는 경우, 최상위 배열, 깨진 객체를 확인합니다.
+"""
+import json
+
+from question_stream import QuestionStreamParser
+
+QUESTIONS = [
+    {"question": "중괄호 } 와 대괄호 ] 가 든 \"문제\"?", "options": ["{", "]", "\\", "\"\""], "correct_answer": 0},
+    {"question": "줄바꿈\n과 유니코드 é", "options": ["A", "B", "C", "D"], "correct_answer": 3,
+     "meta": {"tags": ["x", {"y": 1}]}},
+]
+
+
+def feed_in_chunks(text, size):
+    parser = QuestionStreamParser()
+    completed = []
+    for i in range(0, len(text), size):
+        completed.extend(parser.feed(text[i:i + size]))
+    return completed
+
+
+def test_every_chunk_boundary_inside_strings_and_escapes():
+    text = json.dumps({"questions": QUESTIONS}, ensure_ascii=False)
+    # 1글자 조각이면 모든 문자열/이스케이프 내부가 조각 경계가 됨
+    for size in (1, 2, 3, 7, len(text)):
+        assert feed_in_chunks(text, size) == QUESTIONS
+
+
+def test_unicode_escapes_split_across_chunks():
+    text = json.dumps({"questions": QUESTIONS})
+    assert "\\u" in text
+    assert feed_in_chunks(text, 1) == QUESTIONS
+
+
+def test_questions_are_returned_as_soon_as_they_close():
+    text = json.dumps({"questions": QUESTIONS}, ensure_ascii=False)
+    first = json.dumps(QUESTIONS[0], ensure_ascii=False)
+    end_of_first = text.index(first) + len(first)
+    parser = QuestionStreamParser()
+    assert parser.feed(text[:end_of_first - 1]) == []
+    assert parser.feed(text[end_of_first - 1:end_of_first]) == [QUESTIONS[0]]
+    assert parser.feed(text[end_of_first:]) == [QUESTIONS[1]]
+
+
+def test_top_level_array():
+    text = json.dumps(QUESTIONS, ensure_ascii=False)
+    assert feed_in_chunks(text, 1) == QUESTIONS
+    assert feed_in_chunks(text, len(text)) == QUESTIONS
+
+
+def test_malformed_object_is_skipped():
+    good = json.dumps(QUESTIONS[0], ensure_ascii=False)
+    text = '{"questions": [{"question": "깨진", "options": [1, 2,]}, ' + good + "]}"
+    assert feed_in_chunks(text, 1) == [QUESTIONS[0]]
+
+
+def test_truncated_response_returns_only_closed_objects():
+    text = json.dumps({"questions": QUESTIONS}, ensure_ascii=False)
+    cut = text.index('"meta"')
+    assert feed_in_chunks(text[:cut], 5) == [QUESTIONS[0]]
@@ -0,0 +1,74 @@
+"""
+순위 색인 테스트
+
+무작위 갱신과 재구성 뒤의 순위/상위 비율이 전체 사용자를 직접 세어 구한 값과 같은지 확인합니다.
+"""
+import math
+import random
+
+from rank_index import FenwickTree, RankIndex
+
+
+def brute_force_rank(scores, user_id, bucket_size):
+    bucket = max(scores[user_id], 0) // bucket_size
+    rank = 1 + sum(1 for score in scores.values() if max(score, 0) // bucket_size > bucket)
+    total = len(scores)
+    return {
+        "rank": rank,
+        "total": total,
+        "top_percent": math.ceil(rank / total * 1000) / 10,
+        "score": scores[user_id]
+    }
+
+
+def assert_matches(index, scores, bucket_size):
+    for user_id in scores:
+        assert index.rank(user_id) == brute_force_rank(scores, user_id, bucket_size)
+
+
+def test_fenwick_prefix_sums_match_counts():
+    rng = random.Random(7)
+    counts = [rng.randint(0, 5) for _ in range(50)]
+    tree = FenwickTree.from_counts(counts)
+    for _ in range(200):
+        index, delta = rng.randrange(50), rng.randint(-2, 3)
+        counts[index] += delta
+        tree.add(index, delta)
+    for i in range(50):
+        assert tree.prefix_sum(i) == sum(counts[:i + 1])
+
+
+def test_rank_matches_brute_force_after_random_adds_and_rebuild():
+    rng = random.Random(42)
+    bucket_size = 10
+    scores = {f"user{i}": rng.randrange(0, 500, 10) for i in range(100)}
+    # 초기 버킷보다 큰 점수도 섞어 색인이 늘어나는 경우까지 확인
+    index = RankIndex(bucket_size=bucket_size, initial_buckets=8)
+    index.rebuild(scores.items())
+    assert_matches(index, scores, bucket_size)
+
+    for _ in range(500):
+        user_id = f"user{rng.randrange(130)}"
+        delta = rng.randrange(0, 50, 10)
+        index.add(user_id, delta)
+        scores[user_id] = scores.get(user_id, 0) + delta
+    assert len(index) == len(scores)
+    assert_matches(index, scores, bucket_size)
+
+    index.rebuild(scores.items())
+    assert_matches(index, scores, bucket_size)
+
+
+def test_scores_in_the_same_bucket_share_a_rank():
+    index = RankIndex(bucket_size=10)
+    index.rebuild([("a", 25), ("b", 21), ("c", 30)])
+    assert index.rank("c")["rank"] == 1
+    assert index.rank("a")["rank"] == index.rank("b")["rank"] == 2
+
+
+def test_rank_is_none_before_rebuild_or_for_unknown_user():
+    index = RankIndex()
+    index.add("a", 10)
+    assert index.rank("a") is None
+    index.rebuild([("a", 10)])
+    assert index.rank("missing") is None
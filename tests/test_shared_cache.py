@@ -0,0 +1,59 @@
+"""
+SharedCache 문제 풀 테스트
+
+같은 WAL 파일을 여는 두 인스턴스(두 프로세스와 같은 상황)가 같은 문제를 두 번 꺼내지 않는지 확인합니다.
+"""
+import threading
+
+from shared_cache import SharedCache
+
+
+def make_questions(start, count):
+    return [{"question": f"문제 {i}", "options": ["A", "B", "C", "D"], "correct_answer": 0}
+            for i in range(start, start + count)]
+
+
+def test_two_instances_never_claim_the_same_question(tmp_path):
+    path = str(tmp_path / "shared_cache.db")
+    caches = [SharedCache(path), SharedCache(path)]
+    try:
+        assert caches[0].put_questions("보통", make_questions(0, 200), limit=200) == 200
+        claimed = [[], []]
+        barrier = threading.Barrier(2)
+
+        def claim(index):
+            barrier.wait()
+            while True:
+                questions = caches[index].claim_questions("보통", 5)
+                if not questions:
+                    return
+                claimed[index].extend(question["question"] for question in questions)
+
+        threads = [threading.Thread(target=claim, args=(i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        all_claimed = claimed[0] + claimed[1]
+        assert len(all_claimed) == 200
+        assert len(set(all_claimed)) == 200
+        assert caches[1].pool_depth("보통") == 0
+    finally:
+        for cache in caches:
+            cache.close()
+
+
+def test_put_questions_stops_at_limit_across_instances(tmp_path):
+    path = str(tmp_path / "shared_cache.db")
+    first, second = SharedCache(path), SharedCache(path)
+    try:
+        assert first.put_questions("쉬움", make_questions(0, 8), limit=10) == 8
+        assert second.put_questions("쉬움", make_questions(8, 8), limit=10) == 2
+        assert first.pool_depth("쉬움") == 10
+        # 부족하면 하나도 꺼내지 않음
+        assert second.claim_questions("쉬움", 11) == []
+        assert [q["question"] for q in second.claim_questions("쉬움", 3)] == ["문제 0", "문제 1", "문제 2"]
+    finally:
+        first.close()
+        second.close()
@@ -0,0 +1,308 @@
+"""
+저장소 백엔드 계약 테스트
+
+같은 테스트를 메모리/SQLite/Firestore(가짜 클라이언트) 백엔드에 모두 실행합니다.
+"""
+import copy
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from leaderboard_windows import WINDOWS, period_expires_at, period_key
+from storage_backends import HISTORY_FIELDS, FirestoreBackend, InMemoryBackend, SQLiteBackend
+
+
+class FakeIncrement:
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeFirestoreModule:
+    """
+    FirestoreBackend가 사용하는 firebase_admin.firestore 기능만 흉내 낸 모듈
+    """
+
+    Increment = FakeIncrement
+    SERVER_TIMESTAMP = object()
+
+    class Query:
+        DESCENDING = "DESCENDING"
+
+    @staticmethod
+    def transactional(fn):
+        def run(transaction, *args, **kwargs):
+            result = fn(transaction, *args, **kwargs)
+            transaction.commit()
+            return result
+        return run
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data, fields=None):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+        self._fields = fields
+
+    def to_dict(self):
+        if self._data is None:
+            return None
+        data = copy.deepcopy(self._data)
+        if self._fields:
+            data = {field: data[field] for field in self._fields if field in data}
+        return data
+
+
+def _apply(current, update, merge):
+    result = copy.deepcopy(current) if (merge and current) else {}
+    for key, value in update.items():
+        if isinstance(value, FakeIncrement):
+            result[key] = result.get(key, 0) + value.value
+        elif value is FakeFirestoreModule.SERVER_TIMESTAMP:
+            result[key] = datetime.now(timezone.utc)
+        elif isinstance(value, dict):
+            result[key] = _apply(result.get(key) if isinstance(result.get(key), dict) else {}, value, True)
+        else:
+            result[key] = copy.deepcopy(value)
+    return result
+
+
+class FakeDocumentRef:
+    def __init__(self, client, collection, doc_id):
+        self.client = client
+        self.collection = collection
+        self.id = doc_id
+
+    def get(self):
+        return FakeSnapshot(self.id, self.client.docs.get((self.collection, self.id)))
+
+
+class FakeQuery:
+    def __init__(self, client, collection):
+        self.client = client
+        self.collection = collection
+        self._filters = []
+        self._order = None
+        self._fields = None
+        self._start_after = None
+        self._limit = None
+
+    def _copy(self, **changes):
+        query = copy.copy(self)
+        query._filters = list(self._filters)
+        for key, value in changes.items():
+            setattr(query, key, value)
+        return query
+
+    def where(self, field, op, value):
+        assert op == "=="
+        query = self._copy()
+        query._filters.append((field, value))
+        return query
+
+    def order_by(self, field, direction=None):
+        return self._copy(_order=(field, direction == FakeFirestoreModule.Query.DESCENDING))
+
+    def select(self, fields):
+        return self._copy(_fields=list(fields))
+
+    def start_after(self, snapshot):
+        return self._copy(_start_after=snapshot)
+
+    def limit(self, count):
+        return self._copy(_limit=count)
+
+    def stream(self):
+        docs = [
+            (doc_id, data) for (collection, doc_id), data in self.client.docs.items()
+            if collection == self.collection and all(data.get(f) == v for f, v in self._filters)
+        ]
+        if self._order:
+            field, descending = self._order
+            docs = [d for d in docs if field in d[1]]
+            # 같은 값이면 문서 ID 순 (정렬 방향을 따름)
+            docs.sort(key=lambda d: (d[1][field], d[0]), reverse=descending)
+            if self._start_after is not None:
+                cursor = (self._start_after._data[field], self._start_after.id)
+                docs = [d for d in docs if ((d[1][field], d[0]) < cursor if descending else (d[1][field], d[0]) > cursor)]
+        if self._limit:
+            docs = docs[:self._limit]
+        # 커서는 전체 문서 값으로 만들므로 스냅샷은 원본을 갖고 필드만 걸러 반환
+        return iter([FakeSnapshot(doc_id, data, self._fields) for doc_id, data in docs])
+
+
+class FakeCollection(FakeQuery):
+    def document(self, doc_id):
+        return FakeDocumentRef(self.client, self.collection, doc_id)
+
+
+class FakeTransaction:
+    def __init__(self, client):
+        self.client = client
+        self._writes = []
+
+    def get_all(self, refs):
+        return iter([ref.get() for ref in refs])
+
+    def set(self, ref, data, merge=False):
+        self._writes.append((ref, data, merge))
+
+    def commit(self):
+        for ref, data, merge in self._writes:
+            key = (ref.collection, ref.id)
+            self.client.docs[key] = _apply(self.client.docs.get(key), data, merge)
+        self._writes = []
+
+
+class FakeFirestoreClient:
+    def __init__(self):
+        self.docs = {}
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+    def sweep_ttl(self, collection, field):
+        """
+        Firestore TTL 정책처럼 만료 시각이 지난 문서를 삭제
+        """
+        now = datetime.now(timezone.utc)
+        for key in [k for k, data in self.docs.items() if k[0] == collection and data[field] <= now]:
+            del self.docs[key]
+
+
+@pytest.fixture(params=["memory", "sqlite", "firestore"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryBackend()
+    if request.param == "sqlite":
+        return SQLiteBackend(str(tmp_path / "quiz_data.db"))
+    return FirestoreBackend(db=FakeFirestoreClient(), firestore=FakeFirestoreModule)
+
+
+def make_result(user_id, score, timestamp=None, difficulty="보통", username=None):
+    return {
+        'id': uuid.uuid4().hex,
+        'user_id': user_id,
+        'username': username or user_id.upper(),
+        'score': score,
+        'total_questions': 5,
+        'difficulty': difficulty,
+        'recent_scores': None,
+        'timestamp': time.time() if timestamp is None else timestamp
+    }
+
+
+def stored_periods(backend):
+    """
+    저장소에 남아 있는 기간 버킷 키 (Firestore는 TTL 삭제를 거친 뒤)
+    """
+    if isinstance(backend, InMemoryBackend):
+        return set(backend._buckets)
+    if isinstance(backend, SQLiteBackend):
+        return {row[0] for row in backend._conn.execute("SELECT DISTINCT period FROM leaderboard_buckets")}
+    client = backend.db
+    client.sweep_ttl('leaderboard_buckets', 'expires_at')
+    return {data['period'] for (collection, _), data in client.docs.items() if collection == 'leaderboard_buckets'}
+
+
+def test_write_results_retry_is_idempotent(backend):
+    first = [make_result("alice", 30), make_result("alice", 20), make_result("bob", 10)]
+    backend.write_results(first)
+
+    # 타임아웃 후 실제로는 커밋된 묶음의 재시도 + 새 결과, 묶음 안의 중복 ID
+    extra = make_result("bob", 40)
+    backend.write_results(first + [extra, extra])
+
+    alice = backend.get_user_stats("alice")
+    bob = backend.get_user_stats("bob")
+    assert (alice['total_score'], alice['quiz_count']) == (50, 2)
+    assert (bob['total_score'], bob['quiz_count']) == (50, 2)
+    assert len(backend.get_history("alice", None)[0]) == 2
+
+    daily = {e['user_id']: e for e in backend.get_window_leaderboard(period_key("daily", time.time()), 10)}
+    assert (daily['alice']['total_score'], daily['alice']['quiz_count']) == (50, 2)
+    assert (daily['bob']['total_score'], daily['bob']['quiz_count']) == (50, 2)
+
+
+def test_leaderboard_is_ordered_by_total_score(backend):
+    scores = {"u1": [10, 40], "u2": [30], "u3": [0], "u4": [20, 20, 20]}
+    backend.write_results([make_result(user, score) for user, values in scores.items() for score in values])
+
+    top = backend.get_leaderboard(3)
+    assert [e['user_id'] for e in top] == ["u4", "u1", "u2"]
+    assert [e['total_score'] for e in top] == [60, 50, 30]
+    assert top[0]['username'] == "U4"
+    assert top[0]['quiz_count'] == 3
+
+
+def test_user_stats_totals(backend):
+    backend.write_results([
+        make_result("carol", 30, difficulty="쉬움"),
+        make_result("carol", 50, difficulty="어려움"),
+        make_result("carol", 10, difficulty="쉬움")
+    ])
+
+    stats = backend.get_user_stats("carol")
+    assert stats['total_score'] == 90
+    assert stats['quiz_count'] == 3
+    assert stats['username'] == "CAROL"
+    assert stats['difficulty_stats'] == {
+        "쉬움": {'count': 2, 'total': 40},
+        "어려움": {'count': 1, 'total': 50}
+    }
+    assert backend.get_user_stats("nobody") is None
+
+
+def test_history_pages_until_cursor_is_none(backend):
+    now = time.time()
+    results = [make_result("dave", i * 10, timestamp=now - i * 60) for i in range(7)]
+    backend.write_results(results + [make_result("erin", 10)])
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = backend.get_history("dave", 3, start_after=cursor)
+        pages.append(page)
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    records = [record for page in pages for record in page]
+    # 최신순, 빠짐없이 한 번씩
+    assert [r['score'] for r in records] == [r['score'] for r in results]
+    assert all(set(r) <= set(HISTORY_FIELDS) for r in records)
+
+
+def test_window_leaderboard_and_bucket_expiry(backend):
+    now = time.time()
+    old = now - 45 * 86400
+    backend.write_results([make_result("frank", 30, timestamp=old), make_result("grace", 50, timestamp=old)])
+    backend.write_results([
+        make_result("frank", 20, timestamp=now),
+        make_result("grace", 10, timestamp=now),
+        make_result("frank", 10, timestamp=now)
+    ])
+
+    for window in WINDOWS:
+        entries = backend.get_window_leaderboard(period_key(window, now), 10)
+        assert [(e['user_id'], e['total_score'], e['quiz_count']) for e in entries] == [
+            ("frank", 30, 2), ("grace", 10, 1)
+        ]
+        assert entries[0]['username'] == "FRANK"
+        assert period_expires_at(window, now) > now
+    assert backend.get_window_leaderboard(period_key("daily", now), 1)[0]['user_id'] == "frank"
+
+    # 기간이 끝나고 보관 기간도 지난 버킷은 남지 않음
+    periods = stored_periods(backend)
+    assert {period_key(window, now) for window in WINDOWS} <= periods
+    assert not {period_key(window, old) for window in WINDOWS} & periods
+    assert backend.get_window_leaderboard(period_key("daily", old), 10) == []
+
+
+def test_iter_user_totals(backend):
+    backend.write_results([make_result("u1", 10), make_result("u2", 20), make_result("u1", 30)])
+    assert dict(backend.iter_user_totals()) == {"u1": 40, "u2": 20}
@@ -0,0 +1,72 @@
+"""
+쓰기 지연 큐 테스트
+
+커밋에 실패해 디스크에 보관된 항목이 다음 실행에서 다시 읽혀 정확히 한 번만 커밋되는지 확인합니다.
+"""
+from write_behind import WriteBehindQueue
+
+
+class RecordingCommit:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def __call__(self, batch):
+        if self.fail:
+            raise RuntimeError("저장소 응답 없음")
+        self.batches.append([item["id"] for item in batch])
+
+    @property
+    def ids(self):
+        return [item_id for batch in self.batches for item_id in batch]
+
+
+def make_queue(commit_fn, spill_path):
+    return WriteBehindQueue(commit_fn, max_batch=2, flush_interval=60, max_retries=1,
+                            retry_backoff=0, spill_path=spill_path)
+
+
+def test_spilled_results_are_reloaded_and_committed_once(tmp_path):
+    spill_path = str(tmp_path / "pending_results.jsonl")
+
+    failing = make_queue(RecordingCommit(fail=True), spill_path)
+    for i in range(5):
+        failing.enqueue({"id": f"r{i}", "score": i})
+    failing.flush()
+    assert failing.stats()["spilled"] == 5
+    assert failing.pending() == []
+
+    # 다음 실행: 시작할 때 보관 파일을 읽어 커밋
+    commit = RecordingCommit()
+    queue = make_queue(commit, spill_path)
+    queue.start()
+    queue.shutdown()
+    assert sorted(commit.ids) == [f"r{i}" for i in range(5)]
+
+    # 같은 파일을 여는 다른 프로세스는 이미 가져간 항목을 다시 커밋하지 않음
+    other_commit = RecordingCommit()
+    other = make_queue(other_commit, spill_path)
+    other.start()
+    other.shutdown()
+    assert other_commit.ids == []
+    # 성공한 뒤 다시 읽어도 중복되지 않음
+    queue.enqueue({"id": "r5", "score": 5})
+    queue.flush()
+    assert sorted(commit.ids) == [f"r{i}" for i in range(6)]
+
+
+def test_spilled_results_are_retried_after_next_successful_commit(tmp_path):
+    spill_path = str(tmp_path / "pending_results.jsonl")
+    commit = RecordingCommit(fail=True)
+    queue = make_queue(commit, spill_path)
+
+    queue.enqueue({"id": "a"})
+    queue.flush()
+    assert commit.ids == []
+
+    commit.fail = False
+    queue.enqueue({"id": "b"})
+    queue.flush()
+    # "b" 커밋이 성공하면 보관했던 "a"를 다시 큐에 넣음
+    queue.flush()
+    assert commit.ids == ["b", "a"]
@@ -0,0 +1,58 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    TTL + LRU 읽기 캐시
+
+    항목은 ttl초 동안 유효하며, maxsize를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """
+        유효한 값을 반환. 없거나 만료되었으면 default (생략 시 KeyError)
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self._misses += 1
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._data), "hits": self._hits, "misses": self._misses}
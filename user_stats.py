@@ -0,0 +1,71 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+class UserStats:
+    """
+    사용자별 누적 통계
+
+    총점, 퀴즈 수, 난이도별 횟수/점수 합계와 최근 점수 링 버퍼를 유지하며
+    퀴즈 한 번당 O(1)로 갱신됩니다. 기록 페이지는 다시 집계하지 않고 이 값을 그대로 표시합니다.
+    """
+
+    __slots__ = ("total_score", "quiz_count", "difficulty_stats", "recent_scores")
+
+    def __init__(self, total_score: int = 0, quiz_count: int = 0,
+                 difficulty_stats: Optional[Dict[str, Dict[str, int]]] = None,
+                 recent_scores: Optional[Iterable[int]] = None, recent_size: int = 20):
+        self.total_score = total_score
+        self.quiz_count = quiz_count
+        self.difficulty_stats = {
+            difficulty: {"count": values.get("count", 0), "total": values.get("total", 0)}
+            for difficulty, values in (difficulty_stats or {}).items()
+        }
+        self.recent_scores = deque(recent_scores or [], maxlen=recent_size)
+
+    def record(self, score: int, difficulty: str):
+        """
+        퀴즈 결과 하나를 반영
+        """
+        self.total_score += score
+        self.quiz_count += 1
+        stats = self.difficulty_stats.setdefault(difficulty, {"count": 0, "total": 0})
+        stats["count"] += 1
+        stats["total"] += score
+        self.recent_scores.append(score)
+
+    @property
+    def average_score(self) -> float:
+        return self.total_score / self.quiz_count if self.quiz_count else 0.0
+
+    def difficulty_table(self) -> List[Dict]:
+        """
+        난이도별 횟수와 평균 점수
+        """
+        return [
+            {
+                "difficulty": difficulty,
+                "count": stats["count"],
+                "mean": round(stats["total"] / stats["count"], 1) if stats["count"] else 0.0
+            }
+            for difficulty, stats in self.difficulty_stats.items()
+        ]
+
+    def to_dict(self) -> Dict:
+        return {
+            "total_score": self.total_score,
+            "quiz_count": self.quiz_count,
+            "difficulty_stats": {d: dict(stats) for d, stats in self.difficulty_stats.items()},
+            "recent_scores": list(self.recent_scores)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict], recent_size: int = 20) -> "UserStats":
+        data = data or {}
+        return cls(
+            total_score=data.get("total_score", 0),
+            quiz_count=data.get("quiz_count", 0),
+            difficulty_stats=data.get("difficulty_stats"),
+            recent_scores=data.get("recent_scores"),
+            recent_size=recent_size
+        )
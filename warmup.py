@@ -0,0 +1,250 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from config import (
+    WARMUP_READY_FILE, WARMUP_HEALTH_PORT, WARMUP_POOL_TIMEOUT, WARMUP_KEEPALIVE_INTERVAL
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceWarmup:
+    """
+    프로세스 시작 시 서비스 워밍업과 준비 상태
+
+    서비스 생성(Firebase 초기화, Firestore 채널, OpenAI 클라이언트) → Firestore 읽기로 채널 열기와
+    리더보드 캐시 채우기 → OpenAI TLS 연결 → 문제 풀 채우기를 백그라운드에서 순서대로 실행하고
+    단계별 소요 시간을 기록합니다. 모든 단계가 끝나면 준비 완료로 표시하고, 상태를 파일과
+    (포트를 설정한 경우) HTTP /ready로 알려 로드 밸런서가 준비된 프로세스에만 트래픽을 보내게 합니다.
+    이후에는 keepalive_interval마다 가벼운 읽기로 Firestore 채널을 유지합니다.
+    """
+
+    def __init__(self, ready_file: str = "", health_port: int = 0,
+                 pool_timeout: float = 30.0, keepalive_interval: float = 240.0):
+        self.ready_file = ready_file
+        self.health_port = health_port
+        self.pool_timeout = pool_timeout
+        self.keepalive_interval = keepalive_interval
+
+        self.firebase_service = None
+        self.quiz_service = None
+        self.ready = False
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.steps: List[Dict] = []
+
+        self._lock = threading.Lock()
+        self._built = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def start(self):
+        """
+        워밍업 시작 (여러 번 호출해도 한 번만 실행)
+        """
+        with self._lock:
+            if self._thread:
+                return
+            self.started_at = time.time()
+            self._thread = threading.Thread(target=self._run, name="service-warmup", daemon=True)
+        self._write_status()
+        if self.health_port:
+            self._start_health_server()
+        self._thread.start()
+
+    def services(self):
+        """
+        (firebase_service, quiz_service) 반환. 아직 만드는 중이면 생성 단계가 끝날 때까지 대기
+        """
+        self.start()
+        self._built.wait()
+        if self.quiz_service is None:
+            raise RuntimeError(f"서비스 초기화 실패: {self.error}")
+        return self.firebase_service, self.quiz_service
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "error": self.error,
+                "pid": os.getpid(),
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "steps": [dict(step) for step in self.steps]
+            }
+
+    def stop(self):
+        self._stop.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _run(self):
+        try:
+            self._step("firebase_service", self._build_firebase)
+            self._step("quiz_service", self._build_quiz)
+        except Exception as e:
+            self.error = str(e)
+            logger.error("서비스 초기화 실패: %s", e)
+            self._write_status()
+            return
+        finally:
+            self._built.set()
+
+        # 준비 단계는 실패해도 요청 처리에 지장이 없으므로 기록만 하고 계속 진행
+        for name, fn in [
+            ("firestore_priming", self._prime_firestore),
+            ("openai_priming", self._prime_openai),
+            ("question_pool", self._fill_pool),
+        ]:
+            try:
+                self._step(name, fn)
+            except Exception as e:
+                logger.warning("워밍업 단계 실패 (%s): %s", name, e)
+
+        with self._lock:
+            self.ready = True
+            self.finished_at = time.time()
+        self._write_status()
+        logger.info("워밍업 완료: %.2f초", self.finished_at - self.started_at)
+        self._keep_alive()
+
+    def _step(self, name: str, fn):
+        started = time.perf_counter()
+        step = {"name": name, "ok": False, "seconds": None}
+        try:
+            result = fn()
+            step["ok"] = True
+            if result is not None:
+                step["detail"] = result
+        except Exception as e:
+            step["error"] = str(e)
+            raise
+        finally:
+            step["seconds"] = round(time.perf_counter() - started, 3)
+            with self._lock:
+                self.steps.append(step)
+            self._write_status()
+
+    def _build_firebase(self):
+        # firebase_admin, openai 등 무거운 모듈은 여기서 처음 import
+        from firebase_service import FirebaseService
+        self.firebase_service = FirebaseService()
+        return {"backend": self.firebase_service.backend.name}
+
+    def _build_quiz(self):
+        from quiz_service import QuizService
+        self.quiz_service = QuizService()
+        return {
+            "api_available": self.quiz_service.api_available,
+            "api_error": self.quiz_service.api_error,
+            "bank_error": self.quiz_service.bank_error
+        }
+
+    def _prime_firestore(self):
+        # 채널을 연 뒤 리더보드 캐시를 미리 채움
+        self.firebase_service.backend.ping()
+        snapshot = self.firebase_service.get_leaderboard_snapshot()
+        return {"leaderboard_entries": len(snapshot.entries) if snapshot else 0}
+
+    def _prime_openai(self):
+        quiz_service = self.quiz_service
+        if not quiz_service.api_available:
+            return {"skipped": "api_unavailable"}
+        # 토큰을 쓰지 않는 모델 목록 조회로 비동기 클라이언트의 TLS 연결을 미리 맺음
+        quiz_service.engine.submit(lambda client: client.models.list()).result(timeout=self.pool_timeout)
+        return None
+
+    def _fill_pool(self):
+        pool = self.quiz_service.pool
+        if not pool:
+            return {"skipped": "pool_disabled"}
+        deadline = time.monotonic() + self.pool_timeout
+        while time.monotonic() < deadline and not self._stop.is_set():
+            depths = {difficulty: pool.depth(difficulty) for difficulty in pool.difficulties}
+            if all(depth >= pool.low_watermark for depth in depths.values()):
+                return {"depths": depths}
+            self._stop.wait(0.2)
+        raise TimeoutError(f"{self.pool_timeout}초 안에 문제 풀을 채우지 못했습니다.")
+
+    def _keep_alive(self):
+        while self.keepalive_interval > 0 and not self._stop.wait(self.keepalive_interval):
+            try:
+                self.firebase_service.backend.ping()
+            except Exception as e:
+                logger.warning("Firestore 연결 유지 실패: %s", e)
+
+    def _write_status(self):
+        if not self.ready_file:
+            return
+        # 같은 경로에 쓰는 다른 프로세스/스레드와 겹치지 않도록 임시 파일 이름은 매번 새로 만듦
+        directory, name = os.path.split(os.path.abspath(self.ready_file))
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=f"{name}.", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self.status(), f, ensure_ascii=False, indent=2)
+                os.replace(temp_path, self.ready_file)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            logger.warning("준비 상태 파일 기록 실패: %s", e)
+
+    def _start_health_server(self):
+        warmup = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") == "/live":
+                    code, body = 200, {"live": True}
+                elif self.path.rstrip("/") == "/ready":
+                    body = warmup.status()
+                    code = 200 if body["ready"] else 503
+                else:
+                    code, body = 404, {"error": "not found"}
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer(("0.0.0.0", self.health_port), Handler)
+        except OSError as e:
+            logger.warning("준비 상태 포트(%s)를 열 수 없습니다: %s", self.health_port, e)
+            return
+        threading.Thread(target=self._server.serve_forever, name="warmup-health", daemon=True).start()
+
+
+_warmup: Optional[ServiceWarmup] = None
+_warmup_lock = threading.Lock()
+
+
+def get_warmup() -> ServiceWarmup:
+    """
+    프로세스 전체에서 하나인 워밍업 객체
+    """
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = ServiceWarmup(
+                # 프로세스마다 자기 상태 파일 (여러 프로세스가 같은 파일을 덮어쓰지 않도록)
+                ready_file=WARMUP_READY_FILE.replace("{pid}", str(os.getpid())),
+                health_port=WARMUP_HEALTH_PORT,
+                pool_timeout=WARMUP_POOL_TIMEOUT,
+                keepalive_interval=WARMUP_KEEPALIVE_INTERVAL
+            )
+        return _warmup
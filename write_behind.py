@@ -0,0 +1,169 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 잠금 없이 사용 (단일 프로세스 실행)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """
+    쓰기 지연(write-behind) 큐
+
+    저장 요청을 메모리에 모았다가 백그라운드 플러셔가 크기/시간 기준으로 한 번에 커밋합니다.
+    커밋이 계속 실패하면 로컬 파일(JSON Lines)에 보관했다가 다음 커밋이 성공할 때 다시 시도합니다.
+    같은 서버의 여러 프로세스가 보관 파일을 함께 쓰므로 읽고 쓸 때 파일을 잠급니다.
+    """
+
+    def __init__(self, commit_fn: Callable[[List[Dict]], None], max_batch: int = 200,
+                 flush_interval: float = 1.0, max_retries: int = 3, retry_backoff: float = 0.5,
+                 spill_path: str = "pending_results.jsonl"):
+        self.commit_fn = commit_fn
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.spill_path = spill_path
+
+        self._pending: List[Dict] = []
+        self._cond = threading.Condition()
+        # 커밋은 한 번에 하나씩 (플러셔와 수동 flush가 겹치지 않도록)
+        self._commit_lock = threading.Lock()
+        self._stop = False
+        self._thread = None
+        self._stats = {"enqueued": 0, "committed": 0, "batches": 0, "failures": 0, "spilled": 0}
+
+    def start(self):
+        """
+        플러셔 시작. 이전 실행에서 디스크에 남은 항목이 있으면 다시 큐에 넣음
+        """
+        if self._thread:
+            return
+        self._reload_spilled()
+        self._thread = threading.Thread(target=self._flush_loop, name="write-behind-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def enqueue(self, item: Dict):
+        with self._cond:
+            self._pending.append(item)
+            self._stats["enqueued"] += 1
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify()
+
+    def flush(self):
+        """
+        대기 중인 항목을 모두 즉시 커밋
+        """
+        while True:
+            with self._cond:
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+            if not batch:
+                return
+            self._commit(batch)
+
+    def shutdown(self, timeout: float = 10.0):
+        """
+        플러셔를 멈추고 남은 항목을 커밋 (종료 시 자동 호출)
+        """
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def pending(self) -> List[Dict]:
+        with self._cond:
+            return list(self._pending)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return dict(self._stats, pending=len(self._pending))
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                if not self._stop and len(self._pending) < self.max_batch:
+                    self._cond.wait(self.flush_interval)
+                if self._stop:
+                    return
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+            if batch:
+                self._commit(batch)
+
+    def _commit(self, batch: List[Dict]):
+        with self._commit_lock:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self.commit_fn(batch)
+                except Exception as e:
+                    with self._cond:
+                        self._stats["failures"] += 1
+                    logger.warning("쓰기 지연 커밋 실패 (%d/%d): %s", attempt + 1, self.max_retries + 1, e)
+                    if attempt < self.max_retries:
+                        time.sleep(self.retry_backoff * (2 ** attempt))
+                    continue
+
+                with self._cond:
+                    self._stats["committed"] += len(batch)
+                    self._stats["batches"] += 1
+                # 저장소가 다시 응답하므로 디스크에 보관했던 항목도 재시도
+                self._reload_spilled()
+                return
+
+            self._spill(batch)
+
+    @contextmanager
+    def _locked_spill_file(self, mode: str):
+        with open(self.spill_path, mode, encoding="utf-8") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield f
+            finally:
+                # 잠금을 풀기 전에 버퍼를 내려 써야 다른 프로세스가 비운 뒤에 쓰이지 않음
+                f.flush()
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _spill(self, batch: List[Dict]):
+        try:
+            with self._locked_spill_file("a") as f:
+                for item in batch:
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            with self._cond:
+                self._stats["spilled"] += len(batch)
+        except OSError as e:
+            logger.error("쓰기 지연 항목을 디스크에 보관하지 못했습니다: %s", e)
+
+    def _reload_spilled(self):
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return
+        try:
+            # 읽은 프로세스만 항목을 가져가도록 잠근 채로 읽고 비움
+            # (파일을 지우면 잠금을 기다리던 다른 프로세스가 지워진 파일에 쓰게 되므로 비우기만 함)
+            with self._locked_spill_file("r+") as f:
+                items = [json.loads(line) for line in f if line.strip()]
+                f.seek(0)
+                f.truncate()
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error("디스크에 보관된 항목을 읽지 못했습니다: %s", e)
+            return
+        if not items:
+            return
+        with self._cond:
+            self._pending.extend(items)
+            self._cond.notify()